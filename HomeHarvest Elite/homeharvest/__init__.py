@@ -1,10 +1,11 @@
+import time
 import warnings
 import pandas as pd
 from datetime import datetime, timedelta, date
 from .core.scrapers import ScraperInput
 from .utils import (
-    process_result, ordered_properties, validate_input, validate_dates, validate_limit,
-    validate_offset, validate_datetime, validate_filters, validate_sort, validate_last_update_filters,
+    process_result, concat_property_frames, build_property_frame, ordered_properties, validate_input, validate_dates,
+    validate_limit, validate_offset, validate_datetime, validate_filters, validate_sort, validate_last_update_filters,
     validate_tag_filters, convert_to_datetime_string, extract_timedelta_hours, extract_timedelta_days, detect_precision_and_convert
 )
 from .core.scrapers.realtor import RealtorScraper
@@ -12,7 +13,7 @@ from .core.scrapers.models import ListingType, SearchPropertyType, ReturnType, P
 from .tag_utils import (
     discover_tags, normalize_tags, get_tag_category, get_tags_by_category,
     fuzzy_match_tag, expand_tag_search, get_all_categories, get_category_info,
-    TAG_CATEGORIES, TAG_ALIASES
+    TAG_CATEGORIES, TAG_ALIASES, TagMatcher, TAG_MATCHER
 )
 from .presets import (
     get_available_presets, get_preset_info, get_all_presets_info,
@@ -26,14 +27,24 @@ from .data_cleaning import (
 from .sorting import (
     sort_properties, get_best_deals, get_newest_listings, get_recently_updated,
     rank_by_investment_potential, create_custom_score, get_available_sort_fields,
-    SORTABLE_FIELDS
+    SORTABLE_FIELDS, ScoreTerm, compute_score, score_properties, pareto_frontier, pareto_layers, DEAL_CRITERIA
 )
+from .accessor import HomeHarvestAccessor
 from .agent_broker import (
     get_agent_activity, get_broker_activity, get_office_activity,
     find_most_active_agents, find_properties_by_agent, find_properties_by_broker,
     get_contact_export, analyze_agent_specialization, get_wholesale_friendly_agents,
-    filter_by_agent_contact, format_contact_info, extract_phone_numbers
+    filter_by_agent_contact, agent_contact_mask, format_contact_info, extract_phone_numbers,
+    normalize_contacts, normalize_phones, valid_email_mask, agent_analytics, AgentAnalytics
 )
+from .agent_identity import AgentResolver, add_agent_key, normalize_agent_name
+from .state_store import StateStore, SQLiteStateStore, MemoryStateStore
+from .singleflight import search_flights
+from .stats import ScrapeStats
+from .schema import compact_dataframe, COMPACT_SCHEMA
+from .tag_index import TagIndex, filter_by_tags
+from .columnar import to_arrow_table, to_polars, import_pyarrow, import_polars
+from .hooks import ScrapeHooks, MetricsAggregator, RequestEvent, ResponseEvent, RetryEvent, PageEvent
 from typing import Union, Optional, List, Dict
 
 def scrape_property(
@@ -74,6 +85,7 @@ def scrape_property(
     # New sorting parameters
     sort_by: Union[str, List[str]] = None,
     sort_direction: Union[str, List[str]] = "desc",
+    top_k: int = None,
     enable_advanced_sort: bool = False,
     # Tag filtering parameters
     tag_filters: Optional[List[str]] = None,
@@ -96,12 +108,26 @@ def scrape_property(
     # Data quality control
     clean_data: bool = True,
     add_derived_fields: bool = True,
+    compact_dtypes: bool = False,
     # Agent/Broker filtering
     require_agent_email: bool = False,
     require_agent_phone: bool = False,
+    contact_columns: bool = False,
+    agent_resolver: AgentResolver = None,
     # Pagination control
     parallel: bool = True,
-) -> Union[pd.DataFrame, list[dict], list[Property]]:
+    # Checkpoint/resume
+    resumable: bool = False,
+    resume_token: str | dict | None = None,
+    # Incremental (delta) scrapes
+    delta: bool = False,
+    state_store: StateStore = None,
+    # Request coalescing
+    coalesce: bool = True,
+    # Instrumentation
+    return_stats: bool = False,
+    hooks: list = None,
+) -> Union[pd.DataFrame, list[dict], list[Property], tuple]:
     """
     Scrape properties from Realtor.com based on a given location and listing type.
 
@@ -109,7 +135,9 @@ def scrape_property(
     :param listing_type: Listing Type - can be a string, list of strings, or None.
         Options: for_sale, for_rent, sold, pending, off_market, new_community, other, ready_to_build
         Examples: "for_sale", ["for_sale", "pending"], None (returns all types)
-    :param return_type: Return type (pandas, pydantic, raw)
+    :param return_type: Return type (pandas, pydantic, raw, arrow, polars). arrow returns a pyarrow.Table and polars a
+        polars.DataFrame, with tags/photos/tax_history/phones kept as list and struct columns (optional dependencies:
+        pip install homeharvest[arrow] / homeharvest[polars]; see homeharvest.columnar).
     :param preset: Apply a predefined filter preset. Options include: investor_friendly, luxury, fixer_upper,
         family_friendly, retirement, eco_friendly, waterfront, golf_course, new_construction, horse_property,
         starter_home, no_hoa, pool_home, gated_community, mountain_view, rv_parking, guest_house, corner_lot,
@@ -157,6 +185,9 @@ def scrape_property(
         last_update_date, price_per_sqft, days_on_mls, hoa_fee, lot_sqft, year_built, and calculated fields like property_age.
         Can be a single field or list of fields for multi-level sorting.
     :param sort_direction: Sort direction "asc" or "desc", or list matching sort_by for multi-field sorts.
+    :param top_k: Return only the best top_k properties by sort_by (requires sort_by). They are selected with a heap or
+        partition instead of a full sort. Pagination stops as soon as the server-side sort guarantees the top_k, so
+        limit only caps how far it may page.
     :param enable_advanced_sort: If True, use advanced sorting with calculated fields. Default is False.
     :param tag_filters: List of tags to filter properties by (e.g. ["pool", "garage", "new construction"]). Client-side filtering.
         Supports aliases (e.g. "pool" → "swimming_pool") and fuzzy matching for flexibility.
@@ -174,11 +205,40 @@ def scrape_property(
     :param has_view: Filter for properties with views (ocean, mountain, city, etc.)
     :param clean_data: If True, automatically clean and validate property data (prices, sqft, dates, etc.). Default is True.
     :param add_derived_fields: If True, add calculated fields like price_per_sqft. Default is True.
+    :param compact_dtypes: If True, return the pandas DataFrame in the compact dtype schema (categoricals for repeated
+        strings, nullable Int32/Float32 numerics, datetime64 dates; see homeharvest.schema). With return_type='arrow'
+        or 'polars', the same schema maps onto Arrow types: dictionary (polars Categorical) columns, int32, float32
+        and bool. Default is False.
     :param require_agent_email: If True, only return properties with agent email addresses. Default is False.
     :param require_agent_phone: If True, only return properties with agent phone numbers. Default is False.
+    :param contact_columns: If True, add flat contact columns normalized once per scrape: agent_/office_primary_phone,
+        agent_/office_phone_count and agent_/office_valid_email (see agent_broker.normalize_contacts). The agent/broker
+        functions reuse them instead of parsing phones and emails again. Default is False.
+    :param agent_resolver: If given, add an agent_key column with one stable key per real agent, resolved by NRDS id,
+        uuid and normalized name + phone (see homeharvest.agent_identity). Pass the same AgentResolver to later scrapes
+        to keep the keys. The agent analytics then group by agent_key.
     :param parallel: Controls pagination strategy. True (default) = fetch all pages in parallel for maximum speed.
         False = fetch pages sequentially with early termination checks (useful for rate limiting or narrow time windows).
         Sequential mode will stop paginating as soon as time-based filters indicate no more matches are possible.
+    :param resumable: If True, checkpoint every fetched page. When a page fetch fails, a ScrapeInterrupted exception is
+        raised whose resume_token records the location resolution, query plan, completed pages and seen property_ids.
+    :param resume_token: Token from a previous ScrapeInterrupted for the same query. Only the missing pages are fetched
+        and the merged result matches an uninterrupted run. Implies resumable=True.
+    :param delta: If True, only return listings updated since the previous delta run of the same query. Pages are
+        fetched newest-first by last_update_date and paging stops at the stored watermark, which advances after a
+        successful scrape. On the first run, updated_since/updated_in_past_hours (if given) bound the initial window.
+        When limit stops paging before the watermark is reached, the watermark is not advanced: a UserWarning is
+        raised and ScrapeStats.delta_truncated is set. Rerun with a higher limit; limit is not part of the query key.
+    :param state_store: Where delta watermarks are kept. Defaults to SQLiteStateStore() (see homeharvest.state_store).
+    :param coalesce: If True (default), concurrent identical searches in this process share one in-flight fetch and
+        each caller gets its own copy of the results. Delta, resumable and hooked scrapes are never coalesced.
+    :param return_stats: If True, return a (results, ScrapeStats) tuple. ScrapeStats holds wall time per stage, page
+        and detail-chunk counts, requests, retries, bytes downloaded and rows dropped by each filter. DataFrame results
+        always carry the same object in df.attrs["scrape_stats"].
+    :param hooks: Observer objects implementing any of on_request, on_response, on_retry and on_page (see
+        homeharvest.hooks). They see endpoint, status, latency, bytes and every retry with its reason.
+        MetricsAggregator() collects per-endpoint latency histograms and 429/403 rates. Scrapes with hooks are never
+        coalesced, so every call's hooks see the requests it needed.
 
     Note: past_days and past_hours also accept timedelta objects for more Pythonic usage.
     """
@@ -261,7 +321,7 @@ def scrape_property(
         price_min, price_max, lot_sqft_min, lot_sqft_max, year_built_min, year_built_max,
         hoa_fee_min, hoa_fee_max, stories_min, stories_max, garage_spaces_min, garage_spaces_max
     )
-    validate_sort(sort_by, sort_direction)
+    validate_sort(sort_by, sort_direction, top_k)
     validate_tag_filters(tag_filters, tag_match_type, tag_exclude)
 
     # Expand tag filters using aliases and fuzzy matching if enabled
@@ -365,6 +425,7 @@ def scrape_property(
         # New sorting
         sort_by=sort_by,
         sort_direction=sort_direction,
+        top_k=top_k,
         # Tag filtering (use expanded tags)
         tag_filters=expanded_tag_filters,
         tag_match_type=tag_match_type,
@@ -382,35 +443,87 @@ def scrape_property(
         has_view=has_view,
         # Pagination control
         parallel=parallel,
+        # Checkpoint/resume
+        resumable=resumable or resume_token is not None,
+        resume_token=resume_token,
+        # Incremental (delta) scrapes
+        delta=delta,
+        state_store=state_store,
+        # Request/response observers
+        hooks=hooks,
     )
 
+    columnar_return = scraper_input.return_type in (ReturnType.arrow, ReturnType.polars)
+    if columnar_return:
+        if enable_advanced_sort and sort_by:
+            raise ValueError(
+                "enable_advanced_sort is only supported with return_type='pandas'; "
+                "sort the returned table instead (Table.sort_by / DataFrame.sort)"
+            )
+        if scraper_input.return_type == ReturnType.polars:
+            import_polars()
+        else:
+            import_pyarrow()
+
+    scrape_started = time.perf_counter()
     site = RealtorScraper(scraper_input)
-    results = site.search()
+    if coalesce and not (scraper_input.delta or scraper_input.resumable or scraper_input.hooks):
+        flight_key = f"{scraper_input.return_type.value}:{scraper_input.query_key()}"
+        results, stats = search_flights.do_view(flight_key, lambda: (site.search(), site.stats))
+    else:
+        results, stats = site.search(), site.stats
+    site.commit_watermark()
+
+    if columnar_return:
+        build = to_polars if scraper_input.return_type == ReturnType.polars else to_arrow_table
+        with stats.stage("dataframe"):
+            table = build(results, clean=clean_data, add_derived_fields=add_derived_fields,
+                          require_agent_email=require_agent_email, require_agent_phone=require_agent_phone,
+                          contact_columns=contact_columns, agent_resolver=agent_resolver,
+                          compact=compact_dtypes)
+        if require_agent_email or require_agent_phone:
+            stats.record_dropped("agent_contact", len(results), len(table))
+        stats.rows_returned = len(table)
+        stats.add_time("total", time.perf_counter() - scrape_started)
+        return (table, stats) if return_stats else table
 
     if scraper_input.return_type != ReturnType.pandas:
-        return results
+        stats.rows_returned = len(results)
+        stats.add_time("total", time.perf_counter() - scrape_started)
+        return (results, stats) if return_stats else results
 
-    properties_dfs = [df for result in results if not (df := process_result(result)).empty]
-    if not properties_dfs:
-        return pd.DataFrame()
+    with stats.stage("dataframe"):
+        result_df = build_property_frame(results, clean=clean_data, add_derived_fields=add_derived_fields)
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", category=FutureWarning)
+    if not result_df.empty:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=FutureWarning)
 
-        result_df = pd.concat(properties_dfs, ignore_index=True, axis=0)[ordered_properties].replace(
-            {"None": pd.NA, None: pd.NA, "": pd.NA}
-        )
+            if contact_columns:
+                with stats.stage("contacts"):
+                    result_df = normalize_contacts(result_df, inplace=True)
 
-        # Apply data cleaning if enabled
-        if clean_data:
-            result_df = clean_dataframe(result_df, add_derived_fields=add_derived_fields)
+            # Apply agent/broker contact filtering if enabled
+            if require_agent_email or require_agent_phone:
+                rows_before = len(result_df)
+                with stats.stage("filters"):
+                    result_df = filter_by_agent_contact(result_df, require_agent_email, require_agent_phone)
+                stats.record_dropped("agent_contact", rows_before, len(result_df))
 
-        # Apply agent/broker contact filtering if enabled
-        if require_agent_email or require_agent_phone:
-            result_df = filter_by_agent_contact(result_df, require_agent_email, require_agent_phone)
+            if agent_resolver is not None:
+                with stats.stage("agent_identity"):
+                    result_df = add_agent_key(result_df, agent_resolver, inplace=True)
 
-        # Apply advanced sorting if enabled and sort_by is specified
-        if enable_advanced_sort and sort_by:
-            result_df = sort_properties(result_df, sort_by, sort_direction)
+            # Apply advanced sorting if enabled and sort_by is specified
+            if enable_advanced_sort and sort_by:
+                with stats.stage("sorting"):
+                    result_df = sort_properties(result_df, sort_by, sort_direction, top_k=top_k)
+
+        if compact_dtypes:
+            with stats.stage("compact_dtypes"):
+                result_df = compact_dataframe(result_df, inplace=True)
 
-        return result_df
+    stats.rows_returned = len(result_df)
+    stats.add_time("total", time.perf_counter() - scrape_started)
+    result_df.attrs["scrape_stats"] = stats
+    return (result_df, stats) if return_stats else result_df
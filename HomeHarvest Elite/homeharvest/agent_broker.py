@@ -3,21 +3,15 @@ Agent and broker data extraction and analysis utilities.
 
 Provides enhanced agent/broker filtering, contact extraction, and activity analysis.
 """
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import re
 
 
-def extract_phone_numbers(phone_data) -> List[str]:
-    """
-    Extract and format phone numbers from various formats.
 
-    Args:
-        phone_data: Phone data (can be list, dict, or string)
-
-    Returns:
-        List of formatted phone numbers
-    """
+def _raw_phone_numbers(phone_data) -> List[str]:
+    """Phone number strings of a phones cell (list of phone objects or strings, or a separated string), unformatted."""
     # Handle None first
     if phone_data is None:
         return []
@@ -50,14 +44,25 @@ def extract_phone_numbers(phone_data) -> List[str]:
         else:
             phones = [phone_data]
 
-    # Clean and format
+    return [phone for phone in phones if phone]
+
+
+def extract_phone_numbers(phone_data) -> List[str]:
+    """
+    Extract and format phone numbers from various formats.
+
+    Args:
+        phone_data: Phone data (can be list, dict, or string)
+
+    Returns:
+        List of formatted phone numbers
+    """
     formatted = []
-    for phone in phones:
-        if phone:
-            # Remove non-digit characters except +
-            cleaned = re.sub(r'[^\d+]', '', str(phone))
-            if cleaned and len(cleaned) >= 10:
-                formatted.append(cleaned)
+    for phone in _raw_phone_numbers(phone_data):
+        # Remove non-digit characters except +
+        cleaned = re.sub(r'[^\d+]', '', str(phone))
+        if cleaned and len(cleaned) >= 10:
+            formatted.append(cleaned)
 
     return formatted
 
@@ -76,6 +81,114 @@ def extract_primary_phone(phone_data) -> Optional[str]:
     return phones[0] if phones else None
 
 
+#: contact field prefixes normalize_contacts covers: agent_phones/agent_email and office_phones/office_email
+CONTACT_PREFIXES = ("agent", "office")
+#: flat columns normalize_contacts adds per prefix, e.g. agent_primary_phone
+CONTACT_FIELDS = ("primary_phone", "phone_count", "valid_email")
+
+_EMAIL_PATTERN = r'[^@\s]+@[^@\s]+'
+
+
+def normalize_phones(phones) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Primary phone and phone count of every cell of a phones column, as extract_phone_numbers would give them.
+
+    The cells are flattened into one list of raw numbers, and each distinct raw number is cleaned once (agents and
+    offices repeat across listings).
+
+    Args:
+        phones: Column (or list) of phone data cells
+
+    Returns:
+        (primary phone per row as an object array with None when there is no valid number, valid numbers per row)
+    """
+    rows, raw = [], []
+    for i, cell in enumerate(phones):
+        numbers = _raw_phone_numbers(cell)
+        rows.extend([i] * len(numbers))
+        raw.extend(numbers)
+
+    count = len(phones)
+    primary = np.full(count, None, dtype=object)
+    if not raw:
+        return primary, np.zeros(count, dtype=np.int64)
+
+    codes, distinct = pd.factorize(pd.Series(raw, dtype=object).astype(str))
+    cleaned = pd.Series(distinct, dtype=object).str.replace(r'[^\d+]', '', regex=True)
+    valid = (cleaned.str.len() >= 10).to_numpy()[codes]
+
+    valid_rows = np.asarray(rows, dtype=np.int64)[valid]
+    first_rows, first = np.unique(valid_rows, return_index=True)
+    primary[first_rows] = cleaned.to_numpy()[codes[valid][first]]
+    return primary, np.bincount(valid_rows, minlength=count)
+
+
+def valid_email_mask(emails) -> np.ndarray:
+    """Rows of an email column that hold a plausible address (non-blank, something@something), checked per distinct value."""
+    codes, distinct = pd.factorize(pd.Series(emails, dtype=object))
+    if not len(distinct):
+        return np.zeros(len(codes), dtype=bool)
+    plausible = pd.Series(distinct, dtype=object).astype(str).str.strip().str.fullmatch(_EMAIL_PATTERN).to_numpy(bool)
+    return np.where(codes >= 0, plausible[codes], False)
+
+
+def contact_fields(columns, prefixes: Tuple[str, ...] = CONTACT_PREFIXES) -> Dict[str, pd.Series]:
+    """
+    The normalized contact columns for a DataFrame or a {column name: Series} mapping of results.
+
+    Columns the mapping already has are reused as they are; prefixes without a phones/email column are skipped.
+
+    Returns:
+        {"agent_primary_phone": ..., "agent_phone_count": ..., "agent_valid_email": ..., "office_...": ...}
+    """
+    fields = {}
+    for prefix in prefixes:
+        phones, email = f"{prefix}_phones", f"{prefix}_email"
+        names = [f"{prefix}_{field}" for field in CONTACT_FIELDS]
+        if all(name in columns for name in names):
+            fields.update({name: columns[name] for name in names})
+            continue
+        if phones not in columns or email not in columns:
+            continue
+        index = columns[phones].index
+        primary, count = normalize_phones(columns[phones])
+        fields[names[0]] = pd.Series(primary, index=index, dtype=object)
+        fields[names[1]] = pd.Series(count, index=index)
+        fields[names[2]] = pd.Series(valid_email_mask(columns[email]), index=index)
+    return fields
+
+
+def normalize_contacts(df: pd.DataFrame, prefixes: Tuple[str, ...] = CONTACT_PREFIXES,
+                       inplace: bool = False) -> pd.DataFrame:
+    """
+    Add flat contact columns: {prefix}_primary_phone, {prefix}_phone_count and {prefix}_valid_email for the agent
+    and office contacts (what scrape_property(contact_columns=True) returns).
+
+    The agent/broker functions in this module use these columns when a frame has them instead of parsing the
+    phones and emails again.
+
+    Args:
+        df: DataFrame with property data
+        prefixes: Contact prefixes to normalize
+        inplace: Add the columns to df itself instead of a copy
+
+    Returns:
+        DataFrame with the contact columns added
+    """
+    target = df if inplace else df.copy()
+    for name, column in contact_fields(target, prefixes).items():
+        target[name] = column
+    return target
+
+
+def _contact_column(df: pd.DataFrame, prefix: str, field: str) -> pd.Series:
+    """A normalized contact column of df, computed (not added) when df does not have it."""
+    name = f"{prefix}_{field}"
+    if name in df.columns:
+        return df[name]
+    return contact_fields(df, (prefix,))[name]
+
+
 def format_contact_info(row: pd.Series) -> Dict[str, any]:
     """
     Format contact information from a property row.
@@ -140,64 +253,223 @@ def filter_by_agent_contact(df: pd.DataFrame, require_email: bool = False, requi
     if df.empty:
         return df
 
-    filtered = df.copy()
+    mask = agent_contact_mask(df, require_email=require_email, require_phone=require_phone)
+    return df[mask].reset_index(drop=True)
+
+
+def agent_contact_mask(columns, agent_phones: Optional[pd.Series] = None, require_email: bool = False,
+                       require_phone: bool = False) -> np.ndarray:
+    """
+    Boolean row mask of filter_by_agent_contact.
+
+    Args:
+        columns: DataFrame or {column name: Series} mapping with the agent contact columns (normalized ones are
+            reused when present), or the agent_email column itself
+        agent_phones: The agent_phones column, when columns is the agent_email column
+        require_email: Require a valid agent email
+        require_phone: Require at least one valid agent phone number
+
+    Returns:
+        numpy bool array, True for rows that have the required contact information
+    """
+    if agent_phones is not None:
+        columns = {"agent_email": columns, "agent_phones": agent_phones}
+    mask = np.ones(len(columns["agent_email"]), dtype=bool)
 
     if require_email:
-        filtered = filtered[filtered['agent_email'].notna() & (filtered['agent_email'] != '')]
+        valid_email = columns["agent_valid_email"] if "agent_valid_email" in columns \
+            else valid_email_mask(columns["agent_email"])
+        mask &= np.asarray(valid_email, dtype=bool)
 
     if require_phone:
-        filtered = filtered[filtered['agent_phones'].notna()]
-        # Additional check for valid phones
-        filtered = filtered[filtered.apply(lambda row: bool(extract_phone_numbers(row['agent_phones'])), axis=1)]
+        phone_count = columns["agent_phone_count"] if "agent_phone_count" in columns \
+            else normalize_phones(columns["agent_phones"])[1]
+        mask &= np.asarray(phone_count) > 0
 
-    return filtered.reset_index(drop=True)
+    return mask
 
 
-def get_agent_activity(df: pd.DataFrame) -> pd.DataFrame:
+#: analyze_agent_specialization's price_category buckets of an agent's average list price
+PRICE_CATEGORY_BINS = [-np.inf, 200000, 500000, 1000000, np.inf]
+PRICE_CATEGORIES = ['Budget', 'Mid-Range', 'Upper-Mid', 'Luxury']
+
+
+#: The columns agent_analytics reads (df.hh.agent_analytics() rebuilds when one of them changes)
+ANALYTICS_COLUMNS = (
+    'agent_key', 'agent_name', 'property_id', 'list_price', 'agent_email', 'agent_phones', 'agent_primary_phone',
+    'agent_id', 'broker_name', 'broker_id', 'office_name', 'office_id', 'office_email', 'office_phones',
+    'office_primary_phone', 'sqft', 'beds', 'full_baths', 'style',
+)
+
+
+class AgentAnalytics(NamedTuple):
+    """The agent, broker and office tables of a frame (None when the frame has no such names)."""
+    agents: Optional[pd.DataFrame]  #: get_agent_activity
+    brokers: Optional[pd.DataFrame]  #: get_broker_activity
+    offices: Optional[pd.DataFrame]  #: get_office_activity
+    specialization: Optional[pd.DataFrame]  #: analyze_agent_specialization
+
+
+def _by_listing_count(stats: pd.DataFrame) -> pd.DataFrame:
+    return stats.sort_values('listing_count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _agent_column(df: pd.DataFrame) -> str:
+    """The column that identifies an agent: agent_key when resolved (see agent_identity), else agent_name."""
+    return 'agent_key' if 'agent_key' in df.columns else 'agent_name'
+
+
+def _phones_rows(df: pd.DataFrame, prefix: str) -> pd.Series:
+    """Row position of every listing with {prefix}_phones (NaN without): its 'first' is the row of the first phones."""
+    present = df[f'{prefix}_phones'].notna().to_numpy()
+    return pd.Series(np.where(present, np.arange(len(df)), np.nan), index=df.index)
+
+
+def _group_primary_phones(df: pd.DataFrame, grouped: pd.DataFrame, prefix: str) -> np.ndarray:
     """
-    Analyze agent activity and listing counts.
+    Primary phone of each group's first {prefix}_phones cell. With contact columns, the {prefix}_primary_phone of
+    that same row (grouped['phones_row']) is reused, so both paths give the same phone.
+    """
+    if f'{prefix}_primary_phone' not in df.columns:
+        return normalize_phones(grouped[f'{prefix}_phones'])[0]
+    rows = grouped['phones_row'].to_numpy(dtype='float64')
+    present = ~np.isnan(rows)
+    primary = np.full(len(rows), None, dtype=object)
+    primary[present] = df[f'{prefix}_primary_phone'].to_numpy(dtype=object)[rows[present].astype(np.int64)]
+    primary[pd.isna(primary)] = None
+    return primary
+
+
+def _common_styles(df: pd.DataFrame, agent: str = 'agent_name') -> pd.Series:
+    """Most common style per agent (the smallest one among equally common styles, as Series.mode()[0])."""
+    counts = df.groupby([agent, 'style'], observed=True).size().reset_index(name='count')
+    counts = counts.sort_values([agent, 'count', 'style'], ascending=[True, False, True], kind='stable')
+    return counts.drop_duplicates(agent).set_index(agent)['style']
+
+
+def _agent_tables(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Agent activity and specialization from one groupby over agent_name (or agent_key)."""
+    agent = _agent_column(df)
+    # Grouped by agent_key, each table also carries the agent's (first) name
+    names = ['agent_name'] if agent != 'agent_name' else []
+    aggregations = {name: (name, 'first') for name in names}
+    aggregations.update({
+        'listing_count': ('property_id', 'count'),
+        'avg_price': ('list_price', 'mean'),
+        'min_price': ('list_price', 'min'),
+        'max_price': ('list_price', 'max'),
+        'median_price': ('list_price', 'median'),
+        'agent_email': ('agent_email', 'first'),
+        'agent_phones': ('agent_phones', 'first'),
+        'agent_id': ('agent_id', 'first'),
+        'broker_name': ('broker_name', 'first'),
+        'office_name': ('office_name', 'first'),
+    })
+    if 'agent_primary_phone' in df.columns:
+        aggregations['phones_row'] = ('phones_row', 'first')
+    # Optional specialization columns, when the frame has them
+    optional = {'avg_sqft': 'sqft', 'avg_beds': 'beds', 'avg_baths': 'full_baths'}
+    for name, column in optional.items():
+        if column in df.columns:
+            aggregations[name] = (column, 'mean')
+
+    columns = list(dict.fromkeys([agent] + [column for column, _ in aggregations.values() if column != 'phones_row']))
+    frame = df[columns].assign(phones_row=_phones_rows(df, 'agent')) if 'phones_row' in aggregations else df[columns]
+    grouped = frame.groupby(agent, observed=True).agg(**aggregations)
+    grouped['primary_phone'] = _group_primary_phones(df, grouped, 'agent')
+
+    activity = _by_listing_count(grouped[names + [
+        'listing_count', 'avg_price', 'min_price', 'max_price', 'agent_email', 'agent_phones', 'agent_id',
+        'broker_name', 'office_name', 'primary_phone',
+    ]].reset_index())
+
+    specialization = grouped[names + ['listing_count', 'avg_price', 'median_price']
+                             + [name for name in optional if name in aggregations]]
+    if 'style' in df.columns:
+        specialization = specialization.assign(common_style=_common_styles(df, agent).reindex(grouped.index).astype(object))
+    specialization = specialization.assign(agent_email=grouped['agent_email'])
+    # Categorize price range
+    category = pd.cut(specialization['avg_price'], PRICE_CATEGORY_BINS, right=False, labels=PRICE_CATEGORIES)
+    specialization = specialization.assign(price_category=category.astype(object).fillna('Unknown'))
+    return activity, _by_listing_count(specialization.reset_index())
+
+
+def _broker_table(df: pd.DataFrame) -> pd.DataFrame:
+    agent = _agent_column(df)
+    return _by_listing_count(df.groupby('broker_name', observed=True).agg(
+        listing_count=('property_id', 'count'),
+        avg_price=('list_price', 'mean'),
+        min_price=('list_price', 'min'),
+        max_price=('list_price', 'max'),
+        broker_id=('broker_id', 'first'),
+        unique_agents=(agent, 'nunique'),  # Number of unique agents
+    ).reset_index())
+
+
+def _office_table(df: pd.DataFrame) -> pd.DataFrame:
+    agent = _agent_column(df)
+    aggregations = {
+        'listing_count': ('property_id', 'count'),
+        'avg_price': ('list_price', 'mean'),
+        'min_price': ('list_price', 'min'),
+        'max_price': ('list_price', 'max'),
+        'office_id': ('office_id', 'first'),
+        'office_email': ('office_email', 'first'),
+        'office_phones': ('office_phones', 'first'),
+        'unique_agents': (agent, 'nunique'),  # Number of unique agents
+    }
+    if 'office_primary_phone' in df.columns:
+        aggregations['phones_row'] = ('phones_row', 'first')
+
+    columns = list(dict.fromkeys(['office_name'] + [column for column, _ in aggregations.values()
+                                                    if column != 'phones_row']))
+    frame = df[columns].assign(phones_row=_phones_rows(df, 'office')) if 'phones_row' in aggregations else df[columns]
+    grouped = frame.groupby('office_name', observed=True).agg(**aggregations)
+    grouped['primary_phone'] = _group_primary_phones(df, grouped, 'office')
+    return _by_listing_count(grouped.drop(columns='phones_row', errors='ignore').reset_index())
+
+
+def agent_analytics(df: pd.DataFrame) -> AgentAnalytics:
+    """
+    Agent, broker and office activity plus agent specialization, built together.
+
+    Agent activity and specialization come from the same groupby, so this aggregates the frame once per grouping:
+    agents, brokers and offices. Like get_agent_activity and the other functions, it reads the frame as it is now.
+    df.hh.agent_analytics() returns the same tables, cached until one of the ANALYTICS_COLUMNS changes.
+
+    When the frame has an agent_key column (agent_identity.add_agent_key), agents are grouped by agent_key rather
+    than by agent_name, and the agent tables start with both columns.
 
     Args:
         df: DataFrame with property data
 
     Returns:
-        DataFrame with agent activity stats
+        AgentAnalytics with one table per grouping (None when df is empty or lacks the name column)
     """
-    if df.empty or 'agent_name' not in df.columns:
-        return pd.DataFrame()
+    agents, specialization = _agent_tables(df) if _has_column(df, 'agent_name') else (None, None)
+    return AgentAnalytics(
+        agents=agents,
+        brokers=_broker_table(df) if _has_column(df, 'broker_name') else None,
+        offices=_office_table(df) if _has_column(df, 'office_name') else None,
+        specialization=specialization,
+    )
 
-    # Group by agent
-    agent_stats = df.groupby('agent_name').agg({
-        'property_id': 'count',
-        'list_price': ['mean', 'min', 'max'],
-        'agent_email': 'first',
-        'agent_phones': 'first',
-        'agent_id': 'first',
-        'broker_name': 'first',
-        'office_name': 'first',
-    }).reset_index()
-
-    # Flatten column names
-    agent_stats.columns = [
-        'agent_name',
-        'listing_count',
-        'avg_price',
-        'min_price',
-        'max_price',
-        'agent_email',
-        'agent_phones',
-        'agent_id',
-        'broker_name',
-        'office_name'
-    ]
 
-    # Sort by listing count
-    agent_stats = agent_stats.sort_values('listing_count', ascending=False).reset_index(drop=True)
+def _has_column(df: pd.DataFrame, column: str) -> bool:
+    return not df.empty and column in df.columns
 
-    # Add primary phone
-    agent_stats['primary_phone'] = agent_stats['agent_phones'].apply(extract_primary_phone)
 
-    return agent_stats
+def get_agent_activity(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Analyze agent activity and listing counts.
+
+    Args:
+        df: DataFrame with property data
+
+    Returns:
+        DataFrame with agent activity stats
+    """
+    return _agent_tables(df)[0] if _has_column(df, 'agent_name') else pd.DataFrame()
 
 
 def get_broker_activity(df: pd.DataFrame) -> pd.DataFrame:
@@ -210,32 +482,7 @@ def get_broker_activity(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with broker activity stats
     """
-    if df.empty or 'broker_name' not in df.columns:
-        return pd.DataFrame()
-
-    # Group by broker
-    broker_stats = df.groupby('broker_name').agg({
-        'property_id': 'count',
-        'list_price': ['mean', 'min', 'max'],
-        'broker_id': 'first',
-        'agent_name': 'nunique',  # Number of unique agents
-    }).reset_index()
-
-    # Flatten column names
-    broker_stats.columns = [
-        'broker_name',
-        'listing_count',
-        'avg_price',
-        'min_price',
-        'max_price',
-        'broker_id',
-        'unique_agents'
-    ]
-
-    # Sort by listing count
-    broker_stats = broker_stats.sort_values('listing_count', ascending=False).reset_index(drop=True)
-
-    return broker_stats
+    return _broker_table(df) if _has_column(df, 'broker_name') else pd.DataFrame()
 
 
 def get_office_activity(df: pd.DataFrame) -> pd.DataFrame:
@@ -248,39 +495,7 @@ def get_office_activity(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with office activity stats
     """
-    if df.empty or 'office_name' not in df.columns:
-        return pd.DataFrame()
-
-    # Group by office
-    office_stats = df.groupby('office_name').agg({
-        'property_id': 'count',
-        'list_price': ['mean', 'min', 'max'],
-        'office_id': 'first',
-        'office_email': 'first',
-        'office_phones': 'first',
-        'agent_name': 'nunique',  # Number of unique agents
-    }).reset_index()
-
-    # Flatten column names
-    office_stats.columns = [
-        'office_name',
-        'listing_count',
-        'avg_price',
-        'min_price',
-        'max_price',
-        'office_id',
-        'office_email',
-        'office_phones',
-        'unique_agents'
-    ]
-
-    # Sort by listing count
-    office_stats = office_stats.sort_values('listing_count', ascending=False).reset_index(drop=True)
-
-    # Add primary phone
-    office_stats['primary_phone'] = office_stats['office_phones'].apply(extract_primary_phone)
-
-    return office_stats
+    return _office_table(df) if _has_column(df, 'office_name') else pd.DataFrame()
 
 
 def find_most_active_agents(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
@@ -349,17 +564,16 @@ def get_contact_export(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame()
 
-    # Get unique agents with contact info
-    contacts = df[['agent_name', 'agent_email', 'agent_phones', 'agent_id',
-                   'broker_name', 'office_name', 'office_phones', 'office_email']].drop_duplicates(subset=['agent_id'])
-
-    # Add formatted phones
-    contacts['agent_primary_phone'] = contacts['agent_phones'].apply(extract_primary_phone)
-    contacts['office_primary_phone'] = contacts['office_phones'].apply(extract_primary_phone)
+    # Get unique agents with contact info (formatted phones from the normalized contact columns)
+    contacts = df[['agent_name', 'agent_email', 'agent_id', 'broker_name', 'office_name', 'office_email']].assign(
+        agent_primary_phone=_contact_column(df, 'agent', 'primary_phone'),
+        agent_valid_email=_contact_column(df, 'agent', 'valid_email'),
+        office_primary_phone=_contact_column(df, 'office', 'primary_phone'),
+    ).drop_duplicates(subset=['agent_id'])
 
     # Remove rows without any contact info
     contacts = contacts[
-        contacts['agent_email'].notna() |
+        contacts['agent_valid_email'] |
         contacts['agent_primary_phone'].notna()
     ]
 
@@ -388,62 +602,7 @@ def analyze_agent_specialization(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with agent specialization info
     """
-    if df.empty or 'agent_name' not in df.columns:
-        return pd.DataFrame()
-
-    # Build aggregation dict dynamically based on available columns
-    agg_dict = {
-        'property_id': 'count',
-        'list_price': ['mean', 'median'],
-        'agent_email': 'first',
-    }
-
-    # Add optional columns if they exist
-    if 'sqft' in df.columns:
-        agg_dict['sqft'] = 'mean'
-    if 'beds' in df.columns:
-        agg_dict['beds'] = 'mean'
-    if 'full_baths' in df.columns:
-        agg_dict['full_baths'] = 'mean'
-    if 'style' in df.columns:  # Use style instead of property_type
-        agg_dict['style'] = lambda x: x.mode()[0] if not x.mode().empty else None
-
-    # Group by agent and calculate stats
-    specialization = df.groupby('agent_name').agg(agg_dict).reset_index()
-
-    # Flatten column names dynamically
-    new_cols = ['agent_name', 'listing_count', 'avg_price', 'median_price']
-
-    # Add optional columns in order
-    if 'sqft' in agg_dict:
-        new_cols.append('avg_sqft')
-    if 'beds' in agg_dict:
-        new_cols.append('avg_beds')
-    if 'full_baths' in agg_dict:
-        new_cols.append('avg_baths')
-    if 'style' in agg_dict:
-        new_cols.append('common_style')
-
-    new_cols.append('agent_email')
-
-    specialization.columns = new_cols
-
-    # Categorize price range
-    def categorize_price(price):
-        if pd.isna(price):
-            return 'Unknown'
-        elif price < 200000:
-            return 'Budget'
-        elif price < 500000:
-            return 'Mid-Range'
-        elif price < 1000000:
-            return 'Upper-Mid'
-        else:
-            return 'Luxury'
-
-    specialization['price_category'] = specialization['avg_price'].apply(categorize_price)
-
-    return specialization.sort_values('listing_count', ascending=False).reset_index(drop=True)
+    return _agent_tables(df)[1] if _has_column(df, 'agent_name') else pd.DataFrame()
 
 
 def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3) -> pd.DataFrame:
@@ -464,13 +623,15 @@ def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3) -> pd
     """
     # Get agent activity
     agent_stats = get_agent_activity(df)
+    if agent_stats.empty:
+        return agent_stats
 
     # Filter by minimum listings
     agent_stats = agent_stats[agent_stats['listing_count'] >= min_listings]
 
     # Filter by having contact info
     agent_stats = agent_stats[
-        (agent_stats['agent_email'].notna()) |
+        valid_email_mask(agent_stats['agent_email']) |
         (agent_stats['primary_phone'].notna())
     ]
 
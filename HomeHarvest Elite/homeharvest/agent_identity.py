@@ -0,0 +1,229 @@
+"""
+Agent identity resolution: one stable agent_key per real agent.
+
+The same agent can appear under several spellings of their name or under several advertiser uuids, and two agents can
+share a name. AgentResolver links listings by their identifiers:
+
+- hard links: the agent's NRDS id (agent_nrds_id) and advertiser uuid (agent_id), plus both of them on one listing
+- a soft link (the blocking key): normalized name + normalized primary phone, which joins variants such as
+  "Susan Anderson", "ANDERSON, SUSAN" and "Susan Anderson Jr." listed with the same phone.
+
+No link merges two groups that carry different NRDS ids. A uuid listed under two NRDS ids stays with the group that
+claimed it first, and each listing with an NRDS id keeps the key of its own id.
+
+Listings with a name but no ids and no phone fall back to their normalized name.
+
+Each group gets the key of its strongest identifier ("nrds:<id>", else "uuid:<id>", else "name:<name>|<phone>"). The
+key does not depend on row order. Every identifier is normalized once per distinct value, and the links are made
+between distinct identifier tuples rather than rows, so resolution is linear in the number of listings. A resolver
+remembers the keys it assigned. Reusing it (or its to_dict() state) across scrapes keeps an agent's key even when a
+later scrape shows them only under a new uuid or spelling that links back to a known identifier.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .agent_broker import normalize_phones
+
+#: name tokens dropped from the name key (suffixes and designations, not part of who the agent is)
+NAME_NOISE = {"jr", "sr", "ii", "iii", "iv", "pa", "realtor", "broker", "gri", "crs", "abr", "cne", "sres"}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_agent_name(name) -> Optional[str]:
+    """
+    Blocking key of an agent name: accents and punctuation removed, lowercased, "Last, First" reordered,
+    suffixes/designations dropped and the tokens sorted. None for a missing or empty name.
+    """
+    if not isinstance(name, str):
+        return None
+    if name.count(",") == 1:
+        last, first = name.split(",")
+        name = f"{first} {last}"
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    tokens = [token for token in _NON_ALNUM.split(ascii_name.lower()) if token and token not in NAME_NOISE]
+    return " ".join(sorted(tokens)) or None
+
+
+def _normalize_phone(phone) -> Optional[str]:
+    digits = re.sub(r"\D", "", phone) if isinstance(phone, str) else ""
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+def _normalize_id(value) -> Optional[str]:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  #: ids read back from a float column (NaN-padded)
+    return str(value).strip() or None
+
+
+def _identifier_codes(values, normalize) -> tuple[np.ndarray, list]:
+    """(code per row, normalized value per code) with each distinct value normalized once; -1 for missing values."""
+    codes, distinct = pd.factorize(pd.Series(values, dtype=object))
+    normalized = [normalize(value) for value in distinct]
+    keys, remap = pd.factorize(pd.Series(normalized, dtype=object))
+    codes = np.where(codes >= 0, keys[codes] if len(keys) else codes, -1)
+    return codes, list(remap)
+
+
+def _combine(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Codes of distinct (left, right) code pairs (both may be -1), by hashing rather than sorting."""
+    pairs = (left + 1) * (int(right.max(initial=-1)) + 2) + (right + 1)
+    return pd.factorize(pairs)[0]
+
+
+def _first_rows(codes: np.ndarray) -> np.ndarray:
+    """Row of the first occurrence of each factorize code (codes are numbered by first occurrence)."""
+    return np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())
+
+
+class AgentResolver:
+    """Assigns agent_key values and remembers them across resolve() calls."""
+
+    def __init__(self, keys: Optional[Dict[str, str]] = None):
+        self.keys: Dict[str, str] = dict(keys or {})  #: identifier ("nrds:..", "uuid:..", "name:..") -> agent_key
+
+    def to_dict(self) -> Dict[str, str]:
+        """JSON-serializable state; AgentResolver(state) resumes it."""
+        return dict(self.keys)
+
+    def resolve(self, columns) -> pd.Series:
+        """
+        agent_key of every listing.
+
+        Args:
+            columns: DataFrame or {column name: Series} mapping with agent_name and agent_phones (or
+                agent_primary_phone), and agent_id / agent_nrds_id when available
+
+        Returns:
+            Series of agent keys aligned with the rows (None for listings without any agent identifier)
+        """
+        names = columns["agent_name"]
+        count = len(names)
+        empty = pd.Series([None] * count, dtype=object)
+
+        def column(name):
+            return columns[name] if name in columns else empty
+
+        nrds, nrds_values = _identifier_codes(column("agent_nrds_id"), _normalize_id)
+        uuid, uuid_values = _identifier_codes(column("agent_id"), _normalize_id)
+        name, name_values = _identifier_codes(names, normalize_agent_name)
+        agents = _combine(_combine(nrds, uuid), name)
+
+        if "agent_primary_phone" in columns:
+            phones = columns["agent_primary_phone"]
+        else:
+            # Without normalized contact columns, parse the phones of each agent's first listing only
+            first = _first_rows(agents)
+            phones = normalize_phones(pd.Series(column("agent_phones")).iloc[first])[0][agents]
+        phone, phone_values = _identifier_codes(phones, _normalize_phone)
+
+        # Distinct identifier tuples: the links are made between these, not between rows
+        tuples = _combine(agents, phone)
+        first = _first_rows(tuples)
+        identities = [
+            (nrds_values[nrds[i]] if nrds[i] >= 0 else None, uuid_values[uuid[i]] if uuid[i] >= 0 else None,
+             name_values[name[i]] if name[i] >= 0 else None, phone_values[phone[i]] if phone[i] >= 0 else None)
+            for i in first
+        ]
+
+        parent: Dict[str, str] = {}
+        nrds_of: Dict[str, Optional[str]] = {}  #: root -> NRDS id of its group
+
+        def find(node: str) -> str:
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def union(a: str, b: str) -> None:
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                return
+            nrds_a, nrds_b = nrds_of.get(root_a), nrds_of.get(root_b)
+            if nrds_a and nrds_b and nrds_a != nrds_b:
+                return  #: a shared uuid, key or name + phone, but two different agents by NRDS id
+            parent[root_b] = root_a
+            nrds_of[root_a] = nrds_a or nrds_b
+
+        def key_node(identifier: str) -> str:
+            """Node of the key a previous resolve() gave identifier; an "nrds:" key carries its NRDS id."""
+            key = self.keys[identifier]
+            node = f"key:{key}"
+            if node not in parent and key.startswith("nrds:"):
+                nrds_of[node] = key[len("nrds:"):]
+            find(node)
+            return node
+
+        anchors = []
+        for nrds_id, uuid_id, name_key, phone_key in identities:
+            hard = ([f"nrds:{nrds_id}"] if nrds_id else []) + ([f"uuid:{uuid_id}"] if uuid_id else [])
+            for node in hard:
+                if node.startswith("nrds:"):
+                    nrds_of.setdefault(find(node), nrds_id)
+                union(hard[0], node)
+                if node in self.keys:
+                    union(key_node(node), node)
+            soft = None
+            if name_key and phone_key:
+                soft = f"name:{name_key}|{phone_key}"
+            elif name_key and not hard:
+                soft = f"name:{name_key}"
+            anchors.append((hard[0] if hard else soft, soft))
+
+        for anchor, soft in anchors:
+            if soft is not None:
+                find(soft)
+                if soft in self.keys:
+                    union(key_node(soft), soft)
+                union(anchor, soft)
+
+        # Key of each group: a key it already had, else its strongest identifier
+        strength = {"key": 0, "nrds": 1, "uuid": 2, "name": 3}
+        best: Dict[str, tuple] = {}
+        for node in list(parent):
+            root = find(node)
+            kind, value = node.split(":", 1)
+            candidate = (strength[kind], value if kind == "key" else node)
+            if root not in best or candidate < best[root]:
+                best[root] = candidate
+
+        tuple_keys = []
+        for anchor, _ in anchors:
+            tuple_keys.append(best[find(anchor)][1] if anchor else None)
+        for node in parent:
+            if not node.startswith("key:"):
+                self.keys[node] = best[find(node)][1]
+
+        index = names.index if isinstance(names, pd.Series) else None
+        keys = np.array(tuple_keys, dtype=object)[tuples] if count else np.array([], dtype=object)
+        return pd.Series(keys, index=index, dtype=object, name="agent_key")
+
+
+def add_agent_key(df: pd.DataFrame, resolver: Optional[AgentResolver] = None, inplace: bool = False) -> pd.DataFrame:
+    """
+    Add an agent_key column (see AgentResolver).
+
+    With an agent_key column, the agent analytics of agent_broker (get_agent_activity, analyze_agent_specialization,
+    unique_agents counts) group by agent_key instead of the raw agent_name.
+
+    Args:
+        df: DataFrame with property data
+        resolver: AgentResolver to reuse across scrapes (a new one is used otherwise)
+        inplace: Add the column to df itself instead of a copy
+
+    Returns:
+        DataFrame with agent_key added
+    """
+    target = df if inplace else df.copy()
+    if target.empty or "agent_name" not in target.columns:
+        target["agent_key"] = pd.Series(dtype=object)
+        return target
+    target["agent_key"] = (resolver or AgentResolver()).resolve(target)
+    return target
@@ -0,0 +1,164 @@
+"""
+Apache Arrow and Polars result builders.
+
+scrape_property(return_type="arrow") returns a pyarrow.Table and return_type="polars" a polars.DataFrame. Both have
+the columns of the pandas result, built from the same column arrays (so clean_data applies the same way), except that
+nested fields keep their structure instead of being flattened to strings or Python objects:
+
+- tags, alt_photos and nearby_schools are ``list<string>``
+- tax_history, agent_phones and office_phones are ``list<struct>``
+- list_date, pending_date, last_sold_date, last_status_change_date and last_update_date are timestamps
+
+With compact=True (scrape_property(compact_dtypes=True)), the compact schema of homeharvest.schema applies: repeated
+strings become dictionary columns (polars Categorical), counts and prices int32 (int64/float64 where they do not fit),
+price_per_sqft and hoa_fee float32, and flags bool.
+
+pyarrow (and polars for return_type="polars") are optional dependencies: ``pip install homeharvest[arrow]`` or
+``pip install homeharvest[polars]``.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from .agent_broker import agent_contact_mask, contact_fields
+from .core.scrapers.models import Property
+from .schema import COMPACT_SCHEMA, compact_column
+from .utils import ordered_properties, property_columns
+
+TIMESTAMP_COLUMNS = ["list_date", "pending_date", "last_sold_date", "last_status_change_date", "last_update_date"]
+
+
+def _unique_schools(prop: Property) -> list[str] | None:
+    schools = list(dict.fromkeys(filter(None, prop.nearby_schools or [])))
+    return schools or None
+
+
+def _alt_photos(prop: Property) -> list[str] | None:
+    if prop.description and prop.description.alt_photos:
+        return [str(url) for url in prop.description.alt_photos]
+    return None
+
+
+#: columns taken straight from the models rather than from the flattened row values
+MODEL_COLUMNS = {
+    "nearby_schools": _unique_schools,
+    "alt_photos": _alt_photos,
+    **{column: (lambda prop, column=column: getattr(prop, column)) for column in TIMESTAMP_COLUMNS},
+}
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "return_type='arrow' requires pyarrow. Install it with: pip install homeharvest[arrow]"
+        ) from e
+    return pyarrow
+
+
+def import_polars():
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError(
+            "return_type='polars' requires polars and pyarrow. Install them with: pip install homeharvest[polars]"
+        ) from e
+    import_pyarrow()
+    return polars
+
+
+def _python_values(column: pd.Series) -> list:
+    return [None if value is pd.NA or (type(value) is float and value != value) else value for value in column]
+
+
+def _to_arrow_array(pa, column: pd.Series):
+    """One pandas result column as an Arrow array; mixed-type object columns fall back to strings."""
+    if column.dtype != object:
+        return pa.array(column, from_pandas=True)
+
+    values = _python_values(column)
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def to_arrow_table(
+    results: list[Property],
+    clean: bool = False,
+    add_derived_fields: bool = True,
+    require_agent_email: bool = False,
+    require_agent_phone: bool = False,
+    contact_columns: bool = False,
+    agent_resolver=None,
+    compact: bool = False,
+):
+    """
+    Build a pyarrow.Table from scraped properties, column by column.
+
+    Args:
+        results: Properties returned by the scraper
+        clean: Apply the clean_data cleaning to the columns
+        add_derived_fields: Derive price_per_sqft while cleaning
+        require_agent_email: Keep only rows with an agent email (as filter_by_agent_contact)
+        require_agent_phone: Keep only rows with an agent phone number (as filter_by_agent_contact)
+        contact_columns: Append the normalized contact columns (as agent_broker.normalize_contacts)
+        agent_resolver: Append an agent_key column resolved by this agent_identity.AgentResolver
+        compact: Use the compact schema's Arrow types (dictionary, int32, float32, bool; see homeharvest.schema)
+
+    Returns:
+        pyarrow.Table with the columns of the pandas result
+    """
+    pa = import_pyarrow()
+    if not results:
+        return pa.table({})
+
+    columns = property_columns(results, clean=clean, add_derived_fields=add_derived_fields)
+    contacts = contact_fields(columns) if contact_columns else {}
+    columns.update(contacts)
+    if require_agent_email or require_agent_phone:
+        mask = agent_contact_mask(columns, require_email=require_agent_email, require_phone=require_agent_phone)
+        results = [prop for prop, keep in zip(results, mask) if keep]
+        columns = {name: column[mask].reset_index(drop=True) for name, column in columns.items()}
+    extra = list(contacts)
+    if agent_resolver is not None:
+        columns["agent_key"] = agent_resolver.resolve(columns)
+        extra.append("agent_key")
+    if compact:
+        for name in COMPACT_SCHEMA.keys() - MODEL_COLUMNS.keys():  #: model columns are typed already
+            if name in columns:
+                columns[name] = compact_column(name, columns[name])
+
+    arrays = []
+    for name in ordered_properties:
+        build = MODEL_COLUMNS.get(name)
+        if build is None:
+            arrays.append(_to_arrow_array(pa, columns[name]))
+            continue
+        try:
+            arrays.append(pa.array([build(prop) for prop in results]))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            #: e.g. naive and tz-aware dates mixed in one column
+            arrays.append(_to_arrow_array(pa, columns[name]))
+    arrays.extend(_to_arrow_array(pa, columns[name]) for name in extra)
+    return pa.Table.from_arrays(arrays, names=ordered_properties + extra)
+
+
+def to_polars(
+    results: list[Property],
+    clean: bool = False,
+    add_derived_fields: bool = True,
+    require_agent_email: bool = False,
+    require_agent_phone: bool = False,
+    contact_columns: bool = False,
+    agent_resolver=None,
+    compact: bool = False,
+):
+    """Build a polars.DataFrame from scraped properties (via to_arrow_table, without copying the columns again)."""
+    pl = import_polars()
+    return pl.from_arrow(to_arrow_table(results, clean=clean, add_derived_fields=add_derived_fields,
+                                        require_agent_email=require_agent_email,
+                                        require_agent_phone=require_agent_phone,
+                                        contact_columns=contact_columns, agent_resolver=agent_resolver,
+                                        compact=compact))
@@ -1,17 +1,26 @@
 from __future__ import annotations
+import time
 from typing import Union
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import uuid
+import hashlib
 from ...exceptions import AuthenticationError
-from .models import Property, ListingType, SiteName, SearchPropertyType, ReturnType
+from ...state_store import StateStore
+from ...stats import ScrapeStats
+from ...tag_index import TagIndex
+from ... import json_backend
+from ...hooks import HOOK_EVENTS, RequestEvent, ResponseEvent, endpoint_name, retry_events
+from .models import Property, ListingType, SiteName, SearchPropertyType, ReturnType, ResumeToken
 import json
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ScraperInput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     location: str
     listing_type: ListingType | list[ListingType] | None
     property_type: list[SearchPropertyType] | None = None
@@ -54,6 +63,7 @@ class ScraperInput(BaseModel):
     # New sorting parameters
     sort_by: str | list[str] | None = None
     sort_direction: str | list[str] = "desc"
+    top_k: int | None = None  # keep only the best top_k homes by sort_by
 
     # Tag filtering parameters
     tag_filters: list[str] | None = None
@@ -75,25 +85,55 @@ class ScraperInput(BaseModel):
     # Pagination control
     parallel: bool = True
 
+    # Checkpoint/resume
+    resumable: bool = False
+    resume_token: str | dict | None = None
+
+    # Incremental (delta) scrapes
+    delta: bool = False
+    state_store: StateStore | None = None
+
+    # Request/response observers (see homeharvest.hooks)
+    hooks: list | None = None
+
+    def query_key(self) -> str:
+        """Fingerprint of the fields that shape the search query and its client-side filters."""
+        query_fields = self.model_dump(mode="json", exclude=NON_QUERY_FIELDS)
+        encoded = json.dumps(query_fields, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def watermark_key(self) -> str:
+        """Fingerprint used for delta watermarks.
+
+        Ignores the update window and sort that delta mode manages itself, and limit, which only caps how far a run may
+        page: raising limit after a run was cut short resumes the same watermark.
+        """
+        return self.model_copy(update={
+            "updated_since": None, "updated_in_past_hours": None, "sort_by": None, "sort_direction": "desc",
+            "limit": ScraperInput.model_fields["limit"].default,
+        }).query_key()
+
+
+#: inputs that change how a search is transported or returned, but not which listings it finds
+NON_QUERY_FIELDS = {"proxy", "return_type", "parallel", "resumable", "resume_token", "delta", "state_store", "hooks"}
+
 
 class Scraper:
     session = None
 
-    def __init__(
-        self,
-        scraper_input: ScraperInput,
-    ):
-        self.location = scraper_input.location
-        self.listing_type = scraper_input.listing_type
-        self.property_type = scraper_input.property_type
+    @staticmethod
+    def default_retries() -> Retry:
+        return Retry(
+            total=3, backoff_factor=4, status_forcelist=[429, 403], allowed_methods=frozenset(["GET", "POST"])
+        )
 
-        if not self.session:
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Return the shared session, creating it (with the default retrying transport) on first use."""
+        if not Scraper.session:
             Scraper.session = requests.Session()
-            retries = Retry(
-                total=3, backoff_factor=4, status_forcelist=[429, 403], allowed_methods=frozenset(["GET", "POST"])
-            )
 
-            adapter = HTTPAdapter(max_retries=retries)
+            adapter = HTTPAdapter(max_retries=cls.default_retries())
             Scraper.session.mount("http://", adapter)
             Scraper.session.mount("https://", adapter)
             Scraper.session.headers.update(
@@ -115,6 +155,31 @@ class Scraper:
                     "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
                 }
             )
+        return Scraper.session
+
+    @classmethod
+    def mount_transport(cls, adapter) -> dict:
+        """Route all scraper traffic through `adapter` (see homeharvest.transport). Returns the previous adapters."""
+        session = cls.get_session()
+        previous = {prefix: session.adapters.get(prefix) for prefix in ("http://", "https://")}
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return previous
+
+    def __init__(
+        self,
+        scraper_input: ScraperInput,
+    ):
+        self.location = scraper_input.location
+        self.listing_type = scraper_input.listing_type
+        self.property_type = scraper_input.property_type
+
+        self.get_session()
+        self.stats = ScrapeStats()
+        self.hooks = list(scraper_input.hooks or [])
+        for hook in self.hooks:
+            if not any(callable(getattr(hook, name, None)) for name in HOOK_EVENTS):
+                raise ValueError(f"Hook {hook!r} implements none of {', '.join(HOOK_EVENTS)}.")
 
         if scraper_input.proxy:
             proxy_url = scraper_input.proxy
@@ -160,11 +225,13 @@ class Scraper:
         # New sorting
         self.sort_by = scraper_input.sort_by
         self.sort_direction = scraper_input.sort_direction
+        self.top_k = scraper_input.top_k
 
         # Tag filtering
         self.tag_filters = scraper_input.tag_filters
         self.tag_match_type = scraper_input.tag_match_type
         self.tag_exclude = scraper_input.tag_exclude
+        self.tag_index = TagIndex()
 
         # Additional property filters
         self.hoa_fee_min = scraper_input.hoa_fee_min
@@ -181,6 +248,60 @@ class Scraper:
         # Pagination control
         self.parallel = scraper_input.parallel
 
+        # Checkpoint/resume
+        self.resume_state = None
+        if scraper_input.resume_token:
+            self.resume_state = ResumeToken.loads(scraper_input.resume_token)
+            if self.resume_state.query_key != scraper_input.query_key():
+                raise ValueError("resume_token was created for a different query and cannot be resumed here.")
+        elif scraper_input.resumable:
+            self.resume_state = ResumeToken(query_key=scraper_input.query_key())
+
+    def _get(self, url: str, endpoint: str | None = None, **kwargs) -> requests.Response:
+        return self._request("GET", url, endpoint, **kwargs)
+
+    def _post(self, url: str, endpoint: str | None = None, **kwargs) -> requests.Response:
+        return self._request("POST", url, endpoint, **kwargs)
+
+    def _request(self, method: str, url: str, endpoint: str | None, **kwargs) -> requests.Response:
+        """Send one request through the shared session, recording stats and notifying hooks."""
+        send = self.session.get if method == "GET" else self.session.post
+        if not self.hooks:
+            response = send(url, **kwargs)
+            self.stats.record_response(response)
+            return response
+
+        endpoint = endpoint or endpoint_name(url)
+        self._notify("on_request", RequestEvent(endpoint=endpoint, method=method, url=url))
+        started = time.perf_counter()
+        try:
+            response = send(url, **kwargs)
+        except Exception as e:
+            self._notify("on_response", ResponseEvent(
+                endpoint=endpoint, method=method, url=url, latency=time.perf_counter() - started,
+                error=f"{type(e).__name__}: {e}",
+            ))
+            raise
+        latency = time.perf_counter() - started
+        self.stats.record_response(response)
+
+        retries = retry_events(endpoint, method, url, response)
+        for event in retries:
+            self._notify("on_retry", event)
+        request = getattr(response, "request", None)
+        self._notify("on_response", ResponseEvent(
+            endpoint=endpoint, method=method, url=url, status=response.status_code, latency=latency,
+            bytes_received=len(response.content or b""), bytes_sent=len(getattr(request, "body", None) or b""),
+            retries=len(retries),
+        ))
+        return response
+
+    def _notify(self, event_name: str, event) -> None:
+        for hook in self.hooks:
+            handler = getattr(hook, event_name, None)
+            if handler is not None:
+                handler(event)
+
     def search(self) -> list[Union[Property | dict]]: ...
 
     @staticmethod
@@ -213,7 +334,7 @@ class Scraper:
             ),
         )
 
-        data = response.json()
+        data = json_backend.decode_response(response)
 
         if not (access_token := data.get("access_token")):
             raise AuthenticationError(
@@ -9,6 +9,8 @@ class ReturnType(Enum):
     pydantic = "pydantic"
     pandas = "pandas"
     raw = "raw"
+    arrow = "arrow"
+    polars = "polars"
 
 
 class SiteName(Enum):
@@ -371,3 +373,37 @@ class Unit(BaseModel):
     description: UnitDescription | None = None
     photos: list[dict] | None = None  # Keep as dict for photo structure
     list_price: int | None = None
+
+
+# Pagination state
+
+class ResumeToken(BaseModel):
+    """Serializable checkpoint of a multi-page search, used to resume a scrape that died partway."""
+    version: int = 1
+    query_key: str = Field(..., description="Fingerprint of the ScraperInput the token was created for")
+    location_info: dict | None = Field(None, description="Resolved autocomplete result for the location")
+    search_type: str | None = None
+    search_variables: dict | None = None
+    total: int | None = Field(None, description="Total result count reported by the first page")
+    planned_offsets: list[int] = []
+    pages: dict[int, list[dict]] = Field({}, description="Raw results of completed pages, keyed by offset")
+    seen_property_ids: list[str] = []
+
+    @property
+    def completed_offsets(self) -> list[int]:
+        return sorted(self.pages)
+
+    @property
+    def missing_offsets(self) -> list[int]:
+        return [offset for offset in self.planned_offsets if offset not in self.pages]
+
+    def dumps(self) -> str:
+        return self.model_dump_json()
+
+    @classmethod
+    def loads(cls, token: str | dict | ResumeToken) -> ResumeToken:
+        if isinstance(token, ResumeToken):
+            return token
+        if isinstance(token, str):
+            return cls.model_validate_json(token)
+        return cls.model_validate(token)
@@ -7,9 +7,15 @@ This module implements the scraper for realtor.com
 
 from __future__ import annotations
 
+import heapq
 import json
+import math
+import threading
+import time
+import warnings
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import islice
 from json import JSONDecodeError
 from typing import Dict, Union
 
@@ -21,12 +27,17 @@ from tenacity import (
 )
 
 from .. import Scraper
+from .... import json_backend
+from ....hooks import PageEvent, RetryEvent
+from ....exceptions import ScrapeInterrupted
+from ....state_store import SQLiteStateStore
 from ..models import (
     Property,
     ListingType,
     ReturnType
 )
 from .queries import GENERAL_RESULTS_QUERY, SEARCH_HOMES_DATA, HOMES_DATA, HOME_FRAGMENT
+from .filters import FilterCondition, FilterPipeline, mask_condition, row_condition
 from .processors import (
     process_property,
     process_extra_property_details,
@@ -40,10 +51,34 @@ class RealtorScraper(Scraper):
     PROPERTY_GQL = "https://graph.realtor.com/graphql"
     ADDRESS_AUTOCOMPLETE_URL = "https://parser-external.geo.moveaws.com/suggest"
     NUM_PROPERTY_WORKERS = 20
+    NUM_PAGE_WORKERS = None  #: concurrent page fetches in parallel mode; None uses the ThreadPoolExecutor default
     DEFAULT_PAGE_SIZE = 200
+    STREAM_RESULTS = False  #: decode search pages one result at a time (json_backend.ResultStream) to cut peak memory
 
     def __init__(self, scraper_input):
         super().__init__(scraper_input)
+        self._resume_lock = threading.Lock()
+
+        # Delta mode: page newest-first by last_update_date and stop at the stored watermark
+        self.delta = scraper_input.delta
+        self.state_store = scraper_input.state_store
+        self.watermark_key = None
+        self.pending_watermark = None
+        self._boundary_ids = set()
+
+        if self.delta:
+            if self.state_store is None:
+                self.state_store = SQLiteStateStore()
+            self.watermark_key = scraper_input.watermark_key()
+            self.sort_by = "last_update_date"
+            self.sort_direction = "desc"
+            self.parallel = False  #: early termination only happens in sequential mode
+
+            watermark = self.state_store.get_watermark(self.watermark_key)
+            if watermark:
+                self.updated_since = watermark.value
+                self.updated_in_past_hours = None
+                self._boundary_ids = set(watermark.boundary_ids)
 
     def handle_location(self):
         # Get client_id from listing_type
@@ -61,11 +96,12 @@ class RealtorScraper(Scraper):
             "area_types": "city,state,county,postal_code,address,street,neighborhood,school,school_district,university,park",
         }
 
-        response = self.session.get(
+        response = self._get(
             self.ADDRESS_AUTOCOMPLETE_URL,
+            endpoint="autocomplete",
             params=params,
         )
-        response_json = response.json()
+        response_json = json_backend.decode_response(response)
 
         result = response_json["autocomplete"]
 
@@ -91,8 +127,8 @@ class RealtorScraper(Scraper):
             "variables": variables,
         }
 
-        response = self.session.post(self.SEARCH_GQL_URL, json=payload)
-        response_json = response.json()
+        response = self._post(self.SEARCH_GQL_URL, endpoint="latest_listing_id", json=payload)
+        response_json = json_backend.decode_response(response)
 
         property_info = response_json["data"]["property"]
         if property_info["listings"] is None:
@@ -121,8 +157,8 @@ class RealtorScraper(Scraper):
             "variables": variables,
         }
 
-        response = self.session.post(self.SEARCH_GQL_URL, json=payload)
-        response_json = response.json()
+        response = self._post(self.SEARCH_GQL_URL, endpoint="home", json=payload)
+        response_json = json_backend.decode_response(response)
 
         property_info = response_json["data"]["home"]
 
@@ -420,11 +456,21 @@ class RealtorScraper(Scraper):
             "variables": variables,
         }
 
-        response = self.session.post(self.SEARCH_GQL_URL, json=payload)
-        response_json = response.json()
         search_key = "home_search" if "home_search" in query else "property_search"
+        offset = variables.get("offset", 0)
+
+        page_started = time.perf_counter()
+        with self.stats.stage("page_fetch"):
+            response = self._post(self.SEARCH_GQL_URL, endpoint="search", json=payload)
+            if self.STREAM_RESULTS:
+                page = json_backend.ResultStream(response.content, ("data", search_key, "results"))
+            else:
+                response_json = json_backend.decode_response(response)
+        page_latency = time.perf_counter() - page_started
+        self.stats.count("pages")
 
-        properties: list[Union[Property, dict]] = []
+        if self.STREAM_RESULTS:
+            return self._stream_page(page, offset, search_type, page_latency)
 
         if (
             response_json is None
@@ -438,15 +484,19 @@ class RealtorScraper(Scraper):
 
         properties_list = response_json["data"][search_key]["results"]
         total_properties = response_json["data"][search_key]["total"]
-        offset = variables.get("offset", 0)
 
         #: limit the number of properties to be processed
         #: example, if your offset is 200, and your limit is 250, return 50
         properties_list: list[dict] = properties_list[: self.limit - offset]
+        return self._finish_page(properties_list, total_properties, offset, search_type, page_latency)
 
+    def _finish_page(self, properties_list: list[dict], total_properties: int, offset: int, search_type: str,
+                     page_latency: float) -> dict:
+        """Merge bulk details into a page of raw results, checkpoint it and process it."""
         if self.extra_property_data:
             property_ids = [data["property_id"] for data in properties_list]
-            extra_property_details = self.get_bulk_prop_details(property_ids) or {}
+            with self.stats.stage("bulk_details"):
+                extra_property_details = self.get_bulk_prop_details(property_ids) or {}
 
             for result in properties_list:
                 specific_details_for_property = extra_property_details.get(result["property_id"], {})
@@ -459,35 +509,150 @@ class RealtorScraper(Scraper):
 
                 result.update(specific_details_for_property)
 
-        if self.return_type != ReturnType.raw:
-            with ThreadPoolExecutor(max_workers=self.NUM_PROPERTY_WORKERS) as executor:
-                # Store futures with their indices to maintain sort order
-                futures_with_indices = [
-                    (i, executor.submit(process_property, result, self.mls_only, self.extra_property_data,
-                                       self.exclude_pending, self.listing_type, get_key, process_extra_property_details))
-                    for i, result in enumerate(properties_list)
-                ]
-
-                # Collect results and sort by index to preserve API sort order
-                results = []
-                for idx, future in futures_with_indices:
-                    result = future.result()
-                    if result:
-                        results.append((idx, result))
-
-                # Sort by index and extract properties in correct order
-                results.sort(key=lambda x: x[0])
-                properties = [result for idx, result in results]
-        else:
-            properties = properties_list
+        self._record_page(offset, total_properties, properties_list)
+        self._notify_page(search_type, offset, len(properties_list), total_properties, page_latency)
 
         return {
             "total": total_properties,
-            "properties": properties,
+            "properties": self._process_properties(properties_list),
         }
 
+    def _stream_page(self, page: json_backend.ResultStream, offset: int, search_type: str, page_latency: float) -> dict:
+        """STREAM_RESULTS mode: decode the page one result at a time.
+
+        When nothing needs the raw page afterwards (no extra property details, no raw return type, no resume
+        checkpoint) each result is processed as soon as it is decoded, so the decoded page never exists as a whole.
+        """
+        results = iter(page)
+        wanted = islice(results, max(self.limit - offset, 0))
+        keep_raw = self.extra_property_data or self.return_type == ReturnType.raw or self.resume_state is not None
+
+        if keep_raw:
+            properties_list = list(wanted)
+        else:
+            fetched, properties = 0, []
+            with self.stats.stage("process_property"):
+                for result in wanted:
+                    fetched += 1
+                    processed = process_property(result, self.mls_only, self.extra_property_data,
+                                                 self.exclude_pending, self.listing_type, get_key,
+                                                 process_extra_property_details)
+                    if processed:
+                        properties.append(processed)
+
+        if "total" not in page.fields:
+            for _ in results:  #: total comes after the results in this response; walk on to reach it
+                pass
+        if not page.found:
+            return {"total": 0, "properties": []}
+
+        total_properties = page.fields.get("total")
+        if keep_raw:
+            return self._finish_page(properties_list, total_properties, offset, search_type, page_latency)
+
+        self.stats.count("rows_fetched", fetched)
+        self.stats.record_dropped("process_property", fetched, len(properties))
+        self._notify_page(search_type, offset, fetched, total_properties, page_latency)
+        return {"total": total_properties, "properties": properties}
+
+    def _notify_page(self, search_type: str, offset: int, rows: int, total: int | None, latency: float):
+        if self.hooks:
+            self._notify("on_page", PageEvent(
+                search_type=search_type, offset=offset, rows=rows, total=total or 0, latency=latency,
+            ))
+
+    def _process_properties(self, properties_list: list[dict]) -> list[Union[Property, dict]]:
+        """Turn the raw results of one page into the requested return type, preserving API order."""
+        self.stats.count("rows_fetched", len(properties_list))
+        if self.return_type == ReturnType.raw:
+            return properties_list
+
+        with self.stats.stage("process_property"), ThreadPoolExecutor(max_workers=self.NUM_PROPERTY_WORKERS) as executor:
+            # Store futures with their indices to maintain sort order
+            futures_with_indices = [
+                (i, executor.submit(process_property, result, self.mls_only, self.extra_property_data,
+                                   self.exclude_pending, self.listing_type, get_key, process_extra_property_details))
+                for i, result in enumerate(properties_list)
+            ]
+
+            # Collect results and sort by index to preserve API sort order
+            results = []
+            for idx, future in futures_with_indices:
+                result = future.result()
+                if result:
+                    results.append((idx, result))
+
+            # Sort by index and extract properties in correct order
+            results.sort(key=lambda x: x[0])
+            self.stats.record_dropped("process_property", len(properties_list), len(results))
+            return [result for idx, result in results]
+
+    def _record_page(self, offset: int, total: int, properties_list: list[dict]):
+        """Checkpoint a fetched page into the resume state (no-op unless the scrape is resumable)."""
+        if self.resume_state is None:
+            return
+
+        with self._resume_lock:
+            if self.resume_state.total is None:
+                self.resume_state.total = total
+            self.resume_state.pages[offset] = properties_list
+            self.resume_state.seen_property_ids.extend(
+                result["property_id"] for result in properties_list if result.get("property_id")
+            )
+
+    def _search_page(self, variables: dict, search_type: str) -> dict:
+        """Return one page of results, from the resume token when it was already fetched."""
+        offset = variables.get("offset", 0)
+        if self.resume_state is not None and offset in self.resume_state.pages:
+            return {
+                "total": self.resume_state.total,
+                "properties": self._process_properties(self.resume_state.pages[offset]),
+            }
+        return self.general_search(variables, search_type=search_type)
+
+    def _merge_pages(self, homes: list, pages: list[list]) -> list:
+        """Append pages in offset order. Resumable scrapes drop listings that shifted into a later page."""
+        if self.resume_state is None:
+            for properties in pages:
+                homes.extend(properties)
+            return homes
+
+        seen = {self._get_property_id(home) for home in homes}
+        for properties in pages:
+            for home in properties:
+                property_id = self._get_property_id(home)
+                if property_id in seen:
+                    continue
+                seen.add(property_id)
+                homes.append(home)
+        return homes
+
+    @staticmethod
+    def _get_property_id(home):
+        return home.get("property_id") if isinstance(home, dict) else getattr(home, "property_id", None)
+
+    @property
+    def resume_token(self) -> str | None:
+        """Serialized checkpoint of the current search, or None when the scrape is not resumable."""
+        if self.resume_state is None:
+            return None
+        with self._resume_lock:
+            return self.resume_state.dumps()
+
+    def _interrupted(self, error: Exception) -> ScrapeInterrupted:
+        missing = len(self.resume_state.missing_offsets) if self.resume_state.planned_offsets else "unknown"
+        return ScrapeInterrupted(
+            f"Scrape interrupted after {len(self.resume_state.pages)} page(s), {missing} page(s) missing: {error}. "
+            f"Pass the attached resume_token to continue.",
+            resume_token=self.resume_token,
+        )
+
     def search(self):
-        location_info = self.handle_location()
+        if self.resume_state is not None and self.resume_state.location_info is not None:
+            location_info = self.resume_state.location_info
+        else:
+            with self.stats.stage("handle_location"):
+                location_info = self.handle_location()
         if not location_info:
             return []
 
@@ -534,107 +699,233 @@ class RealtorScraper(Scraper):
         if self.foreclosure:
             search_variables["foreclosure"] = self.foreclosure
 
-        result = self.general_search(search_variables, search_type=search_type)
+        if self.resume_state is not None:
+            self.resume_state.location_info = location_info
+            self.resume_state.search_type = search_type
+            self.resume_state.search_variables = search_variables
+
+        pagination_started = time.perf_counter()
+        try:
+            result = self._search_page(search_variables, search_type=search_type)
+        except Exception as e:
+            if self.resume_state is None:
+                raise
+            raise self._interrupted(e) from e
+
         total = result["total"]
-        homes = result["properties"]
+        homes = self._merge_pages([], [result["properties"]])
+
+        remaining_offsets = list(range(
+            self.offset + self.DEFAULT_PAGE_SIZE,
+            min(total, self.offset + self.limit),
+            self.DEFAULT_PAGE_SIZE,
+        ))
+        if self.resume_state is not None:
+            self.resume_state.planned_offsets = [self.offset] + remaining_offsets
 
         # Fetch remaining pages based on parallel parameter
-        if self.offset + self.DEFAULT_PAGE_SIZE < min(total, self.offset + self.limit):
+        if remaining_offsets and self._server_sorted_top_k():
+            homes = self._fetch_top_k_pages(homes, remaining_offsets, search_variables, search_type)
+        elif remaining_offsets:
             if self.parallel:
                 # Parallel mode: Fetch all remaining pages in parallel
-                with ThreadPoolExecutor() as executor:
+                with ThreadPoolExecutor(max_workers=self.NUM_PAGE_WORKERS) as executor:
                     futures_with_offsets = [
                         (i, executor.submit(
-                            self.general_search,
+                            self._search_page,
                             variables=search_variables | {"offset": i},
                             search_type=search_type,
                         ))
-                        for i in range(
-                            self.offset + self.DEFAULT_PAGE_SIZE,
-                            min(total, self.offset + self.limit),
-                            self.DEFAULT_PAGE_SIZE,
-                        )
+                        for i in remaining_offsets
                     ]
 
                     # Collect results and sort by offset to preserve API sort order
                     results = []
+                    errors = []
                     for offset, future in futures_with_offsets:
-                        results.append((offset, future.result()["properties"]))
+                        try:
+                            results.append((offset, future.result()["properties"]))
+                        except Exception as e:
+                            if self.resume_state is None:
+                                raise
+                            errors.append(e)
+
+                if errors:
+                    raise self._interrupted(errors[0]) from errors[0]
 
-                    results.sort(key=lambda x: x[0])
-                    for offset, properties in results:
-                        homes.extend(properties)
+                results.sort(key=lambda x: x[0])
+                homes = self._merge_pages(homes, [properties for offset, properties in results])
             else:
                 # Sequential mode: Fetch pages one by one with early termination checks
-                for current_offset in range(
-                    self.offset + self.DEFAULT_PAGE_SIZE,
-                    min(total, self.offset + self.limit),
-                    self.DEFAULT_PAGE_SIZE,
-                ):
+                for current_offset in remaining_offsets:
                     # Check if we should continue based on time-based filters
                     if not self._should_fetch_more_pages(homes):
                         break
 
-                    result = self.general_search(
-                        variables=search_variables | {"offset": current_offset},
-                        search_type=search_type,
-                    )
-                    page_properties = result["properties"]
-                    homes.extend(page_properties)
+                    try:
+                        result = self._search_page(
+                            variables=search_variables | {"offset": current_offset},
+                            search_type=search_type,
+                        )
+                    except Exception as e:
+                        if self.resume_state is None:
+                            raise
+                        raise self._interrupted(e) from e
 
-        # Apply client-side hour-based filtering if needed
-        # (API only supports day-level filtering, so we post-filter for hour precision)
-        has_hour_precision = (self.date_from_precision == "hour" or self.date_to_precision == "hour")
-        if self.past_hours or has_hour_precision:
-            homes = self._apply_hour_based_date_filter(homes)
-        # Apply client-side date filtering for PENDING properties
-        # (server-side filters are broken in the API)
-        elif self.listing_type == ListingType.PENDING and (self.last_x_days or self.date_from):
-            homes = self._apply_pending_date_filter(homes)
+                    homes = self._merge_pages(homes, [result["properties"]])
 
-        # Apply client-side filtering by last_update_date if specified
-        if self.updated_since or self.updated_in_past_hours:
-            homes = self._apply_last_update_date_filter(homes)
+        self.stats.add_time("search", time.perf_counter() - pagination_started)
 
-        # Apply client-side tag filtering if specified
-        if self.tag_filters or self.tag_exclude:
-            homes = self._apply_tag_filters(homes)
+        if self.delta:
+            self.pending_watermark = self._delta_watermark(homes, total)
 
-        # Apply additional property filters if specified
-        if any([self.hoa_fee_min, self.hoa_fee_max, self.stories_min, self.stories_max,
-                self.garage_spaces_min, self.garage_spaces_max, self.has_pool, self.has_garage,
-                self.waterfront, self.has_view]):
-            homes = self._apply_additional_filters(homes)
+        filters_started = time.perf_counter()
+
+        # All client-side filters (date windows, tags, additional filters, raw-data filters) in one pass
+        homes, rejected = self._compile_filters().apply(homes)
+        for name, count in rejected.items():
+            self.stats.record_dropped(name, count, 0)
 
         # Apply client-side sort to ensure results are properly ordered
         # This is necessary after filtering and to guarantee sort order across page boundaries
         if self.sort_by:
             homes = self._apply_sort(homes)
 
-        # Apply raw data filters (exclude_pending and mls_only) for raw return type
-        # These filters are normally applied in process_property() but are bypassed for raw data
-        if self.return_type == ReturnType.raw:
-            homes = self._apply_raw_data_filters(homes)
+        self.stats.add_time("filters", time.perf_counter() - filters_started)
+        return homes
+
+    def _server_sorted_top_k(self) -> bool:
+        """True when the API already returns homes in top_k order, so pagination can stop once top_k are in hand."""
+        return (
+            self.top_k is not None and isinstance(self.sort_by, str)
+            and self.resume_state is None and not self.delta
+        )
+
+    def _fetch_top_k_pages(self, homes, remaining_offsets, search_variables, search_type):
+        """Fetch only as many further pages as top_k needs.
 
+        The API sorts by sort_by, so once top_k of the homes fetched so far pass the client-side filters, no later page
+        can displace them. Pages are fetched in waves sized from the filter pass rate so far: in parallel when
+        parallel=True, one page at a time otherwise.
+        """
+        pipeline = self._compile_filters()
+        remaining = list(remaining_offsets)
+        while remaining:
+            kept = len(pipeline.apply(homes)[0]) if pipeline else len(homes)
+            if kept >= self.top_k or not self._should_fetch_more_pages(homes):
+                break
+
+            pass_rate = max(kept / len(homes), 0.05) if homes else 1.0
+            wave_size = math.ceil((self.top_k - kept) / pass_rate / self.DEFAULT_PAGE_SIZE) if self.parallel else 1
+            wave, remaining = remaining[:wave_size], remaining[wave_size:]
+
+            if len(wave) > 1:
+                with ThreadPoolExecutor(max_workers=self.NUM_PAGE_WORKERS) as executor:
+                    pages = list(executor.map(
+                        lambda offset: self._search_page(search_variables | {"offset": offset}, search_type),
+                        wave,
+                    ))
+            else:
+                pages = [self._search_page(search_variables | {"offset": wave[0]}, search_type)]
+            homes = self._merge_pages(homes, [page["properties"] for page in pages])
+
+        self.stats.count("pages_skipped", len(remaining))
         return homes
 
-    def _apply_hour_based_date_filter(self, homes):
-        """Apply client-side hour-based date filtering for all listing types.
+    def _compile_filters(self) -> FilterPipeline:
+        """The active client-side conditions of this search, in the order they are applied, with cutoffs parsed."""
+        conditions = []
 
-        This is used when past_hours or date_from/date_to have hour precision,
-        since the API only supports day-level filtering.
+        # Hour-based date filtering (the API only supports day-level filtering, so we post-filter for hour precision)
+        has_hour_precision = (self.date_from_precision == "hour" or self.date_to_precision == "hour")
+        if self.past_hours or has_hour_precision:
+            conditions.append(self._hour_based_date_condition())
+        # Date filtering for PENDING properties (server-side filters are broken in the API)
+        elif self.listing_type == ListingType.PENDING and (self.last_x_days or self.date_from):
+            conditions.append(self._pending_date_condition())
+
+        if self.updated_since or self.updated_in_past_hours:
+            conditions.append(self._last_update_date_condition())
+
+        # Delta mode: drop listings already delivered at exactly the watermark timestamp
+        if self._boundary_ids:
+            conditions.append(self._watermark_boundary_condition())
+
+        if self.tag_filters or self.tag_exclude:
+            conditions.append(self._tag_condition())
+
+        # has_pool=False or hoa_fee_min=0 are filters too, so check for None rather than truthiness
+        if any(value is not None for value in [
+            self.hoa_fee_min, self.hoa_fee_max, self.stories_min, self.stories_max,
+            self.garage_spaces_min, self.garage_spaces_max, self.has_pool, self.has_garage,
+            self.waterfront, self.has_view,
+        ]):
+            conditions.append(self._additional_filters_condition())
+
+        # exclude_pending and mls_only are normally applied in process_property(), which raw returns bypass
+        if self.return_type == ReturnType.raw:
+            conditions.append(self._raw_data_condition())
+
+        return FilterPipeline([condition for condition in conditions if condition is not None])
+
+    def _newest_update(self, homes) -> tuple[str, list[str]] | None:
+        """Find the newest last_update_date among fetched homes and the property_ids sharing it."""
+        newest = None
+        boundary_ids = []
+        for home in homes:
+            updated = self._extract_date_from_home(home, 'last_update_date')
+            if updated is None:
+                continue
+            if newest is None or updated > newest:
+                newest, boundary_ids = updated, [self._get_property_id(home)]
+            elif updated == newest:
+                boundary_ids.append(self._get_property_id(home))
+
+        if newest is None:
+            return None
+        return newest.isoformat(), boundary_ids
+
+    def _delta_watermark(self, homes, total) -> tuple[str, list[str]] | None:
+        """Watermark to commit after this delta run, or None when limit cut the run short.
+
+        Pages come newest-first, so when limit stops paging before the stored watermark is reached, the listings
+        between the watermark and the oldest fetched one were never returned. Advancing to the newest listing would
+        skip them for good, so the watermark stays where it was: the next run returns this window again.
         """
-        if not homes:
-            return homes
+        if total > self.offset + self.limit and self._should_fetch_more_pages(homes):
+            self.stats.delta_truncated = True
+            warnings.warn(
+                f"Delta scrape hit limit={self.limit} before reaching the stored watermark; the watermark was not "
+                f"advanced. Raise limit or narrow the query so one run covers every change.",
+                UserWarning,
+            )
+            return None
+        return self._newest_update(homes)
+
+    def _watermark_boundary_condition(self):
+        """Condition dropping homes that sit exactly on the watermark and were already returned by the previous delta run."""
+        watermark = self._parse_date_value(self.updated_since)
+        boundary_ids = self._boundary_ids
+        return row_condition("watermark_boundary", lambda home: not (
+            self._get_property_id(home) in boundary_ids
+            and self._extract_date_from_home(home, 'last_update_date') == watermark
+        ))
+
+    def commit_watermark(self):
+        """Advance the delta watermark to the newest listing of the completed search (unless it was cut short)."""
+        if not self.delta or not self.pending_watermark:
+            return None
+        value, boundary_ids = self.pending_watermark
+        self.pending_watermark = None
+        return self.state_store.advance_watermark(self.watermark_key, value, boundary_ids)
 
+    def _hour_based_date_range(self):
+        """Date range with hour precision from past_hours or date_from/date_to (None when unset or unparseable)."""
         from datetime import datetime, timedelta
 
-        # Determine date range with hour precision
-        date_range = None
-
         if self.past_hours:
             cutoff_datetime = datetime.now() - timedelta(hours=self.past_hours)
-            date_range = {'type': 'since', 'date': cutoff_datetime}
+            return {'type': 'since', 'date': cutoff_datetime}
         elif self.date_from or self.date_to:
             try:
                 from_datetime = None
@@ -649,38 +940,37 @@ class RealtorScraper(Scraper):
                     to_datetime = datetime.fromisoformat(to_datetime_str).replace(tzinfo=None)
 
                 if from_datetime and to_datetime:
-                    date_range = {'type': 'range', 'from_date': from_datetime, 'to_date': to_datetime}
+                    return {'type': 'range', 'from_date': from_datetime, 'to_date': to_datetime}
                 elif from_datetime:
-                    date_range = {'type': 'since', 'date': from_datetime}
+                    return {'type': 'since', 'date': from_datetime}
                 elif to_datetime:
-                    date_range = {'type': 'until', 'date': to_datetime}
+                    return {'type': 'until', 'date': to_datetime}
             except (ValueError, AttributeError):
-                return homes  # If parsing fails, return unfiltered
+                return None  # If parsing fails, leave results unfiltered
+        return None
+
+    def _hour_based_date_condition(self):
+        """Client-side hour-based date filter for all listing types.
 
+        This is used when past_hours or date_from/date_to have hour precision,
+        since the API only supports day-level filtering.
+        """
+        date_range = self._hour_based_date_range()
         if not date_range:
-            return homes
+            return None
 
         # Determine which date field to use based on listing type
         date_field_name = self._get_date_field_for_listing_type()
+        is_pending = self.listing_type == ListingType.PENDING
 
-        filtered_homes = []
-
-        for home in homes:
-            # Extract the appropriate date for this property
+        def in_range(home):
             property_date = self._extract_date_from_home(home, date_field_name)
-
-            # Handle properties without dates
+            # For PENDING, include contingent properties without pending_date
             if property_date is None:
-                # For PENDING, include contingent properties without pending_date
-                if self.listing_type == ListingType.PENDING and self._is_contingent(home):
-                    filtered_homes.append(home)
-                continue
-
-            # Check if property date falls within the specified range
-            if self._is_datetime_in_range(property_date, date_range):
-                filtered_homes.append(home)
+                return is_pending and self._is_contingent(home)
+            return self._is_datetime_in_range(property_date, date_range)
 
-        return filtered_homes
+        return row_condition("hour_based_date", in_range)
 
     def _get_date_field_for_listing_type(self):
         """Get the appropriate date field name for the current listing type."""
@@ -727,37 +1017,22 @@ class RealtorScraper(Scraper):
             return date_range['from_date'] <= date_obj <= date_range['to_date']
         return False
 
-    def _apply_pending_date_filter(self, homes):
-        """Apply client-side date filtering for PENDING properties based on pending_date field.
+    def _pending_date_condition(self):
+        """Client-side date filter for PENDING properties based on pending_date field.
         For contingent properties without pending_date, tries fallback date fields."""
-        if not homes:
-            return homes
-            
-        from datetime import datetime, timedelta
-        
-        # Determine date range for filtering
         date_range = self._get_date_range()
         if not date_range:
-            return homes
-            
-        filtered_homes = []
-        
-        for home in homes:
-            # Extract the best available date for this property
+            return None
+
+        def in_range(home):
             property_date = self._extract_property_date_for_filtering(home)
-            
-            # Handle properties without dates (include contingent properties)
+            # Include contingent properties without a date
             if property_date is None:
-                if self._is_contingent(home):
-                    filtered_homes.append(home)  # Include contingent without date filter
-                continue
-            
-            # Check if property date falls within the specified range
-            if self._is_date_in_range(property_date, date_range):
-                filtered_homes.append(home)
-                
-        return filtered_homes
-    
+                return self._is_contingent(home)
+            return self._is_date_in_range(property_date, date_range)
+
+        return row_condition("pending_date", in_range)
+
     def _get_pending_date(self, home):
         """Extract pending_date from a home property (handles both dict and Property object)."""
         if isinstance(home, dict):
@@ -778,20 +1053,14 @@ class RealtorScraper(Scraper):
                 return getattr(home.flags, 'is_contingent', False)
             return False
 
-    def _apply_last_update_date_filter(self, homes):
-        """Apply client-side filtering by last_update_date.
+    def _last_update_date_condition(self):
+        """Client-side filter by last_update_date.
 
         This is used when updated_since or updated_in_past_hours are specified.
         Filters properties based on when they were last updated.
         """
-        if not homes:
-            return homes
-
         from datetime import datetime, timedelta, timezone
 
-        # Determine date range for last_update_date filtering
-        date_range = None
-
         if self.updated_in_past_hours:
             # Use UTC now, strip timezone to match naive property dates
             cutoff_datetime = (datetime.now(timezone.utc) - timedelta(hours=self.updated_in_past_hours)).replace(tzinfo=None)
@@ -802,29 +1071,19 @@ class RealtorScraper(Scraper):
                 since_datetime = datetime.fromisoformat(since_datetime_str).replace(tzinfo=None)
                 date_range = {'type': 'since', 'date': since_datetime}
             except (ValueError, AttributeError):
-                return homes  # If parsing fails, return unfiltered
-
-        if not date_range:
-            return homes
-
-        filtered_homes = []
-
-        for home in homes:
-            # Extract last_update_date from the property
-            property_date = self._extract_date_from_home(home, 'last_update_date')
+                return None  # If parsing fails, leave results unfiltered
+        else:
+            return None
 
+        def in_range(home):
             # Skip properties without last_update_date
-            if property_date is None:
-                continue
-
-            # Check if property date falls within the specified range
-            if self._is_datetime_in_range(property_date, date_range):
-                filtered_homes.append(home)
+            property_date = self._extract_date_from_home(home, 'last_update_date')
+            return property_date is not None and self._is_datetime_in_range(property_date, date_range)
 
-        return filtered_homes
+        return row_condition("last_update_date", in_range)
 
-    def _apply_tag_filters(self, homes):
-        """Apply client-side tag filtering.
+    def _tag_condition(self):
+        """Client-side tag filter.
 
         Filters properties based on tags from realtor.com.
         Supports three match types:
@@ -834,132 +1093,101 @@ class RealtorScraper(Scraper):
 
         Also supports tag exclusion via tag_exclude parameter.
         """
-        if not homes:
-            return homes
-
-        # If no tag filters specified, return all homes
+        # If no tag filters specified, keep all homes
         if not self.tag_filters and not self.tag_exclude:
-            return homes
-
-        filtered_homes = []
-
-        for home in homes:
-            # Extract tags from property
-            # Tags can be in raw dict or Property object
-            if isinstance(home, dict):
-                property_tags = home.get('tags', []) or []
-            else:
-                property_tags = getattr(home, 'tags', []) or []
-
-            # Convert to lowercase for case-insensitive matching
-            property_tags_lower = [tag.lower() for tag in property_tags] if property_tags else []
-
-            # Check exclusion filters first
-            if self.tag_exclude:
-                exclude_tags_lower = [tag.lower() for tag in self.tag_exclude]
-                if any(excluded_tag in property_tags_lower for excluded_tag in exclude_tags_lower):
-                    continue  # Skip this property
-
-            # If no inclusion filters, just apply exclusion
-            if not self.tag_filters:
-                filtered_homes.append(home)
-                continue
-
-            # Apply inclusion filters
-            filter_tags_lower = [tag.lower() for tag in self.tag_filters]
+            return None
+        return mask_condition("tags", lambda homes: self.tag_index.match(
+            self._tag_bitmap(homes), self.tag_filters, self.tag_match_type, self.tag_exclude
+        ))
 
-            if self.tag_match_type == "any":
-                # Property must have at least one of the specified tags
-                if any(filter_tag in property_tags_lower for filter_tag in filter_tags_lower):
-                    filtered_homes.append(home)
-            elif self.tag_match_type == "all":
-                # Property must have all of the specified tags
-                if all(filter_tag in property_tags_lower for filter_tag in filter_tags_lower):
-                    filtered_homes.append(home)
-            elif self.tag_match_type == "exact":
-                # Property tags must exactly match specified tags (order doesn't matter)
-                if set(property_tags_lower) == set(filter_tags_lower):
-                    filtered_homes.append(home)
+    @staticmethod
+    def _get_tags(home):
+        """Tags of a raw dict or Property."""
+        if isinstance(home, dict):
+            return home.get('tags', []) or []
+        return getattr(home, 'tags', []) or []
 
-        return filtered_homes
+    def _tag_bitmap(self, homes):
+        """Tag bitmap of the homes (see tag_index.TagIndex); each distinct tag string is lowercased once per search."""
+        return self.tag_index.bitmap(self._get_tags(home) for home in homes)
 
-    def _apply_additional_filters(self, homes):
-        """Apply additional property filters (HOA, stories, garage, pool, views, etc.)
+    def _additional_filters_condition(self):
+        """Additional property filters (HOA, stories, garage, pool, views, etc.)
 
         Client-side filtering for property characteristics.
         """
-        if not homes:
-            return homes
-
-        filtered_homes = []
-
-        for home in homes:
+        return FilterCondition("additional_filters", self._prepare_additional_filters)
+
+    def _prepare_additional_filters(self, homes):
+        # Tag-based flags for the whole batch, from one bitmap (tag substrings are checked once per distinct tag)
+        bitmap = self._tag_bitmap(homes)
+        index = self.tag_index
+        pool_tags = index.has_any(bitmap, index.containing('pool', 'spa'))
+        garage_tags = index.has_any(bitmap, index.containing('garage'))
+        water_tags = index.has_any(bitmap, index.containing('waterfront', 'water'))
+        view_tags = index.has_any(bitmap, index.containing('view'))
+
+        def passes(i, home):
             # Extract property data
             if isinstance(home, dict):
                 hoa_fee = home.get('hoa_fee')
                 stories = home.get('stories')
                 garage = home.get('parking_garage')  # Number of garage spaces
-                tags = home.get('tags', []) or []
             else:
                 hoa_fee = getattr(home, 'hoa_fee', None)
                 stories = getattr(home, 'stories', None)
                 garage = getattr(home, 'parking_garage', None)
-                tags = getattr(home, 'tags', []) or []
-
-            # Convert tags to lowercase for matching
-            tags_lower = [tag.lower() for tag in tags] if tags else []
 
             # HOA fee filters
             if self.hoa_fee_min is not None and hoa_fee is not None and hoa_fee < self.hoa_fee_min:
-                continue
+                return False
             if self.hoa_fee_max is not None and hoa_fee is not None and hoa_fee > self.hoa_fee_max:
-                continue
+                return False
 
             # Stories filters
             if self.stories_min is not None and stories is not None and stories < self.stories_min:
-                continue
+                return False
             if self.stories_max is not None and stories is not None and stories > self.stories_max:
-                continue
+                return False
 
             # Garage spaces filters
             if self.garage_spaces_min is not None and garage is not None and garage < self.garage_spaces_min:
-                continue
+                return False
             if self.garage_spaces_max is not None and garage is not None and garage > self.garage_spaces_max:
-                continue
+                return False
 
             # Boolean filters using tags
             if self.has_pool is not None:
-                has_pool_tag = any('pool' in tag or 'spa' in tag for tag in tags_lower)
+                has_pool_tag = pool_tags[i]
                 if self.has_pool and not has_pool_tag:
-                    continue
+                    return False
                 if not self.has_pool and has_pool_tag:
-                    continue
+                    return False
 
             if self.has_garage is not None:
-                has_garage_tag = any('garage' in tag for tag in tags_lower) or (garage is not None and garage > 0)
+                has_garage_tag = garage_tags[i] or (garage is not None and garage > 0)
                 if self.has_garage and not has_garage_tag:
-                    continue
+                    return False
                 if not self.has_garage and has_garage_tag:
-                    continue
+                    return False
 
             if self.waterfront is not None:
-                is_waterfront = any('waterfront' in tag or 'water' in tag for tag in tags_lower)
+                is_waterfront = water_tags[i]
                 if self.waterfront and not is_waterfront:
-                    continue
+                    return False
                 if not self.waterfront and is_waterfront:
-                    continue
+                    return False
 
             if self.has_view is not None:
-                has_view_tag = any('view' in tag for tag in tags_lower)
+                has_view_tag = view_tags[i]
                 if self.has_view and not has_view_tag:
-                    continue
+                    return False
                 if not self.has_view and has_view_tag:
-                    continue
+                    return False
 
-            # If all filters pass, include the home
-            filtered_homes.append(home)
+            return True
 
-        return filtered_homes
+        return passes
 
     def _get_date_range(self):
         """Get the date range for filtering based on instance parameters."""
@@ -1102,6 +1330,9 @@ class RealtorScraper(Scraper):
         1. Multi-page results need to be re-sorted after concatenation
         2. Filtering operations may disrupt the original sort order
 
+        Sort keys are computed once per home, and homes without a value sort last in either direction. With top_k,
+        only the best top_k homes are selected (heap selection instead of a full sort).
+
         Args:
             homes: List of properties (either dicts or Property objects)
 
@@ -1111,96 +1342,103 @@ class RealtorScraper(Scraper):
         if not homes or not self.sort_by:
             return homes
 
-        def get_sort_key(home):
-            """Extract the sort field value from a home (handles both dict and Property object)."""
-            from datetime import datetime
-
-            if isinstance(home, dict):
-                value = home.get(self.sort_by)
-            else:
-                # Property object
-                value = getattr(home, self.sort_by, None)
-
-            # Handle None values - push them to the end
-            if value is None:
-                # Use a sentinel value that sorts to the end
-                return (1, 0) if self.sort_direction == "desc" else (1, float('inf'))
+        keys = [self._sort_key(home) for home in homes]
+        present = [i for i, key in enumerate(keys) if key is not None]
+        missing = [i for i, key in enumerate(keys) if key is None]
 
-            # For datetime fields, convert string to datetime for proper sorting
-            if self.sort_by in ['list_date', 'sold_date', 'pending_date', 'last_update_date']:
-                if isinstance(value, str):
-                    try:
-                        # Handle timezone indicators
-                        date_value = value
-                        if date_value.endswith('Z'):
-                            date_value = date_value[:-1] + '+00:00'
-                        parsed_date = datetime.fromisoformat(date_value)
-                        # Normalize to timezone-naive for consistent comparison
-                        return 0, parsed_date.replace(tzinfo=None)
-                    except (ValueError, AttributeError):
-                        # If parsing fails, treat as None
-                        return (1, 0) if self.sort_direction == "desc" else (1, float('inf'))
-                # Handle datetime objects directly (normalize timezone)
-                if isinstance(value, datetime):
-                    return 0, value.replace(tzinfo=None)
-                return 0, value
+        reverse = (self.sort_direction == "desc")
+        if self.top_k is not None and self.top_k < len(present):
+            select = heapq.nlargest if reverse else heapq.nsmallest  #: same order as sorted(...)[:top_k]
+            order = select(self.top_k, present, key=keys.__getitem__)
+        else:
+            order = sorted(present, key=keys.__getitem__, reverse=reverse) + missing
 
-            # For numeric fields, ensure we can compare
-            return 0, value
+        if self.top_k is not None:
+            order = order[:self.top_k]
+        return [homes[i] for i in order]
 
-        # Sort the homes
-        reverse = (self.sort_direction == "desc")
-        sorted_homes = sorted(homes, key=get_sort_key, reverse=reverse)
+    def _sort_key(self, home):
+        """The sort field value of a home (dates parsed, timezone-naive), or None when it has none."""
+        if isinstance(home, dict):
+            value = home.get(self.sort_by)
+        else:
+            # Property object
+            value = getattr(home, self.sort_by, None)
 
-        return sorted_homes
+        if value is None:
+            return None
 
-    def _apply_raw_data_filters(self, homes):
-        """Apply exclude_pending and mls_only filters for raw data returns.
+        # For datetime fields, convert string to datetime for proper sorting
+        if self.sort_by in ['list_date', 'sold_date', 'pending_date', 'last_update_date']:
+            if isinstance(value, str):
+                try:
+                    # Handle timezone indicators
+                    date_value = value
+                    if date_value.endswith('Z'):
+                        date_value = date_value[:-1] + '+00:00'
+                    # Normalize to timezone-naive for consistent comparison
+                    return datetime.fromisoformat(date_value).replace(tzinfo=None)
+                except (ValueError, AttributeError):
+                    # If parsing fails, treat as None
+                    return None
+            # Handle datetime objects directly (normalize timezone)
+            if isinstance(value, datetime):
+                return value.replace(tzinfo=None)
+
+        return value
+
+    def _raw_data_condition(self):
+        """exclude_pending and mls_only filters for raw data returns.
 
         These filters are normally applied in process_property(), but that function
         is bypassed when return_type="raw", so we need to apply them here instead.
 
-        Args:
-            homes: List of properties (either dicts or Property objects)
-
         Returns:
-            Filtered list of properties
+            Condition over raw dicts or Property objects, or None when neither filter is set
         """
-        if not homes:
-            return homes
-
-        # Only filter raw data (dict objects)
-        # Property objects have already been filtered in process_property()
-        if homes and not isinstance(homes[0], dict):
-            return homes
+        exclude_pending = self.exclude_pending and self.listing_type != ListingType.PENDING
+        if not exclude_pending and not self.mls_only:
+            return None
 
-        filtered_homes = []
+        def prepare(homes):
+            # Only filter raw data (dict objects)
+            # Property objects have already been filtered in process_property()
+            if not isinstance(homes[0], dict):
+                return lambda i, home: True
+            return lambda i, home: passes(home)
 
-        for home in homes:
+        def passes(home):
             # Apply exclude_pending filter
-            if self.exclude_pending and self.listing_type != ListingType.PENDING:
+            if exclude_pending:
                 flags = home.get('flags', {})
-                is_pending = flags.get('is_pending', False)
-                is_contingent = flags.get('is_contingent', False)
-
-                if is_pending or is_contingent:
-                    continue  # Skip this property
+                if flags.get('is_pending', False) or flags.get('is_contingent', False):
+                    return False
 
             # Apply mls_only filter
             if self.mls_only:
                 source = home.get('source', {})
                 if not source or not source.get('id'):
-                    continue  # Skip this property
+                    return False
+
+            return True
 
-            filtered_homes.append(home)
+        return FilterCondition("raw_data_filters", prepare)
 
-        return filtered_homes
 
+    def _on_bulk_retry(self, retry_state):
+        """tenacity before_sleep: a bulk detail response was not valid JSON and is about to be re-requested."""
+        self.stats.count("retries")
+        if self.hooks:
+            self._notify("on_retry", RetryEvent(
+                endpoint="bulk_details", method="POST", url=self.SEARCH_GQL_URL, attempt=retry_state.attempt_number,
+                reason=type(retry_state.outcome.exception()).__name__,
+            ))
 
     @retry(
         retry=retry_if_exception_type(JSONDecodeError),
         wait=wait_exponential(min=4, max=10),
         stop=stop_after_attempt(3),
+        before_sleep=lambda retry_state: retry_state.args[0]._on_bulk_retry(retry_state),
     )
     def get_bulk_prop_details(self, property_ids: list[str]) -> dict:
         """
@@ -1210,7 +1448,8 @@ class RealtorScraper(Scraper):
         if not self.extra_property_data or not property_ids:
             return {}
 
-        property_ids = list(set(property_ids))
+        #: dedupe while keeping order, so identical searches send byte-identical queries (record/replay relies on it)
+        property_ids = list(dict.fromkeys(property_ids))
 
         # Construct the bulk query
         fragments = "\n".join(
@@ -1223,8 +1462,9 @@ class RealtorScraper(Scraper):
             {fragments}
         }}"""
 
-        response = self.session.post(self.SEARCH_GQL_URL, json={"query": query})
-        data = response.json()
+        response = self._post(self.SEARCH_GQL_URL, endpoint="bulk_details", json={"query": query})
+        self.stats.count("detail_chunks")
+        data = json_backend.decode_response(response)
 
         if "data" not in data:
             return {}
@@ -0,0 +1,74 @@
+"""
+homeharvest.realtor.filters
+~~~~~~~~~~~~
+
+Single-pass client-side filter pipeline.
+
+RealtorScraper compiles the active client-side conditions of a search (date windows, tags, additional property
+filters, raw-data filters) into a FilterPipeline once, with every cutoff already parsed. The pipeline then walks the
+fetched homes a single time and evaluates the conditions in order for each home, stopping at the first one that
+rejects it and counting rejections per condition (the rows_dropped entries of ScrapeStats).
+
+A condition is prepared against the whole batch before the walk, which is where batch-wide work happens (e.g. the tag
+bitmap of tag_index.TagIndex); the prepared test is then called as test(i, home) for the i-th home.
+"""
+from __future__ import annotations
+
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+
+class FilterCondition(NamedTuple):
+    name: str  #: rows_dropped key
+    prepare: Callable[[list], Callable[[int, object], bool]]  #: homes -> test(i, home)
+
+
+def row_condition(name: str, predicate: Callable[[object], bool]) -> FilterCondition:
+    """A condition that looks at one home at a time."""
+    return FilterCondition(name, lambda homes: lambda i, home: predicate(home))
+
+
+def mask_condition(name: str, build_mask: Callable[[list], np.ndarray]) -> FilterCondition:
+    """A condition evaluated over the whole batch at once, as a boolean mask with one entry per home."""
+    def prepare(homes):
+        mask = build_mask(homes)
+        return lambda i, home: mask[i]
+
+    return FilterCondition(name, prepare)
+
+
+class FilterPipeline:
+    """The compiled client-side filters of one search."""
+
+    def __init__(self, conditions: list[FilterCondition]):
+        self.conditions = conditions
+
+    def __bool__(self) -> bool:
+        return bool(self.conditions)
+
+    @property
+    def names(self) -> list[str]:
+        return [condition.name for condition in self.conditions]
+
+    def apply(self, homes: list) -> tuple[list, dict[str, int]]:
+        """
+        Filter homes in one pass.
+
+        Returns:
+            (kept homes in their original order, {condition name: homes it rejected})
+        """
+        rejected = dict.fromkeys(self.names, 0)
+        if not homes or not self.conditions:
+            return homes, rejected
+
+        tests = [(condition.name, condition.prepare(homes)) for condition in self.conditions]
+        kept = []
+        for i, home in enumerate(homes):
+            for name, test in tests:
+                if not test(i, home):
+                    rejected[name] += 1
+                    break
+            else:
+                kept.append(home)
+        return kept, rejected
@@ -43,8 +43,9 @@ def parse_units(units_data: list[dict] | None) -> list[dict] | None:
     for unit in units_data:
         parsed_unit = unit.copy()
         
-        # Parse availability date
+        # Parse availability date (copy the nested dict so the raw result is left untouched)
         if parsed_unit.get("availability") and parsed_unit["availability"].get("date"):
+            parsed_unit["availability"] = parsed_unit["availability"].copy()
             try:
                 parsed_unit["availability"]["date"] = datetime.fromisoformat(parsed_unit["availability"]["date"].replace("Z", "+00:00"))
             except (ValueError, AttributeError):
@@ -3,9 +3,11 @@ Data validation and cleaning utilities for property data.
 
 Provides functions to validate, clean, and standardize property data.
 """
+import datetime
+import numpy as np
 import pandas as pd
 import re
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 
 def clean_price(price: Any) -> Optional[float]:
@@ -108,7 +110,6 @@ def clean_year(year: Any) -> Optional[int]:
     if isinstance(year, (int, float)):
         year_int = int(year)
         # Validate reasonable year range (1800 to current year + 2)
-        import datetime
         current_year = datetime.datetime.now().year
         if 1800 <= year_int <= current_year + 2:
             return year_int
@@ -117,7 +118,6 @@ def clean_year(year: Any) -> Optional[int]:
     if isinstance(year, str):
         try:
             year_int = int(year.strip())
-            import datetime
             current_year = datetime.datetime.now().year
             if 1800 <= year_int <= current_year + 2:
                 return year_int
@@ -289,79 +289,204 @@ def validate_property_data(property_dict: dict) -> dict:
     return cleaned
 
 
-def clean_dataframe(df: pd.DataFrame, add_derived_fields: bool = True) -> pd.DataFrame:
-    """
-    Clean and validate an entire DataFrame of properties.
-
-    Args:
-        df: DataFrame with property data
-        add_derived_fields: Whether to add derived fields like price_per_sqft
+#: column -> (scalar cleaner, vectorized kind); clean_dataframe applies these in order
+COLUMN_CLEANERS = {
+    'list_price': (clean_price, 'price'),
+    'sold_price': (clean_price, 'price'),
+    'sqft': (clean_sqft, 'sqft'),
+    'lot_sqft': (clean_sqft, 'sqft'),
+    'beds': (clean_beds_baths, 'count'),
+    'baths': (clean_beds_baths, 'count'),
+    'full_baths': (clean_beds_baths, 'count'),
+    'half_baths': (clean_beds_baths, 'count'),
+    'stories': (clean_beds_baths, 'count'),
+    'parking_garage': (clean_beds_baths, 'count'),
+    'year_built': (clean_year, 'year'),
+    'hoa_fee': (clean_hoa_fee, 'price'),
+}
 
-    Returns:
-        Cleaned DataFrame
-    """
-    if df.empty:
-        return df
+_NUMERIC_INFERRED = {'integer', 'floating', 'mixed-integer-float', 'empty'}
+_EXACT_FLOAT_LIMIT = 2 ** 53
 
-    cleaned_df = df.copy()
 
-    # Clean numeric fields
-    if 'list_price' in cleaned_df.columns:
-        cleaned_df['list_price'] = cleaned_df['list_price'].apply(clean_price)
+def _as_float_array(series: pd.Series) -> Optional[tuple[np.ndarray, bool]]:
+    """
+    Return (float64 values with NaN for missing, all-values-are-integers) when every non-missing value is a plain
+    int or float, else None so the caller falls back to the scalar cleaner.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        values = series.to_numpy(dtype=np.float64)
+        is_int = True
+    elif isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        values = series.to_numpy()
+        is_int = False
+    else:
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred not in _NUMERIC_INFERRED:
+            return None
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        is_int = inferred == 'integer'
 
-    if 'sold_price' in cleaned_df.columns:
-        cleaned_df['sold_price'] = cleaned_df['sold_price'].apply(clean_price)
+    finite = values[np.isfinite(values)]
+    if finite.size and np.abs(finite).max() >= _EXACT_FLOAT_LIMIT:
+        return None  #: float64 would not hold these ints exactly
+    return values, is_int
 
-    if 'sqft' in cleaned_df.columns:
-        cleaned_df['sqft'] = cleaned_df['sqft'].apply(clean_sqft)
 
-    if 'lot_sqft' in cleaned_df.columns:
-        cleaned_df['lot_sqft'] = cleaned_df['lot_sqft'].apply(clean_sqft)
+def _cleaned_series(series: pd.Series, values: np.ndarray, valid: np.ndarray, as_int: bool) -> pd.Series:
+    """Build the column Series.apply would: int64 if every row is a kept int, float64 with NaN for dropped rows,
+    object of None if nothing was kept."""
+    if not valid.any():
+        return pd.Series([None] * len(series), index=series.index, name=series.name, dtype=object)
+    if as_int and valid.all():
+        return pd.Series(values.astype(np.int64), index=series.index, name=series.name)
+    return pd.Series(np.where(valid, values, np.nan), index=series.index, name=series.name)
 
-    if 'beds' in cleaned_df.columns:
-        cleaned_df['beds'] = cleaned_df['beds'].apply(clean_beds_baths)
 
-    if 'baths' in cleaned_df.columns:
-        cleaned_df['baths'] = cleaned_df['baths'].apply(clean_beds_baths)
+def _clean_numeric_column(series: pd.Series, cleaner: Callable, kind: str) -> pd.Series:
+    """Vectorized equivalent of series.apply(cleaner) for numeric columns; other columns use the scalar cleaner."""
+    converted = _as_float_array(series)
+    if converted is None:
+        return series.apply(cleaner)
+    values, is_int = converted
 
-    if 'full_baths' in cleaned_df.columns:
-        cleaned_df['full_baths'] = cleaned_df['full_baths'].apply(clean_beds_baths)
+    with np.errstate(invalid='ignore'):
+        if kind == 'price':
+            return _cleaned_series(series, values, values > 0, as_int=False)
 
-    if 'half_baths' in cleaned_df.columns:
-        cleaned_df['half_baths'] = cleaned_df['half_baths'].apply(clean_beds_baths)
+        if kind == 'count':
+            return _cleaned_series(series, values, values > 0, as_int=is_int)
 
-    if 'stories' in cleaned_df.columns:
-        cleaned_df['stories'] = cleaned_df['stories'].apply(clean_beds_baths)
+        if np.isinf(values).any():
+            return series.apply(cleaner)  #: int() of inf raises; keep the scalar behaviour
+        truncated = np.trunc(values)
 
-    if 'parking_garage' in cleaned_df.columns:
-        cleaned_df['parking_garage'] = cleaned_df['parking_garage'].apply(clean_beds_baths)
+        if kind == 'sqft':
+            return _cleaned_series(series, truncated, values > 0, as_int=True)
 
-    if 'year_built' in cleaned_df.columns:
-        cleaned_df['year_built'] = cleaned_df['year_built'].apply(clean_year)
+        current_year = datetime.datetime.now().year
+        valid = (truncated >= 1800) & (truncated <= current_year + 2)
+        return _cleaned_series(series, truncated, valid, as_int=True)
+
+
+def _clean_tags_column(series: pd.Series) -> pd.Series:
+    """clean_tags over a column. Tag vocabularies are small, so each distinct tag is normalized once."""
+    normalized = {}  #: raw tag -> stripped, lowercased tag (only tags clean_tags keeps)
+    cleaned = []
+    for tags in series.tolist():
+        if type(tags) is not list:
+            cleaned.append(clean_tags(tags))
+            continue
+        try:
+            cleaned.append([normalized[tag] for tag in tags])
+        except (KeyError, TypeError):
+            kept = []
+            for tag in tags:
+                if tag and isinstance(tag, str):
+                    kept.append(normalized.setdefault(tag, tag.strip().lower()))
+            cleaned.append(kept)
+    return pd.Series(cleaned, index=series.index, name=series.name, dtype=object)
+
+
+def _clean_coordinates(columns) -> tuple[pd.Series, pd.Series]:
+    """Vectorized validate_coordinates over the latitude/longitude columns."""
+    lat, lon = _as_float_array(columns['latitude']), _as_float_array(columns['longitude'])
+    if lat is None or lon is None:
+        coords = pd.DataFrame({'latitude': columns['latitude'], 'longitude': columns['longitude']}).apply(
+            lambda row: validate_coordinates(row.get('latitude'), row.get('longitude')),
+            axis=1
+        )
+        return coords.apply(lambda x: x[0]), coords.apply(lambda x: x[1])
+
+    lat_values, lon_values = lat[0], lon[0]
+    with np.errstate(invalid='ignore'):
+        valid = (lat_values >= -90) & (lat_values <= 90) & (lon_values >= -180) & (lon_values <= 180)
+    return (
+        _cleaned_series(columns['latitude'], lat_values, valid, as_int=False),
+        _cleaned_series(columns['longitude'], lon_values, valid, as_int=False),
+    )
+
+
+def _round_half_cases(ratios: np.ndarray, rounded: np.ndarray) -> np.ndarray:
+    """np.round can differ from Python's round() when ratio * 100 sits next to .5; redo those with round()."""
+    scaled = ratios * 100
+    with np.errstate(invalid='ignore'):
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_half):
+        rounded[i] = round(float(ratios[i]), 2)
+    return rounded
+
+
+def _price_per_sqft_column(columns) -> pd.Series:
+    """Vectorized calculate_price_per_sqft over cleaned list_price and sqft columns."""
+    price, sqft = columns['list_price'], columns['sqft']
+    price_values = price.to_numpy(dtype=np.float64, na_value=np.nan) if price.dtype != object else None
+    sqft_values = sqft.to_numpy(dtype=np.float64, na_value=np.nan) if sqft.dtype != object else None
+    if price_values is None or sqft_values is None:
+        #: a cleaned column is object dtype only when every value is None, so no row has a price per sqft
+        return pd.Series([None] * len(price), index=price.index, dtype=object)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        #: NaN prices are truthy in calculate_price_per_sqft and yield NaN, which the float column stores as missing
+        produced = (price_values != 0) & (sqft_values > 0)
+        ratios = np.where(produced, price_values / np.where(produced, sqft_values, 1), np.nan)
+    rounded = np.round(ratios, 2)
+
+    #: row-wise apply hands rows of mixed-dtype frames over as Python floats (rounded with round()) and rows of
+    #: all-numeric frames as numpy floats (rounded like np.round)
+    dtypes = columns.dtypes if isinstance(columns, pd.DataFrame) else [column.dtype for column in columns.values()]
+    if not all(isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in dtypes):
+        rounded = _round_half_cases(ratios, rounded)
+    return _cleaned_series(price, rounded, produced, as_int=False).rename(None)
+
+
+def clean_columns(columns: Union[pd.DataFrame, dict], add_derived_fields: bool = True) -> None:
+    """
+    Clean property columns in place.
 
-    if 'hoa_fee' in cleaned_df.columns:
-        cleaned_df['hoa_fee'] = cleaned_df['hoa_fee'].apply(clean_hoa_fee)
+    Args:
+        columns: DataFrame, or dict of column name -> Series sharing one index (used while a frame is assembled)
+        add_derived_fields: Whether to add derived fields like price_per_sqft
+    """
+    # Clean numeric fields
+    for column, (cleaner, kind) in COLUMN_CLEANERS.items():
+        if column in columns:
+            columns[column] = _clean_numeric_column(columns[column], cleaner, kind)
 
-    if 'tags' in cleaned_df.columns:
-        cleaned_df['tags'] = cleaned_df['tags'].apply(clean_tags)
+    if 'tags' in columns:
+        columns['tags'] = _clean_tags_column(columns['tags'])
 
     # Validate coordinates
-    if 'latitude' in cleaned_df.columns and 'longitude' in cleaned_df.columns:
-        coords = cleaned_df.apply(
-            lambda row: validate_coordinates(row.get('latitude'), row.get('longitude')),
-            axis=1
-        )
-        cleaned_df['latitude'] = coords.apply(lambda x: x[0])
-        cleaned_df['longitude'] = coords.apply(lambda x: x[1])
+    if 'latitude' in columns and 'longitude' in columns:
+        columns['latitude'], columns['longitude'] = _clean_coordinates(columns)
 
     # Add derived fields
     if add_derived_fields:
-        if 'list_price' in cleaned_df.columns and 'sqft' in cleaned_df.columns:
-            cleaned_df['price_per_sqft'] = cleaned_df.apply(
-                lambda row: calculate_price_per_sqft(row.get('list_price'), row.get('sqft')),
-                axis=1
-            )
+        if 'list_price' in columns and 'sqft' in columns:
+            columns['price_per_sqft'] = _price_per_sqft_column(columns)
+
+
+def clean_dataframe(df: pd.DataFrame, add_derived_fields: bool = True, inplace: bool = False) -> pd.DataFrame:
+    """
+    Clean and validate an entire DataFrame of properties.
+
+    Column-at-a-time equivalent of applying the clean_* functions to every cell: numeric columns are cleaned with
+    array operations, and only columns holding other types (e.g. price strings) go through the scalar cleaners.
+
+    Args:
+        df: DataFrame with property data
+        add_derived_fields: Whether to add derived fields like price_per_sqft
+        inplace: Clean df itself instead of a copy (saves a full-frame copy)
+
+    Returns:
+        Cleaned DataFrame
+    """
+    if df.empty:
+        return df
 
+    cleaned_df = df if inplace else df.copy()
+    clean_columns(cleaned_df, add_derived_fields=add_derived_fields)
     return cleaned_df
 
 
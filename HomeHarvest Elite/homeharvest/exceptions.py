@@ -12,3 +12,11 @@ class AuthenticationError(Exception):
         super().__init__(*args)
 
         self.response = response
+
+
+class ScrapeInterrupted(Exception):
+    """Raised when a resumable scrape fails partway. Carries a resume token for the follow-up call."""
+    def __init__(self, *args, resume_token):
+        super().__init__(*args)
+
+        self.resume_token = resume_token
@@ -0,0 +1,240 @@
+"""
+Request-level observer hooks for the scraper session.
+
+Pass hook objects to scrape_property(hooks=[...]) (or append them to scraper.hooks). A hook implements any of
+on_request, on_response, on_retry and on_page; each receives one event model. Hooks run on the thread that made the
+request, which in parallel mode is a page worker, so they must be thread-safe.
+
+MetricsAggregator is the built-in hook: per-endpoint latency histograms, status counts, 429/403 rates, retry reasons
+and bytes, for sizing proxies and concurrency.
+"""
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+HOOK_EVENTS = ("on_request", "on_response", "on_retry", "on_page")
+
+
+class RequestEvent(BaseModel):
+    endpoint: str
+    method: str
+    url: str
+
+
+class ResponseEvent(BaseModel):
+    """One logical request, after urllib3's Retry layer is done with it.
+
+    latency covers every attempt including retry backoff. status is None when the request raised (error holds the
+    exception), e.g. when retries were exhausted on 429/403.
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    status: int | None = None
+    latency: float
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    retries: int = 0
+    error: str | None = None
+
+
+class RetryEvent(BaseModel):
+    """One failed attempt that was retried. reason is "status 429", "status 403", an exception name, etc."""
+
+    endpoint: str
+    method: str
+    url: str
+    attempt: int
+    status: int | None = None
+    reason: str
+
+
+class PageEvent(BaseModel):
+    search_type: str
+    offset: int
+    rows: int
+    total: int
+    latency: float
+
+
+class ScrapeHooks:
+    """No-op base class; override the events you care about."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    def on_response(self, event: ResponseEvent) -> None:
+        pass
+
+    def on_retry(self, event: RetryEvent) -> None:
+        pass
+
+    def on_page(self, event: PageEvent) -> None:
+        pass
+
+
+def endpoint_name(url: str) -> str:
+    """Default endpoint label: host + path, without the query string."""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def retry_events(endpoint: str, method: str, url: str, response) -> List[RetryEvent]:
+    """Rebuild the retries urllib3 performed for `response` from its Retry history."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    if retries is None or not retries.history:
+        return []
+
+    events = []
+    for attempt, entry in enumerate(retries.history, start=1):
+        if entry.status:
+            reason = f"status {entry.status}"
+        elif entry.error is not None:
+            reason = type(entry.error).__name__
+        else:
+            reason = "redirect"
+        events.append(
+            RetryEvent(endpoint=endpoint, method=method, url=url, attempt=attempt, status=entry.status, reason=reason)
+        )
+    return events
+
+
+class EndpointMetrics:
+    """Counters for one endpoint. Attempts include retried attempts; requests are logical calls.
+
+    Latencies are kept only as bucket counts (plus the maximum), so memory stays constant however many scrapes one
+    aggregator observes; percentiles are interpolated within their bucket.
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.requests = 0
+        self.attempts = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.status_counts: Counter = Counter()
+        self.retry_reasons: Counter = Counter()
+        self.histogram = [0] * (len(buckets) + 1)
+        self.latency_max = 0.0
+
+    def rate(self, status: int) -> float:
+        """Share of attempts answered with `status`."""
+        return self.status_counts[status] / self.attempts if self.attempts else 0.0
+
+    def record_latency(self, latency: float) -> None:
+        self.histogram[bisect_left(self.buckets, latency)] += 1
+        self.latency_max = max(self.latency_max, latency)
+
+    def percentile(self, pct: float) -> float:
+        """Latency below which pct% of requests fell, interpolated linearly inside its histogram bucket."""
+        count = sum(self.histogram)
+        if not count:
+            return 0.0
+        rank = pct / 100 * count
+        seen = 0
+        for i, bucket_count in enumerate(self.histogram):
+            if bucket_count and seen + bucket_count >= rank:
+                low = self.buckets[i - 1] if i else 0.0
+                high = min(self.buckets[i], self.latency_max) if i < len(self.buckets) else self.latency_max
+                return low + (high - low) * max(rank - seen, 0) / bucket_count
+            seen += bucket_count
+        return self.latency_max
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound:g}s" for bound in self.buckets] + [f">{self.buckets[-1]:g}s"]
+        return {
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "errors": self.errors,
+            "status_counts": dict(self.status_counts),
+            "rate_429": self.rate(429),
+            "rate_403": self.rate(403),
+            "retry_reasons": dict(self.retry_reasons),
+            "latency_p50": self.percentile(50),
+            "latency_p95": self.percentile(95),
+            "latency_max": self.latency_max,
+            "latency_histogram": dict(zip(labels, self.histogram)),
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+class MetricsAggregator(ScrapeHooks):
+    """Aggregates hook events per endpoint. One instance can observe many scrapes.
+
+    >>> metrics = MetricsAggregator()
+    >>> scrape_property(location="Phoenix, AZ", hooks=[metrics])
+    >>> metrics.report()["search"]["rate_429"]
+    """
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.pages = 0
+        self.page_rows = 0
+        self.page_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics(self.buckets)
+        return metrics
+
+    def on_response(self, event: ResponseEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.requests += 1
+            metrics.bytes_received += event.bytes_received
+            metrics.bytes_sent += event.bytes_sent
+            metrics.record_latency(event.latency)
+            if event.status is None:
+                metrics.errors += 1
+            else:
+                metrics.attempts += 1
+                metrics.status_counts[event.status] += 1
+
+    def on_retry(self, event: RetryEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.attempts += 1
+            metrics.retry_reasons[event.reason] += 1
+            if event.status is not None:
+                metrics.status_counts[event.status] += 1
+
+    def on_page(self, event: PageEvent) -> None:
+        with self._lock:
+            self.pages += 1
+            self.page_rows += event.rows
+            self.page_seconds += event.latency
+
+    def report(self) -> Dict[str, dict]:
+        """{endpoint: counters, 429/403 rates, latency percentiles and histogram}."""
+        with self._lock:
+            return {endpoint: metrics.to_dict() for endpoint, metrics in self.endpoints.items()}
+
+    def summary(self) -> str:
+        lines = []
+        for endpoint, report in self.report().items():
+            lines.append(
+                f"{endpoint}: {report['requests']} request(s), {report['attempts']} attempt(s), "
+                f"p50 {report['latency_p50'] * 1000:.0f} ms, p95 {report['latency_p95'] * 1000:.0f} ms, "
+                f"429 {report['rate_429']:.1%}, 403 {report['rate_403']:.1%}, errors {report['errors']}"
+            )
+        if self.pages:
+            lines.append(f"pages: {self.pages} ({self.page_rows} rows, {self.page_seconds / self.pages * 1000:.0f} ms avg)")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.pages = self.page_rows = 0
+            self.page_seconds = 0.0
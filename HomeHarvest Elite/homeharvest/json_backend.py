@@ -0,0 +1,161 @@
+"""
+Pluggable JSON decoding for API responses.
+
+The fastest installed backend is used: orjson, then ujson, then the stdlib json module. Override it with
+set_backend("json") or the HOMEHARVEST_JSON_BACKEND environment variable. Whichever backend runs, decode errors are
+raised as json.JSONDecodeError so retry logic keyed on it keeps working.
+
+ResultStream walks one array (e.g. data.home_search.results) of a response body item by item instead of building the
+whole document, so a caller can process and drop each result before decoding the next.
+"""
+import json
+import os
+import re
+from json import JSONDecodeError
+from typing import Callable, Dict, Iterator, Sequence
+
+BACKEND_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def _load_backends() -> Dict[str, Callable]:
+    backends = {}
+    try:
+        import orjson
+        backends["orjson"] = orjson.loads  #: orjson.JSONDecodeError already subclasses json.JSONDecodeError
+    except ImportError:
+        pass
+
+    try:
+        import ujson
+
+        def ujson_loads(data):
+            try:
+                return ujson.loads(data)
+            except ValueError as e:
+                text = data.decode("utf-8", "replace") if isinstance(data, (bytes, bytearray)) else data
+                raise JSONDecodeError(str(e), text, 0) from e
+
+        backends["ujson"] = ujson_loads
+    except ImportError:
+        pass
+
+    backends["json"] = json.loads
+    return backends
+
+
+_backends = _load_backends()
+_backend_name = None
+_loads = None
+
+
+def available_backends() -> list[str]:
+    return [name for name in BACKEND_PREFERENCE if name in _backends]
+
+
+def set_backend(name: str | None = None) -> str:
+    """Select a backend by name, or the fastest installed one when name is None. Returns the backend in use."""
+    global _backend_name, _loads
+    if name is None:
+        name = available_backends()[0]
+    if name not in _backends:
+        raise ValueError(
+            f"JSON backend '{name}' is not available. Installed backends: {', '.join(available_backends())}"
+        )
+    _backend_name, _loads = name, _backends[name]
+    return name
+
+
+def get_backend() -> str:
+    return _backend_name
+
+
+def loads(data: bytes | str):
+    return _loads(data)
+
+
+def decode_response(response):
+    """Decode a response body with the active backend (the drop-in for response.json())."""
+    return _loads(response.content)
+
+
+set_backend(os.environ.get("HOMEHARVEST_JSON_BACKEND") or None)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class ResultStream:
+    """Lazily decode the array at `path` of a JSON document, one element per iteration.
+
+    Scalar members of the array's parent object (e.g. total, count) are collected into `fields` as the walk passes
+    them. `found` is False when the path is missing or null, in which case iteration yields nothing. Values off the
+    path are decoded and discarded, so only the array's elements are ever built.
+    """
+
+    def __init__(self, data: bytes | str, path: Sequence[str]):
+        self.text = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+        self.path = tuple(path)
+        self.fields: dict = {}
+        self.found = False
+
+    def _skip(self, pos: int) -> int:
+        return _WHITESPACE.match(self.text, pos).end()
+
+    def _expect(self, pos: int, chars: str) -> str:
+        if pos >= len(self.text) or self.text[pos] not in chars:
+            raise JSONDecodeError(f"Expecting one of {chars!r}", self.text, pos)
+        return self.text[pos]
+
+    def _members(self, pos: int, target: str | None, collect: bool):
+        """Walk object members from just inside '{'. Returns the value position of `target`, or None at '}'."""
+        pos = self._skip(pos)
+        if self.text.startswith("}", pos):
+            return None, pos + 1
+        while True:
+            self._expect(pos, '"')
+            key, pos = _decoder.raw_decode(self.text, pos)
+            pos = self._skip(pos)
+            self._expect(pos, ":")
+            pos = self._skip(pos + 1)
+            if key == target:
+                return pos, pos
+
+            value, pos = _decoder.raw_decode(self.text, pos)
+            if collect:
+                self.fields[key] = value
+            pos = self._skip(pos)
+            if self._expect(pos, ",}") == "}":
+                return None, pos + 1
+            pos = self._skip(pos + 1)
+
+    def __iter__(self) -> Iterator:
+        text = self.text
+        pos = self._skip(0)
+        for depth, key in enumerate(self.path):
+            if not text.startswith("{", pos):
+                return
+            value_pos, pos = self._members(pos + 1, key, collect=depth == len(self.path) - 1)
+            if value_pos is None:
+                return
+
+        if not text.startswith("[", pos):
+            return
+        self.found = True
+        pos = self._skip(pos + 1)
+        if text.startswith("]", pos):
+            pos += 1
+        else:
+            while True:
+                item, pos = _decoder.raw_decode(text, pos)
+                yield item
+                pos = self._skip(pos)
+                if self._expect(pos, ",]") == "]":
+                    pos += 1
+                    break
+                pos = self._skip(pos + 1)
+
+        #: pick up parent fields that come after the array
+        pos = self._skip(pos)
+        if text.startswith(",", pos):
+            self._members(pos + 1, None, collect=True)
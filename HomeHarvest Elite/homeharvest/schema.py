@@ -0,0 +1,112 @@
+"""
+Opt-in compact dtype schema for scrape results.
+
+scrape_property(compact_dtypes=True) (or compact_dataframe(df)) converts the result columns to:
+
+- ``category`` for repeated strings (statuses, places, agent/broker/office identities)
+- nullable ``Int32`` for counts, sizes, years and prices (widened to ``Int64``, or ``Float64`` for fractional values,
+  when the data does not fit, so no value is ever changed)
+- ``Float32`` for price_per_sqft and hoa_fee (latitude/longitude stay float64: Float32 would move points by metres)
+- ``datetime64[ns]`` for the date columns that are otherwise formatted strings
+- nullable ``boolean`` for flags
+
+Columns missing from the frame are skipped, and a column whose values do not convert cleanly is left as it is.
+
+With return_type="arrow"/"polars", the same conversions give dictionary, int32/int64, float32, timestamp and bool
+columns (see columnar.to_arrow_table).
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = [
+    "mls", "status", "mls_status", "style", "city", "state", "zip_code", "county", "fips_code", "neighborhoods",
+    "agent_id", "agent_name", "agent_email", "agent_mls_set", "agent_nrds_id",
+    "broker_id", "broker_name", "builder_id", "builder_name",
+    "office_id", "office_name", "office_email", "office_mls_set",
+]
+
+INT_COLUMNS = [
+    "beds", "full_baths", "half_baths", "sqft", "lot_sqft", "year_built", "days_on_mls", "stories", "parking_garage",
+    "list_price", "list_price_min", "list_price_max", "sold_price", "last_sold_price",
+    "assessed_value", "estimated_value", "tax",
+]
+
+FLOAT32_COLUMNS = ["price_per_sqft", "hoa_fee"]
+
+DATETIME_COLUMNS = ["list_date", "pending_date", "last_sold_date", "last_status_change_date"]
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"  #: how utils.property_row formats these dates
+
+BOOLEAN_COLUMNS = ["new_construction"]
+
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _compact_int(column: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(column)
+    values = numeric.dropna()
+    if not np.array_equal(values, np.trunc(values)):
+        return numeric.astype("Float64")
+    if len(values) and (values.min() < _INT32_MIN or values.max() > _INT32_MAX):
+        return numeric.astype("Int64")
+    return numeric.astype("Int32")
+
+
+def _compact_float32(column: pd.Series) -> pd.Series:
+    return pd.to_numeric(column).astype("Float32")
+
+
+def _compact_datetime(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    return pd.to_datetime(column, format=DATETIME_FORMAT)
+
+
+def _compact_category(column: pd.Series) -> pd.Series:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column
+    return column.astype("category")
+
+
+def _compact_boolean(column: pd.Series) -> pd.Series:
+    return column.astype("boolean")
+
+
+COMPACT_SCHEMA = {
+    **{column: _compact_category for column in CATEGORY_COLUMNS},
+    **{column: _compact_int for column in INT_COLUMNS},
+    **{column: _compact_float32 for column in FLOAT32_COLUMNS},
+    **{column: _compact_datetime for column in DATETIME_COLUMNS},
+    **{column: _compact_boolean for column in BOOLEAN_COLUMNS},
+}
+
+
+def compact_column(name: str, column: pd.Series) -> pd.Series:
+    """One result column in the compact schema (unchanged when it has no compact dtype or does not convert)."""
+    convert = COMPACT_SCHEMA.get(name)
+    if convert is None:
+        return column
+    try:
+        return convert(column)
+    except (ValueError, TypeError, OverflowError):
+        return column  #: e.g. uncleaned strings; keep the column as scraped
+
+
+def compact_dataframe(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """
+    Convert a scrape result DataFrame to the compact dtype schema.
+
+    Args:
+        df: DataFrame returned by scrape_property
+        inplace: Convert df itself instead of a copy
+
+    Returns:
+        DataFrame with compact dtypes
+    """
+    if df.empty:
+        return df
+
+    compacted = df if inplace else df.copy()
+    for column in COMPACT_SCHEMA:
+        if column in compacted.columns:
+            compacted[column] = compact_column(column, compacted[column])
+    return compacted
@@ -0,0 +1,73 @@
+"""
+Request coalescing (single-flight) for identical in-flight searches.
+
+When several threads ask for the same search at the same time, only the first one runs it; the others wait for
+that result instead of starting their own scrape.
+"""
+import copy
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.dups = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key.
+
+    Results are shared, so callers that may mutate them should use do_view(), which hands every caller of a
+    shared flight its own deep copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once per key among concurrent callers. Returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.dups += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.dups > 0
+            call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, shared
+
+    def do_view(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Like do(), but each caller of a shared flight gets an independent copy of the result."""
+        result, shared = self.do(key, fn)
+        return copy.deepcopy(result) if shared else result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+#: process-wide group used by scrape_property
+search_flights = SingleFlight()
@@ -3,8 +3,10 @@ Advanced sorting utilities for property data.
 
 Provides multi-field sorting, calculated field sorting, and custom sort functions.
 """
+import numpy as np
 import pandas as pd
-from typing import List, Union, Callable, Optional
+from pydantic import BaseModel
+from typing import List, Literal, Tuple, Union, Callable, Optional
 
 
 # Available sort fields and their descriptions
@@ -106,6 +108,14 @@ CALCULATED_FIELDS = {
     "lot_ratio": calculate_lot_ratio,
 }
 
+#: The columns each calculated field is computed from
+CALCULATED_FIELD_COLUMNS = {
+    "property_age": ("year_built",),
+    "value_per_sqft": ("estimated_value", "sqft"),
+    "price_discount": ("list_price", "estimated_value"),
+    "lot_ratio": ("sqft", "lot_sqft"),
+}
+
 
 def add_calculated_sort_fields(df: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
     """
@@ -127,11 +137,39 @@ def add_calculated_sort_fields(df: pd.DataFrame, fields: List[str]) -> pd.DataFr
     return df_copy
 
 
+def _top_k_candidates(column: pd.Series, k: int, ascending: bool, na_position: str) -> Optional[np.ndarray]:
+    """
+    Rows that can reach the first k places of a sort led by `column`: the k best values (with all their ties) by
+    np.partition, plus missing values when they sort first. None when the column cannot be partitioned.
+    """
+    if not (pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_any_dtype(column)) \
+            or pd.api.types.is_bool_dtype(column):
+        return None
+
+    missing = column.isna().to_numpy()
+    values = column.to_numpy(dtype="float64", na_value=np.nan) if pd.api.types.is_numeric_dtype(column) \
+        else column.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+    present = values[~missing]
+    slots = k - int(missing.sum()) if na_position == "first" else k
+
+    candidates = missing.copy() if na_position == "first" else np.zeros(len(values), dtype=bool)
+    if slots <= 0:
+        return candidates
+    if slots >= len(present):
+        return np.ones(len(values), dtype=bool)  #: every present value makes the cut (and missing ones may follow)
+    if ascending:
+        threshold = np.partition(present, slots - 1)[slots - 1]
+        return candidates | (~missing & (values <= threshold))
+    threshold = np.partition(present, len(present) - slots)[len(present) - slots]
+    return candidates | (~missing & (values >= threshold))
+
+
 def sort_properties(
     df: pd.DataFrame,
     sort_by: Union[str, List[str]],
     sort_direction: Union[str, List[str]] = "desc",
-    na_position: str = "last"
+    na_position: str = "last",
+    top_k: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Sort properties by one or more fields with advanced options.
@@ -141,6 +179,8 @@ def sort_properties(
         sort_by: Field name or list of field names to sort by
         sort_direction: "asc" or "desc", or list matching sort_by length
         na_position: Where to place NaN values ("first" or "last")
+        top_k: Only return the first top_k rows. Rows that cannot make the cut on the first sort field are dropped
+            by partial selection before sorting, and ties keep their original order (a stable sort).
 
     Returns:
         Sorted DataFrame
@@ -173,14 +213,23 @@ def sort_properties(
             valid_ascending.append(asc)
 
     if not valid_fields:
-        return df
+        return df if top_k is None else df.head(top_k)
+
+    # Partial selection: only rows that can reach the first top_k places need sorting
+    if top_k is not None and top_k < len(df_with_calc):
+        candidates = _top_k_candidates(df_with_calc[valid_fields[0]], top_k, valid_ascending[0], na_position)
+        if candidates is not None:
+            df_with_calc = df_with_calc[candidates]
 
     # Perform sort
     sorted_df = df_with_calc.sort_values(
         by=valid_fields,
         ascending=valid_ascending,
-        na_position=na_position
+        na_position=na_position,
+        **({"kind": "stable"} if top_k is not None else {})
     )
+    if top_k is not None:
+        sorted_df = sorted_df.head(top_k)
 
     # Remove calculated fields that weren't in original
     for field in CALCULATED_FIELDS.keys():
@@ -272,9 +321,135 @@ def get_price_drops(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
     return get_recently_updated(df, limit)
 
 
+class ScoreTerm(BaseModel):
+    """
+    One weighted component of a vectorized score (see compute_score).
+
+    The column's values are filled, normalized to a 0-100 scale, inverted when lower is better, clipped and weighted:
+
+    - normalize="minmax": (x - min) / (max - min) * 100 (50 when every value is the same)
+    - normalize="max": x / max * 100 (50 when max <= 0)
+    - normalize="percentile": rank-based, 0 for the lowest value and 100 for the highest, ties averaged, so a
+      few outliers do not squash everything else into one end of the scale
+    - normalize=None: the raw values
+    """
+
+    column: str  #: column name, calculated field (CALCULATED_FIELDS) or a DataFrame.eval expression
+    weight: float = 1.0
+    normalize: Optional[Literal["minmax", "max", "percentile"]] = "minmax"
+    invert: bool = False  #: lower is better: 100 - score when normalized, -x when raw
+    fill: Union[float, Literal["median"], None] = None  #: value (or the column median) for missing entries
+    clip: Optional[Tuple[Optional[float], Optional[float]]] = None  #: (low, high) bounds applied last
+    default: float = 50.0  #: score of every row when the column is not available (or still all missing after fill)
+
+
+def _term_values(df: pd.DataFrame, column: str) -> Optional[np.ndarray]:
+    """Float values of a score column, calculated field or expression; None when it cannot be evaluated."""
+    if column in df.columns:
+        values = df[column]
+    elif column in CALCULATED_FIELDS:
+        if not set(CALCULATED_FIELD_COLUMNS[column]) <= set(df.columns):
+            return None
+        values = CALCULATED_FIELDS[column](df)
+    else:
+        try:
+            values = df.eval(column)
+        except (NameError, KeyError, SyntaxError, ValueError, TypeError):
+            return None
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _normalized(values: np.ndarray, normalize: Optional[str]) -> np.ndarray:
+    if normalize is None:
+        return values
+    if normalize == "minmax":
+        low, high = np.nanmin(values), np.nanmax(values)
+        if not high > low:
+            return np.where(np.isnan(values), np.nan, 50.0)
+        return (values - low) / (high - low) * 100
+    if normalize == "max":
+        high = np.nanmax(values)
+        if not high > 0:
+            return np.where(np.isnan(values), np.nan, 50.0)
+        return values / high * 100
+
+    ranks = pd.Series(values).rank(method="average").to_numpy(dtype="float64", na_value=np.nan)
+    count = np.count_nonzero(~np.isnan(values))
+    if count < 2:
+        return np.where(np.isnan(values), np.nan, 50.0)
+    return (ranks - 1) / (count - 1) * 100
+
+
+def _term_score(df: pd.DataFrame, term: ScoreTerm) -> np.ndarray:
+    values = _term_values(df, term.column)
+    if values is None:
+        return np.full(len(df), term.default)
+
+    missing = np.isnan(values)
+    if term.fill is not None and missing.any():
+        fill = term.fill
+        if fill == "median":
+            fill = np.nan if missing.all() else np.nanmedian(values)
+        values = np.where(missing, fill, values)
+    # Only a column that is still entirely missing after its fill scores default
+    if np.isnan(values).all():
+        return np.full(len(df), term.default)
+
+    score = _normalized(values, term.normalize)
+    if term.invert:
+        score = -score if term.normalize is None else 100 - score
+    if term.clip is not None:
+        low, high = term.clip
+        score = np.clip(score, -np.inf if low is None else low, np.inf if high is None else high)
+    return score
+
+
+def compute_score(df: pd.DataFrame, terms: List[Union[ScoreTerm, dict]]) -> pd.Series:
+    """
+    Evaluate a weighted score over whole columns at once.
+
+    Args:
+        df: DataFrame with property data
+        terms: ScoreTerm specs (or dicts of ScoreTerm fields), e.g.
+            [{"column": "price_per_sqft", "weight": 0.6, "invert": True, "normalize": "percentile"},
+             {"column": "estimated_value - list_price", "weight": 0.4, "clip": (0, None)}]
+
+    Returns:
+        Series with the weighted sum of the term scores, aligned with df
+    """
+    total = np.zeros(len(df))
+    for term in terms:
+        term = term if isinstance(term, ScoreTerm) else ScoreTerm(**term)
+        total = total + _term_score(df, term) * term.weight
+    return pd.Series(total, index=df.index)
+
+
+def score_properties(
+    df: pd.DataFrame,
+    terms: List[Union[ScoreTerm, dict]],
+    score_name: str = "score",
+    inplace: bool = False
+) -> pd.DataFrame:
+    """
+    Add a vectorized score column (see compute_score).
+
+    Args:
+        df: DataFrame with property data
+        terms: ScoreTerm specs or dicts
+        score_name: Name for the score column
+        inplace: Add the column to df itself instead of a copy
+
+    Returns:
+        DataFrame with the score column added
+    """
+    target = df if inplace else df.copy()
+    target[score_name] = compute_score(target, terms)
+    return target
+
+
 def create_custom_score(
     df: pd.DataFrame,
-    score_function: Callable[[pd.Series], float],
+    score_function: Union[Callable[[pd.Series], float], List[Union[ScoreTerm, dict]]],
     score_name: str = "custom_score"
 ) -> pd.DataFrame:
     """
@@ -282,17 +457,33 @@ def create_custom_score(
 
     Args:
         df: DataFrame with property data
-        score_function: Function that takes a row and returns a score
+        score_function: Score spec (a list of ScoreTerm/dicts, evaluated column-wise by compute_score), or a
+            function that takes a row and returns a score (evaluated row by row, which is much slower)
         score_name: Name for the score column
 
     Returns:
         DataFrame with custom score added
     """
+    if not callable(score_function):
+        return score_properties(df, score_function, score_name)
     df_copy = df.copy()
     df_copy[score_name] = df_copy.apply(score_function, axis=1)
     return df_copy
 
 
+#: rank_by_investment_potential's factors, each on a 0-100 scale
+INVESTMENT_SCORE_TERMS = [
+    # Price per sqft (lower is better, so invert)
+    ScoreTerm(column="price_per_sqft", weight=0.3, fill="median", invert=True),
+    # Price discount: negative discount (below estimate) is good
+    ScoreTerm(column="price_discount", weight=0.4, fill=0, normalize=None, invert=True, clip=(0, 100)),
+    # Days on market (longer is better for negotiation)
+    ScoreTerm(column="days_on_mls", weight=0.2, fill=0, normalize="max"),
+    # Lot size (bigger is better)
+    ScoreTerm(column="lot_sqft", weight=0.1, fill="median"),
+]
+
+
 def rank_by_investment_potential(df: pd.DataFrame) -> pd.DataFrame:
     """
     Rank properties by investment potential using multiple factors.
@@ -303,6 +494,9 @@ def rank_by_investment_potential(df: pd.DataFrame) -> pd.DataFrame:
     - Days on market (longer may indicate motivated seller)
     - Lot size (bigger is better for investment)
 
+    The score is computed column-wise (INVESTMENT_SCORE_TERMS through compute_score) and the frame is reordered
+    once, best first.
+
     Args:
         df: DataFrame with property data
 
@@ -312,53 +506,122 @@ def rank_by_investment_potential(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
 
-    df_copy = df.copy()
+    score = compute_score(df, INVESTMENT_SCORE_TERMS).to_numpy()
+    order = np.argsort(np.where(np.isnan(score), np.inf, -score), kind="stable")
 
-    # Calculate individual scores (0-100 scale)
-    scores = pd.DataFrame(index=df_copy.index)
+    ranked = df.take(order).reset_index(drop=True)
+    ranked['investment_score'] = score[order]
+    return ranked
 
-    # Price per sqft score (lower is better, so invert)
-    if 'price_per_sqft' in df_copy.columns:
-        ppsf = df_copy['price_per_sqft'].fillna(df_copy['price_per_sqft'].median())
-        scores['ppsf_score'] = 100 - ((ppsf - ppsf.min()) / (ppsf.max() - ppsf.min()) * 100)
-    else:
-        scores['ppsf_score'] = 50
 
-    # Price discount score
-    if 'list_price' in df_copy.columns and 'estimated_value' in df_copy.columns:
-        discount = calculate_price_discount(df_copy).fillna(0)
-        # Negative discount (below estimate) is good
-        scores['discount_score'] = discount.apply(lambda x: min(100, max(0, -x)))
-    else:
-        scores['discount_score'] = 50
+#: pareto_frontier's default deal criteria: cheap per sqft, far below estimate, long on market, big lot
+DEAL_CRITERIA = {
+    "price_per_sqft": "min",
+    "price_discount": "min",  #: negative = below estimated_value
+    "days_on_mls": "max",
+    "lot_sqft": "max",
+}
 
-    # Days on market score (longer is better for negotiation)
-    if 'days_on_mls' in df_copy.columns:
-        dom = df_copy['days_on_mls'].fillna(0)
-        scores['dom_score'] = (dom / dom.max() * 100) if dom.max() > 0 else 50
-    else:
-        scores['dom_score'] = 50
 
-    # Lot size score (bigger is better)
-    if 'lot_sqft' in df_copy.columns:
-        lot = df_copy['lot_sqft'].fillna(df_copy['lot_sqft'].median())
-        scores['lot_score'] = ((lot - lot.min()) / (lot.max() - lot.min()) * 100)
-    else:
-        scores['lot_score'] = 50
-
-    # Calculate weighted average (you can adjust weights)
-    weights = {
-        'ppsf_score': 0.3,
-        'discount_score': 0.4,
-        'dom_score': 0.2,
-        'lot_score': 0.1
-    }
-
-    df_copy['investment_score'] = sum(
-        scores[col] * weight for col, weight in weights.items()
-    )
+def _criteria_ranks(df: pd.DataFrame, criteria: dict) -> np.ndarray:
+    """(rows, criteria) dense ranks where lower is better on every criterion and a missing value ranks worst."""
+    columns = []
+    for column, goal in criteria.items():
+        if goal not in ("min", "max"):
+            raise ValueError(f"Criterion '{column}' must be 'min' or 'max', got '{goal}'")
+        values = _term_values(df, column)
+        if values is None or np.isnan(values).all():
+            continue  #: like sort_properties, criteria that are not available are skipped
+        missing = np.isnan(values)
+        ranks = np.empty(len(values), dtype=np.int32)
+        distinct, ranks[~missing] = np.unique(values[~missing] if goal == "min" else -values[~missing],
+                                              return_inverse=True)
+        ranks[missing] = len(distinct)
+        columns.append(ranks)
+    return np.column_stack(columns) if columns else np.zeros((len(df), 0), dtype=np.int32)
+
+
+def _skyline(points: np.ndarray) -> np.ndarray:
+    """
+    Positions of the non-dominated rows of points (lower is better in every column).
+
+    Rows are visited in order of their coordinate sum. A row can only be dominated by rows with a smaller sum, so
+    every visited row is on the frontier. It removes all later rows it dominates in one vectorized comparison: a
+    later row that is no better on any criterion is dominated unless it is an exact copy (the same sum).
+    """
+    sums = points.sum(axis=1)
+    order = np.argsort(sums, kind="stable")
+    columns = [np.ascontiguousarray(points[order, j]) for j in range(points.shape[1])]
+    sums, positions = sums[order], order
+    i = 0
+    while i < len(positions):
+        dominated = sums[i + 1:] > sums[i]
+        for column in columns:
+            dominated &= column[i + 1:] >= column[i]
+        if dominated.any():
+            keep = np.concatenate([np.ones(i + 1, dtype=bool), ~dominated])
+            columns = [column[keep] for column in columns]
+            sums, positions = sums[keep], positions[keep]
+        i += 1
+    return np.sort(positions)
+
+
+def pareto_layers(df: pd.DataFrame, criteria: Optional[dict] = None, max_layers: Optional[int] = 1) -> np.ndarray:
+    """
+    Pareto layer of every property over several criteria.
+
+    Layer 1 is the non-dominated set (the skyline): properties that no other property beats or matches on every
+    criterion. Layer 2 is the skyline of what remains, and so on.
+
+    Args:
+        df: DataFrame with property data
+        criteria: {column, calculated field or expression: "min" or "max"} (DEAL_CRITERIA by default)
+        max_layers: Number of layers to peel (None for all)
+
+    Returns:
+        int array, one entry per row: its layer, or 0 beyond max_layers
+    """
+    points = _criteria_ranks(df, DEAL_CRITERIA if criteria is None else criteria)
+    layers = np.zeros(len(df), dtype=np.int64)
+    remaining = np.arange(len(df))
+    layer = 0
+    while len(remaining) and (max_layers is None or layer < max_layers):
+        layer += 1
+        frontier = _skyline(points[remaining])
+        layers[remaining[frontier]] = layer
+        remaining = np.delete(remaining, frontier)
+    return layers
+
+
+def pareto_frontier(df: pd.DataFrame, criteria: Optional[dict] = None, layers: int = 1) -> pd.DataFrame:
+    """
+    Get the properties no other property beats on every criterion at once, instead of ranking one criterion at a
+    time as get_best_deals does.
+
+    Example:
+        pareto_frontier(df)  # DEAL_CRITERIA: low price_per_sqft, deep price_discount, long days_on_mls, big lot
+        pareto_frontier(df, {"list_price": "min", "sqft": "max"}, layers=3)
+
+    A missing value counts as the worst value of its criterion, and criteria the frame cannot provide are skipped.
+
+    Args:
+        df: DataFrame with property data
+        criteria: {column, calculated field or expression: "min" or "max"} (DEAL_CRITERIA by default)
+        layers: Number of successive frontiers to return
+
+    Returns:
+        DataFrame of the frontier properties with a pareto_layer column, by layer and then original order
+    """
+    if df.empty:
+        return df
+
+    layer = pareto_layers(df, criteria, layers)
+    positions = np.flatnonzero(layer)
+    positions = positions[np.argsort(layer[positions], kind="stable")]
 
-    return df_copy.sort_values('investment_score', ascending=False).reset_index(drop=True)
+    frontier = df.take(positions).reset_index(drop=True)
+    frontier['pareto_layer'] = layer[positions]
+    return frontier
 
 
 def get_available_sort_fields() -> dict:
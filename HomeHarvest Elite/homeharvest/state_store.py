@@ -0,0 +1,131 @@
+"""
+Persistent scrape state for incremental (delta) scrapes.
+
+Stores a per-query last_update_date watermark so each run only transfers listings that changed since the previous one.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class Watermark(BaseModel):
+    key: str
+    value: str  # ISO 8601 last_update_date (timezone-naive UTC) of the newest listing seen
+    boundary_ids: List[str] = []  # property_ids already seen at exactly `value`
+    updated_at: Optional[str] = None
+
+
+def _merge_watermark(current: Optional[Watermark], key: str, value: str, boundary_ids: List[str]) -> Optional[Watermark]:
+    """Return the watermark to store, or None if `value` would move it backwards."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec="seconds")
+
+    if current is None or value > current.value:
+        return Watermark(key=key, value=value, boundary_ids=sorted(set(boundary_ids)), updated_at=now)
+    if value == current.value:
+        return Watermark(key=key, value=value, boundary_ids=sorted(set(current.boundary_ids) | set(boundary_ids)), updated_at=now)
+    return None
+
+
+class StateStore:
+    """Interface for watermark storage. Subclass this to keep delta state in Redis, Postgres, etc."""
+
+    def get_watermark(self, key: str) -> Optional[Watermark]:
+        raise NotImplementedError
+
+    def advance_watermark(self, key: str, value: str, boundary_ids: List[str] = None) -> Watermark:
+        """Atomically move the watermark forward to `value`. Never moves it backwards."""
+        raise NotImplementedError
+
+    def reset_watermark(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryStateStore(StateStore):
+    """In-process store, useful for tests and short-lived workers."""
+
+    def __init__(self):
+        self._watermarks: Dict[str, Watermark] = {}
+        self._lock = threading.Lock()
+
+    def get_watermark(self, key: str) -> Optional[Watermark]:
+        with self._lock:
+            return self._watermarks.get(key)
+
+    def advance_watermark(self, key: str, value: str, boundary_ids: List[str] = None) -> Watermark:
+        with self._lock:
+            current = self._watermarks.get(key)
+            merged = _merge_watermark(current, key, value, boundary_ids or [])
+            if merged is not None:
+                self._watermarks[key] = merged
+            return self._watermarks[key]
+
+    def reset_watermark(self, key: str) -> None:
+        with self._lock:
+            self._watermarks.pop(key, None)
+
+
+class SQLiteStateStore(StateStore):
+    """Default store. One row per query key in a local SQLite database.
+
+    The path defaults to $HOMEHARVEST_STATE_DB, then ~/.homeharvest/state.sqlite3.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.environ.get("HOMEHARVEST_STATE_DB") or os.path.join(
+            os.path.expanduser("~"), ".homeharvest", "state.sqlite3"
+        )
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS watermarks (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                boundary_ids TEXT NOT NULL DEFAULT '[]',
+                updated_at TEXT
+            )"""
+        )
+
+    def _read(self, key: str) -> Optional[Watermark]:
+        row = self._connection.execute(
+            "SELECT key, value, boundary_ids, updated_at FROM watermarks WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return Watermark(key=row[0], value=row[1], boundary_ids=json.loads(row[2]), updated_at=row[3])
+
+    def get_watermark(self, key: str) -> Optional[Watermark]:
+        with self._lock:
+            return self._read(key)
+
+    def advance_watermark(self, key: str, value: str, boundary_ids: List[str] = None) -> Watermark:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent processes serialize on the read-compare-write
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._read(key)
+                merged = _merge_watermark(current, key, value, boundary_ids or [])
+                if merged is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO watermarks (key, value, boundary_ids, updated_at) VALUES (?, ?, ?, ?)",
+                        (merged.key, merged.value, json.dumps(merged.boundary_ids), merged.updated_at),
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            return merged or current
+
+    def reset_watermark(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM watermarks WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        self._connection.close()
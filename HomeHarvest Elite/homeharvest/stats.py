@@ -0,0 +1,77 @@
+"""
+Per-call scrape instrumentation.
+
+A ScrapeStats is filled in while scrape_property runs and is attached to the returned DataFrame as
+df.attrs["scrape_stats"], or returned alongside the results with return_stats=True.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from pydantic import BaseModel
+
+#: one lock for all stats objects; updates are tiny and may come from page/property worker threads
+_lock = threading.Lock()
+
+
+class ScrapeStats(BaseModel):
+    """Where a scrape spent its time and what it transferred.
+
+    stage_seconds keys: total, handle_location, search (pagination wall time), page_fetch, bulk_details,
+    process_property, filters, dataframe (assembly, including cleaning when clean_data=True), sorting,
+    compact_dtypes. page_fetch, bulk_details and process_property are
+    summed across worker threads, so in parallel mode they can exceed the wall time of search.
+    """
+
+    stage_seconds: Dict[str, float] = {}
+    pages: int = 0
+    pages_skipped: int = 0  #: planned pages never fetched because top_k was already satisfied
+    detail_chunks: int = 0
+    requests: int = 0
+    retries: int = 0
+    bytes_downloaded: int = 0
+    rows_fetched: int = 0
+    rows_dropped: Dict[str, int] = {}
+    rows_returned: int = 0
+    delta_truncated: bool = False  #: a delta run hit limit before the watermark, which was left in place
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with _lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def count(self, field: str, amount: int = 1) -> None:
+        with _lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def record_dropped(self, reason: str, before: int, after: int) -> None:
+        if before == after:
+            return
+        with _lock:
+            self.rows_dropped[reason] = self.rows_dropped.get(reason, 0) + before - after
+
+    def record_response(self, response) -> None:
+        """Count one HTTP response: bytes received and retries performed by the urllib3 Retry layer."""
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        retried = len(retries.history) if retries is not None and retries.history else 0
+        with _lock:
+            self.requests += 1 + retried
+            self.retries += retried
+            self.bytes_downloaded += len(response.content or b"")
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.stage_seconds.items())
+        dropped = ", ".join(f"{reason} {count}" for reason, count in self.rows_dropped.items()) or "none"
+        return (
+            f"{self.rows_returned} rows from {self.rows_fetched} fetched in {self.pages} page(s), "
+            f"{self.detail_chunks} detail chunk(s), {self.requests} request(s), {self.retries} retr(y/ies), "
+            f"{self.bytes_downloaded / 1024:.0f} KiB | {stages} | dropped: {dropped}"
+        )
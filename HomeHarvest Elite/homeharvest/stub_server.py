@@ -0,0 +1,201 @@
+"""
+Local stand-in for the realtor.com endpoints used by RealtorScraper.
+
+Serves address autocomplete and the GraphQL search/detail queries from a recorded FixtureStore and/or an in-memory
+dataset of raw search results, with optional latency and 429 injection. Pair it with transport.RedirectAdapter:
+
+    with RealtorStubServer(dataset=results) as server, use_transport(RedirectAdapter(server.url)):
+        df = scrape_property(location="Phoenix, AZ")
+"""
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .transport import ORIGINAL_URL_HEADER, FixtureStore
+
+BULK_ALIAS_PATTERN = re.compile(r"home_(\w+)\s*:\s*home\(property_id:")
+LIMIT_PATTERN = re.compile(r"\blimit:\s*(\d+)")
+
+DEFAULT_AUTOCOMPLETE = {
+    "area_type": "city",
+    "city": "Phoenix",
+    "state_code": "AZ",
+    "centroid": {"lat": 33.4484, "lon": -112.074},
+    "mpr_id": "stub",
+}
+
+
+def default_details() -> dict:
+    """Minimal extra-details payload for a listing, shaped like the HomeData fragment."""
+    return {
+        "nearbySchools": {"schools": []},
+        "taxHistory": [],
+        "monthly_fees": None,
+        "one_time_fees": None,
+        "parking": None,
+        "terms": None,
+        "popularity": None,
+        "property_history": None,
+    }
+
+
+class RealtorStubServer:
+    """Threaded HTTP server on 127.0.0.1 answering like realtor.com.
+
+    Lookup order for every request: a matching fixture in `store`, then the `dataset` of raw home_search results.
+    `details` maps property_id to the payload returned for bulk detail queries (default_details() otherwise).
+    Every `rate_limit_every`-th GraphQL request is answered with HTTP 429 and a Retry-After header.
+    request_counts tallies requests per endpoint: "autocomplete", "search" (result pages) and "bulk_details".
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore = None,
+        dataset: List[dict] = None,
+        details: Dict[str, dict] = None,
+        autocomplete: dict = None,
+        latency: float = 0,
+        rate_limit_every: int = 0,
+        retry_after: int = 0,
+    ):
+        self.store = store
+        self.dataset = dataset or []
+        self.details = details or {}
+        self.autocomplete = autocomplete or DEFAULT_AUTOCOMPLETE
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+
+        self.request_counts: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        self._search_requests = 0
+        self._lock = threading.Lock()
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RealtorStubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self, "GET", b"")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                stub._handle(self, "POST", self.rfile.read(length))
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.request_counts.clear()
+            self.status_counts.clear()
+
+    def __enter__(self) -> "RealtorStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = urlsplit(handler.path).path
+        if path.endswith("/suggest"):
+            endpoint = "autocomplete"
+        else:
+            endpoint = "bulk_details" if BULK_ALIAS_PATTERN.search(body.decode("utf-8", errors="replace")) else "search"
+        with self._lock:
+            self.request_counts[endpoint] += 1
+            if endpoint != "autocomplete":
+                self._search_requests += 1
+                throttled = self.rate_limit_every and self._search_requests % self.rate_limit_every == 0
+            else:
+                throttled = False
+
+        if throttled:
+            self._respond(handler, 429, {"error": "Too Many Requests"}, {"Retry-After": str(self.retry_after)})
+            return
+
+        if self.store is not None:
+            original_url = handler.headers.get(ORIGINAL_URL_HEADER)
+            fixture = self.store.lookup(method, original_url, body) if original_url else None
+            if fixture is not None:
+                recorded = fixture["response"]
+                self._respond(handler, recorded["status"], recorded["body"], {"Content-Type": "application/json"})
+                return
+
+        if endpoint == "autocomplete":
+            query = parse_qs(urlsplit(handler.path).query)
+            self._respond(handler, 200, {"autocomplete": [self.autocomplete] if query.get("input") else []})
+        elif method == "POST":
+            self._respond(handler, 200, self._graphql(body))
+        else:
+            self._respond(handler, 404, {"error": "Not Found"})
+
+    def _graphql(self, body: bytes) -> dict:
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return {"errors": [{"message": "invalid JSON body"}]}
+
+        query = payload.get("query") or ""
+        variables = payload.get("variables") or {}
+
+        aliases = BULK_ALIAS_PATTERN.findall(query)
+        if aliases:
+            return {
+                "data": {f"home_{property_id}": self.details.get(property_id) or default_details() for property_id in aliases}
+            }
+
+        search_key = "home_search" if "home_search" in query else "property_search"
+        offset = variables.get("offset", 0)
+        limit_match = LIMIT_PATTERN.search(query)  #: page size is inlined in the query, not passed as a variable
+        limit = int(limit_match.group(1)) if limit_match else 200
+        page = self.dataset[offset:offset + limit]
+        return {
+            "data": {
+                search_key: {"total": len(self.dataset), "count": len(page), "results": page}
+            }
+        }
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, payload, headers: Dict[str, str] = None) -> None:
+        content = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        with self._lock:
+            self.status_counts[status] += 1
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            if name.lower() not in ("content-type", "content-length"):
+                handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(content)
@@ -0,0 +1,468 @@
+"""
+Seeded generator of synthetic realtor.com `home_search` results for scale and performance testing.
+
+Records are shaped like the GraphQL results RealtorScraper receives (including the extra-details keys merged in
+when extra_property_data=True) and follow rough market distributions: log-normal prices and lot sizes, Zipf-skewed
+tags, a shared pool of agents/offices, sparse optional fields and a realistic status mix. The same seed always
+produces the same records.
+
+    results = generate_results(10_000, seed=7)
+    write_fixture_pages("fixtures/synthetic-10k", 10_000, seed=7)
+    results = load_fixture_pages("fixtures/synthetic-10k")
+"""
+import gzip
+import itertools
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from .tag_utils import TAG_CATEGORIES
+
+#: reference "now" for generated dates, fixed so a seed is reproducible across days; pass as_of to override
+DEFAULT_AS_OF = datetime(2025, 6, 1, 12, 0, 0)
+
+PAGE_SIZE = 200
+
+#: listing status mix when no status is requested
+STATUS_WEIGHTS = {"for_sale": 0.62, "sold": 0.2, "pending": 0.08, "for_rent": 0.07, "off_market": 0.03}
+
+STYLE_WEIGHTS = {
+    "single_family": 0.66,
+    "condos": 0.12,
+    "townhomes": 0.08,
+    "multi_family": 0.05,
+    "land": 0.04,
+    "mobile": 0.03,
+    "farm": 0.01,
+    "duplex_triplex": 0.01,
+}
+
+#: probability that an optional field is missing (None) on a record
+MISSING_RATES = {
+    "sqft": 0.06,
+    "lot_sqft": 0.15,
+    "year_built": 0.08,
+    "baths_half": 0.35,
+    "garage": 0.3,
+    "stories": 0.2,
+    "text": 0.1,
+    "coordinate": 0.02,
+    "county": 0.01,
+    "hoa": 0.6,
+    "photos": 0.07,
+    "tags": 0.05,
+    "advertisers": 0.04,
+    "office": 0.1,
+    "current_estimates": 0.25,
+    "tax_history": 0.12,
+    "open_houses": 0.85,
+    "neighborhoods": 0.4,
+}
+
+MARKETS = [
+    ("Phoenix", "AZ", "850", 33.4484, -112.074, "Maricopa", "04013", 430000),
+    ("Houston", "TX", "770", 29.7604, -95.3698, "Harris", "48201", 340000),
+    ("Atlanta", "GA", "303", 33.749, -84.388, "Fulton", "13121", 390000),
+    ("Columbus", "OH", "432", 39.9612, -82.9988, "Franklin", "39049", 280000),
+    ("Denver", "CO", "802", 39.7392, -104.9903, "Denver", "08031", 590000),
+    ("Tampa", "FL", "336", 27.9506, -82.4572, "Hillsborough", "12057", 410000),
+]
+
+STREET_NAMES = [
+    "Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Sunset",
+    "Park", "Ridge", "Highland", "Meadow", "Willow", "Camelback", "Indian School", "Mesquite", "Palm", "Desert",
+]
+STREET_SUFFIXES = ["St", "Ave", "Rd", "Dr", "Ln", "Ct", "Blvd", "Way", "Pl", "Cir"]
+STREET_DIRECTIONS = [None, None, None, None, "N", "S", "E", "W"]
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Maria",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+]
+BROKERAGES = [
+    "Keller Williams Realty", "RE/MAX Excalibur", "Coldwell Banker Realty", "HomeSmart", "Redfin Corporation",
+    "eXp Realty", "Berkshire Hathaway HomeServices", "Realty ONE Group", "Compass", "Century 21 Northwest",
+]
+AVM_SOURCES = [("corelogic", "CoreLogic"), ("collateral", "Collateral Analytics"), ("quantarium", "Quantarium")]
+SCHOOL_DISTRICTS = ["Unified School District", "Elementary District", "Union High School District", "Independent School District"]
+
+#: full tag vocabulary, most common first (Zipf weights follow this order)
+TAG_VOCABULARY = list(dict.fromkeys(tag for tags in TAG_CATEGORIES.values() for tag in tags))
+TAG_CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) ** 0.6 for rank in range(len(TAG_VOCABULARY))))
+
+
+def _weighted_choice(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _missing(rng: random.Random, field: str) -> bool:
+    return rng.random() < MISSING_RATES[field]
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _phone(rng: random.Random, area_code: str) -> str:
+    return f"({area_code}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+
+
+class _AdvertiserPool:
+    """Fixed pool of agents and offices so agents list several properties, like a real market."""
+
+    def __init__(self, rng: random.Random, count: int):
+        self.offices = []
+        for i, brokerage in enumerate(BROKERAGES * max(1, count // 2000 + 1)):
+            market = MARKETS[i % len(MARKETS)]
+            self.offices.append(
+                {
+                    "fulfillment_id": str(3000000 + i),
+                    "name": f"{brokerage} - {market[0]}",
+                    "email": f"office{i}@{brokerage.split()[0].lower().replace('/', '')}.com",
+                    "mls_set": f"O-{market[1]}MLS-{10000 + i}",
+                    "phones": [{"number": _phone(rng, market[2][:3]), "type": "Office", "primary": True, "ext": None}],
+                    "broker": {"fulfillment_id": str(4000000 + i), "name": brokerage},
+                }
+            )
+
+        self.agents = []
+        for i in range(max(5, count // 12)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            phones = [{"number": _phone(rng, "602"), "type": "Mobile", "primary": True, "ext": None}]
+            if rng.random() < 0.3:
+                phones.append({"number": _phone(rng, "480"), "type": "Office", "primary": False, "ext": None})
+            self.agents.append(
+                {
+                    "type": "seller",
+                    "fulfillment_id": str(1000000 + i),
+                    "nrds_id": str(rng.randint(100000000, 999999999)) if rng.random() < 0.7 else None,
+                    "mls_set": f"A-MLS-{20000 + i}",
+                    "name": f"{first} {last}",
+                    "email": f"{first.lower()}.{last.lower()}{i}@example.com" if rng.random() < 0.85 else None,
+                    "phones": phones if rng.random() < 0.92 else None,
+                    "state_license": f"SA{rng.randint(100000, 999999)}",
+                    "office_index": rng.randrange(len(self.offices)),
+                }
+            )
+        #: Zipf-like activity: a few agents carry many listings
+        self.agent_cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(self.agents))))
+
+    def advertisers(self, rng: random.Random) -> list[dict]:
+        agent = dict(rng.choices(self.agents, cum_weights=self.agent_cum_weights)[0])
+        office = self.offices[agent.pop("office_index")]
+        if not _missing(rng, "office"):
+            agent["office"] = {key: value for key, value in office.items() if key != "broker"}
+            agent["broker"] = office["broker"]
+        return [agent]
+
+
+def _tags(rng: random.Random, style: str) -> list[str] | None:
+    if _missing(rng, "tags"):
+        return None
+    count = min(len(TAG_VOCABULARY), max(0, int(rng.gauss(9, 5))))
+    tags = set()
+    while len(tags) < count:
+        tags.add(rng.choices(TAG_VOCABULARY, cum_weights=TAG_CUM_WEIGHTS)[0])
+    if style == "single_family":
+        tags.add("single_story" if rng.random() < 0.55 else "two_or_more_stories")
+    return sorted(tags)
+
+
+def _photos(rng: random.Random, property_id: str) -> list[dict] | None:
+    if _missing(rng, "photos"):
+        return None
+    count = max(1, min(80, int(rng.expovariate(1 / 24))))
+    return [
+        {"href": f"https://ap.rdcpix.com/{property_id}{i:02d}l-m{rng.randint(10**8, 10**9)}s.jpg", "tags": None}
+        for i in range(count)
+    ]
+
+
+def _tax_history(rng: random.Random, price: int, as_of: datetime) -> list[dict]:
+    if _missing(rng, "tax_history"):
+        return []
+    history = []
+    assessed = int(price * rng.uniform(0.55, 0.95))
+    for year in range(as_of.year - 1, as_of.year - 1 - rng.randint(1, 10), -1):
+        land = int(assessed * rng.uniform(0.15, 0.35))
+        history.append(
+            {
+                "year": year,
+                "tax": int(assessed * rng.uniform(0.008, 0.018)),
+                "assessment": {"building": assessed - land, "land": land, "total": assessed},
+            }
+        )
+        assessed = int(assessed / rng.uniform(1.0, 1.07))
+    return history
+
+
+def _current_estimates(rng: random.Random, price: int, as_of: datetime) -> list[dict] | None:
+    if _missing(rng, "current_estimates"):
+        return None
+    estimates = []
+    for i, (source_type, source_name) in enumerate(rng.sample(AVM_SOURCES, rng.randint(1, len(AVM_SOURCES)))):
+        estimate = int(price * rng.uniform(0.85, 1.2))
+        estimates.append(
+            {
+                "estimate": estimate,
+                "estimate_high": int(estimate * 1.08),
+                "estimate_low": int(estimate * 0.92),
+                "date": as_of.strftime("%Y-%m-%d"),
+                "is_best_home_value": i == 0,
+                "source": {"type": source_type, "name": source_name},
+            }
+        )
+    return estimates
+
+
+def generate_result(
+    rng: random.Random,
+    index: int,
+    pool: _AdvertiserPool,
+    as_of: datetime = DEFAULT_AS_OF,
+    status: str = None,
+    extra_property_data: bool = True,
+) -> dict:
+    """Build one GraphQL-shaped home_search result."""
+    status = status or _weighted_choice(rng, STATUS_WEIGHTS)
+    style = _weighted_choice(rng, STYLE_WEIGHTS)
+    city, state_code, zip_prefix, lat, lon, county, fips_code, median_price = MARKETS[index % len(MARKETS)]
+    property_id = str(1000000000 + index)
+
+    # Size and price
+    sqft = int(min(9000, max(400, rng.gauss(1900, 700)))) if style != "land" else None
+    beds = None if style == "land" else max(1, min(8, round((sqft or 1900) / 650 + rng.gauss(0, 0.7))))
+    baths_full = None if style == "land" else max(1, min(6, round((beds or 3) * 0.65 + rng.gauss(0, 0.5))))
+    lot_sqft = int(rng.lognormvariate(math.log(7500), 0.7)) if style not in ("condos", "townhomes") else None
+    year_built = int(min(as_of.year, max(1890, rng.gauss(1988, 22)))) if style != "land" else None
+
+    if status == "for_rent":
+        list_price = int(round(rng.lognormvariate(math.log(median_price / 180), 0.35), -1))
+    else:
+        list_price = int(round(rng.lognormvariate(math.log(median_price), 0.5), -3))
+        if style == "land":
+            list_price = int(list_price * 0.3)
+
+    # Dates: days on market is roughly exponential; updates happen after listing
+    days_on_market = min(720, int(rng.expovariate(1 / 45)))
+    list_date = as_of - timedelta(days=days_on_market, seconds=rng.randint(0, 86399))
+    last_update_date = list_date + (as_of - list_date) * rng.random()
+    last_sold_date = last_sold_price = pending_date = None
+    if status == "sold":
+        last_sold_date = min(as_of, list_date + timedelta(days=int(rng.expovariate(1 / 38)) + 7))
+        last_sold_price = int(round(list_price * rng.uniform(0.92, 1.04), -2))
+        last_update_date = last_sold_date
+    elif status == "off_market" and rng.random() < 0.6:
+        last_sold_date = list_date - timedelta(days=rng.randint(365, 365 * 15))
+        last_sold_price = int(round(list_price * rng.uniform(0.5, 0.9), -3))
+
+    is_pending = status == "pending" and rng.random() < 0.8
+    is_contingent = status == "pending" and not is_pending
+    if is_pending or is_contingent:
+        pending_date = min(as_of, list_date + timedelta(days=int(rng.expovariate(1 / 20)) + 1))
+    last_status_change_date = last_sold_date or pending_date or list_date
+
+    street_number = str(rng.randint(100, 29999))
+    street_direction = rng.choice(STREET_DIRECTIONS)
+    street_name = rng.choice(STREET_NAMES)
+    street_suffix = rng.choice(STREET_SUFFIXES)
+    unit = f"Unit {rng.randint(1, 450)}" if style in ("condos", "townhomes") else None
+    line = " ".join(part for part in [street_number, street_direction, street_name, street_suffix, unit] if part)
+
+    photos = _photos(rng, property_id)
+    reduced = status == "for_sale" and rng.random() < 0.22
+
+    result = {
+        "property_id": property_id,
+        "listing_id": str(2000000000 + index),
+        "plan_id": None,
+        "status": "for_sale" if status == "pending" else status,
+        "list_price": list_price,
+        "list_price_max": None,
+        "list_price_min": None,
+        "list_date": _iso(list_date),
+        "last_sold_price": last_sold_price,
+        "last_sold_date": last_sold_date.strftime("%Y-%m-%d") if last_sold_date else None,
+        "pending_date": pending_date.strftime("%Y-%m-%d") if pending_date else None,
+        "last_status_change_date": _iso(last_status_change_date),
+        "last_update_date": _iso(last_update_date),
+        "price_per_sqft": int(list_price / sqft) if sqft and status != "for_rent" else None,
+        "mls_status": {"for_sale": "Active", "sold": "Closed", "pending": "Pending", "for_rent": "Active", "off_market": None}[status],
+        "href": f"https://www.realtor.com/realestateandhomes-detail/{street_number}-{street_name}-{street_suffix}_{city}_{state_code}_{property_id}",
+        "permalink": f"{street_number}-{street_name}-{street_suffix}_{city}_{state_code}_{property_id}",
+        "hoa": None if _missing(rng, "hoa") else {"fee": int(rng.lognormvariate(math.log(120), 0.8))},
+        "flags": {
+            "is_pending": is_pending,
+            "is_contingent": is_contingent,
+            "is_new_construction": year_built is not None and year_built >= as_of.year - 1,
+            "is_coming_soon": status == "for_sale" and rng.random() < 0.02,
+            "is_new_listing": status == "for_sale" and days_on_market <= 7,
+            "is_price_reduced": reduced,
+            "is_foreclosure": rng.random() < 0.015,
+        },
+        "description": {
+            "type": style,
+            "sqft": None if _missing(rng, "sqft") else sqft,
+            "beds": beds,
+            "baths_full": baths_full,
+            "baths_half": None if _missing(rng, "baths_half") or baths_full is None else rng.randint(0, 2),
+            "lot_sqft": None if _missing(rng, "lot_sqft") else lot_sqft,
+            "year_built": None if _missing(rng, "year_built") else year_built,
+            "garage": None if _missing(rng, "garage") or style == "land" else rng.choice([1, 2, 2, 2, 3]),
+            "sold_price": last_sold_price,
+            "stories": None if _missing(rng, "stories") or style == "land" else rng.choice([1, 1, 2, 2, 3]),
+            "text": None if _missing(rng, "text") else f"Charming {style.replace('_', ' ')} home in {city} with {beds or 0} bedrooms.",
+            "name": None,
+        },
+        "location": {
+            "address": {
+                "street_direction": street_direction,
+                "street_number": street_number,
+                "street_name": street_name,
+                "street_suffix": street_suffix,
+                "line": line,
+                "unit": unit,
+                "city": city,
+                "state_code": state_code,
+                "postal_code": f"{zip_prefix}{rng.randint(0, 99):02d}",
+                "coordinate": None if _missing(rng, "coordinate") else {
+                    "lon": round(lon + rng.gauss(0, 0.12), 6),
+                    "lat": round(lat + rng.gauss(0, 0.12), 6),
+                },
+            },
+            "county": None if _missing(rng, "county") else {"name": county, "fips_code": fips_code},
+            "neighborhoods": None if _missing(rng, "neighborhoods") else [{"name": f"{rng.choice(STREET_NAMES)} Estates"}],
+        },
+        "tax_record": {
+            "cl_id": None,
+            "public_record_id": str(rng.randint(10**9, 10**10)),
+            "last_update_date": _iso(as_of - timedelta(days=rng.randint(30, 400))),
+            "apn": f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100, 999)}",
+            "tax_parcel_id": None,
+        },
+        "primary_photo": photos[0] if photos else None,
+        "photos": photos,
+        "advertisers": None if _missing(rng, "advertisers") else pool.advertisers(rng),
+        "tags": _tags(rng, style),
+        "details": [
+            {"category": "Interior Features", "text": [f"Bedrooms: {beds or 0}", f"Total Bathrooms: {baths_full or 0}"], "parent_category": "Interior"},
+        ],
+        "open_houses": None if _missing(rng, "open_houses") or status != "for_sale" else [
+            {
+                "start_date": _iso(as_of + timedelta(days=rng.randint(1, 6), hours=1)),
+                "end_date": _iso(as_of + timedelta(days=rng.randint(1, 6), hours=3)),
+                "description": None,
+                "time_zone": "MST",
+                "dst": False,
+                "href": None,
+                "methods": None,
+            }
+        ],
+        "units": None,
+        "pet_policy": {"cats": rng.random() < 0.6, "dogs": rng.random() < 0.6, "dogs_small": None, "dogs_large": None} if status == "for_rent" else None,
+        "current_estimates": None if status == "for_rent" else _current_estimates(rng, list_price, as_of),
+        "source": {"id": f"{state_code}MLS", "listing_id": str(5000000 + index)},
+    }
+
+    if extra_property_data:
+        result.update(generate_details(rng, list_price, as_of))
+
+    return result
+
+
+def generate_details(rng: random.Random, list_price: int, as_of: datetime = DEFAULT_AS_OF) -> dict:
+    """Extra-details keys (the bulk HomeData query) merged into a result when extra_property_data=True."""
+    return {
+        "nearbySchools": {
+            "schools": [
+                {"district": {"id": str(rng.randint(1000, 9999)), "name": f"{rng.choice(LAST_NAMES)} {rng.choice(SCHOOL_DISTRICTS)}"}}
+                for _ in range(rng.randint(0, 4))
+            ]
+        },
+        "taxHistory": _tax_history(rng, list_price, as_of),
+        "monthly_fees": None,
+        "one_time_fees": None,
+        "parking": None,
+        "terms": None,
+        "popularity": {"periods": [{"clicks_total": rng.randint(0, 500), "views_total": rng.randint(0, 5000), "last_n_days": 30}]},
+    }
+
+
+def iter_results(
+    count: int,
+    seed: int = 0,
+    as_of: datetime = DEFAULT_AS_OF,
+    status: str = None,
+    extra_property_data: bool = True,
+) -> Iterator[dict]:
+    """Yield `count` synthetic results. Memory stays flat, so this scales to millions of records."""
+    rng = random.Random(seed)
+    pool = _AdvertiserPool(random.Random(seed + 1), count)
+    for index in range(count):
+        yield generate_result(rng, index, pool, as_of=as_of, status=status, extra_property_data=extra_property_data)
+
+
+def generate_results(
+    count: int,
+    seed: int = 0,
+    as_of: datetime = DEFAULT_AS_OF,
+    status: str = None,
+    extra_property_data: bool = True,
+) -> List[dict]:
+    """List of `count` synthetic results; the same seed always returns the same records."""
+    return list(iter_results(count, seed=seed, as_of=as_of, status=status, extra_property_data=extra_property_data))
+
+
+def write_fixture_pages(
+    path: str,
+    count: int,
+    seed: int = 0,
+    page_size: int = PAGE_SIZE,
+    as_of: datetime = DEFAULT_AS_OF,
+    status: str = None,
+) -> List[str]:
+    """Write `count` results as gzip GraphQL response pages (page_00000.json.gz, ...). Returns the file paths."""
+    os.makedirs(path, exist_ok=True)
+    files = []
+    page: List[dict] = []
+
+    def flush(page_number: int):
+        file = os.path.join(path, f"page_{page_number:05d}.json.gz")
+        payload = {"data": {"home_search": {"total": count, "count": len(page), "results": page}}}
+        with gzip.open(file, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        files.append(file)
+
+    for result in iter_results(count, seed=seed, as_of=as_of, status=status):
+        page.append(result)
+        if len(page) == page_size:
+            flush(len(files))
+            page = []
+    if page:
+        flush(len(files))
+
+    return files
+
+
+def iter_fixture_pages(path: str) -> Iterator[List[dict]]:
+    """Yield the results of each fixture page written by write_fixture_pages, in order."""
+    for name in sorted(os.listdir(path)):
+        if name.startswith("page_") and name.endswith(".json.gz"):
+            with gzip.open(os.path.join(path, name), "rt", encoding="utf-8") as f:
+                yield json.load(f)["data"]["home_search"]["results"]
+
+
+def load_fixture_pages(path: str, limit: Optional[int] = None) -> List[dict]:
+    """All results from a fixture directory, e.g. as RealtorStubServer(dataset=...)."""
+    results: List[dict] = []
+    for page in iter_fixture_pages(path):
+        results.extend(page)
+        if limit is not None and len(results) >= limit:
+            return results[:limit]
+    return results
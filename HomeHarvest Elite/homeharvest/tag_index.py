@@ -0,0 +1,183 @@
+"""
+Integer tag ids and per-property tag bitsets for vectorized tag filtering.
+
+TagIndex maps each (case-insensitive) tag to an integer id, lowercasing each distinct tag string once, and turns the
+tag lists of a batch of properties into a (rows, words) uint64 bitmap where bit i of a row is set when the property
+has tag i. any/all/exact/exclude matching is then a few bitwise operations over the whole batch:
+
+- any:     (bitmap & query) != 0 in some word
+- all:     (bitmap & query) == query in every word
+- exact:   bitmap == query in every word
+- exclude: no bit of (bitmap & excluded) set
+
+The same index is used by the scraper's tag filters and by filter_by_tags for result DataFrames.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MATCH_TYPES = ("any", "all", "exact")
+
+
+class TagIndex:
+    """Tag dictionary (lowercased tag -> integer id) that builds tag bitmaps for batches of properties."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}  #: lowercased tag -> id
+        self.tags: list[str] = []  #: id -> lowercased tag
+        self._raw_ids: dict[str, int] = {}  #: tag as scraped -> id, so each spelling is lowercased once
+        self._containing: dict[tuple, np.ndarray] = {}  #: substring query masks, keyed by (needles, vocabulary size)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    @property
+    def words(self) -> int:
+        """uint64 words per bitmap row for the current vocabulary."""
+        return max(1, (len(self.tags) + 63) // 64)
+
+    def tag_id(self, tag: str) -> int:
+        """Id of a tag, case-insensitively, adding it to the dictionary if it is new."""
+        tag_id = self._raw_ids.get(tag)
+        if tag_id is None:
+            lowered = tag.lower()
+            tag_id = self.ids.get(lowered)
+            if tag_id is None:
+                tag_id = self.ids[lowered] = len(self.tags)
+                self.tags.append(lowered)
+            self._raw_ids[tag] = tag_id
+        return tag_id
+
+    def _mask_from_ids(self, ids) -> np.ndarray:
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for tag_id in ids:
+            mask[tag_id >> 6] |= np.uint64(1) << np.uint64(tag_id & 63)
+        return mask
+
+    def query(self, tags: Iterable[str]) -> np.ndarray:
+        """Bitmask (words,) of a tag list, e.g. the tag_filters of a search."""
+        ids = [self.tag_id(tag) for tag in tags if isinstance(tag, str)]
+        return self._mask_from_ids(ids)
+
+    def containing(self, *needles: str) -> np.ndarray:
+        """Bitmask of every known tag that contains one of the (lowercase) substrings, e.g. containing("pool", "spa")."""
+        key = (needles, len(self.tags))
+        mask = self._containing.get(key)
+        if mask is None:
+            ids = [tag_id for tag_id, tag in enumerate(self.tags) if any(needle in tag for needle in needles)]
+            mask = self._containing[key] = self._mask_from_ids(ids)
+        return mask
+
+    def bitmap(self, tag_lists: Iterable) -> np.ndarray:
+        """
+        Tag bitmap of a batch of properties.
+
+        Args:
+            tag_lists: One tag list per property (None, NA or an empty list for properties without tags)
+
+        Returns:
+            uint64 array of shape (properties, words)
+        """
+        raw_ids = self._raw_ids
+        lengths, ids = [], []
+        for tags in tag_lists:
+            if not isinstance(tags, (list, tuple, np.ndarray)):
+                lengths.append(0)
+                continue
+            try:
+                row_ids = [raw_ids[tag] for tag in tags]  #: fast path, every spelling already known
+            except (KeyError, TypeError):
+                row_ids = [self.tag_id(tag) for tag in tags if isinstance(tag, str)]
+            lengths.append(len(row_ids))
+            ids.extend(row_ids)
+
+        bitmap = np.zeros((len(lengths), self.words), dtype=np.uint64)
+        if ids:
+            rows = np.repeat(np.arange(len(lengths)), lengths)
+            ids = np.asarray(ids, dtype=np.uint64)
+            bits = np.left_shift(np.uint64(1), ids & np.uint64(63))
+            np.bitwise_or.at(bitmap, (rows, (ids >> np.uint64(6)).astype(np.intp)), bits)
+        return bitmap
+
+    def fit(self, bitmap: np.ndarray) -> np.ndarray:
+        """Widen a bitmap built before the vocabulary grew to the current number of words."""
+        missing = self.words - bitmap.shape[1]
+        if missing <= 0:
+            return bitmap
+        return np.pad(bitmap, ((0, 0), (0, missing)))
+
+    def match(
+        self,
+        bitmap: np.ndarray,
+        tags: Optional[List[str]] = None,
+        match_type: str = "any",
+        exclude: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """
+        Rows of a bitmap that pass a tag filter.
+
+        Args:
+            bitmap: Result of bitmap()
+            tags: Tags to match (case-insensitive); None or empty keeps every row not excluded
+            match_type: "any", "all" or "exact" (any other value matches nothing, as in the scraper)
+            exclude: Tags that remove a row when present
+
+        Returns:
+            numpy bool array, one entry per row
+        """
+        include = self.query(tags) if tags else None
+        excluded = self.query(exclude) if exclude else None
+        bitmap = self.fit(bitmap)
+
+        keep = np.ones(len(bitmap), dtype=bool)
+        if excluded is not None:
+            keep &= ~(bitmap & excluded).any(axis=1)
+
+        if include is None:
+            return keep
+        if match_type == "any":
+            keep &= (bitmap & include).any(axis=1)
+        elif match_type == "all":
+            keep &= ((bitmap & include) == include).all(axis=1)
+        elif match_type == "exact":
+            keep &= (bitmap == include).all(axis=1)
+        else:
+            keep[:] = False
+        return keep
+
+    def has_any(self, bitmap: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Rows of a bitmap with at least one tag of a query mask (e.g. from containing())."""
+        return (self.fit(bitmap) & mask).any(axis=1)
+
+
+def filter_by_tags(
+    df: pd.DataFrame,
+    tags: Optional[List[str]] = None,
+    match_type: str = "any",
+    exclude: Optional[List[str]] = None,
+    index: Optional[TagIndex] = None,
+) -> pd.DataFrame:
+    """
+    Filter a result DataFrame by its tags column, with the same matching as the tag_filters search parameters.
+
+    Args:
+        df: DataFrame with a 'tags' column of tag lists
+        tags: Tags to match (case-insensitive)
+        match_type: "any" (has at least one tag), "all" (has all tags) or "exact" (tags exactly match)
+        exclude: Tags to exclude
+        index: TagIndex to reuse across calls (a new one is built otherwise)
+
+    Returns:
+        Filtered DataFrame
+    """
+    if df.empty or 'tags' not in df.columns or (not tags and not exclude):
+        return df
+    if match_type not in MATCH_TYPES:
+        raise ValueError(f"match_type must be one of {', '.join(MATCH_TYPES)}, got '{match_type}'")
+
+    index = index or TagIndex()
+    keep = index.match(index.bitmap(df['tags'].tolist()), tags, match_type, exclude)
+    return df[keep].reset_index(drop=True)
@@ -3,8 +3,11 @@ Tag utilities for enhanced tag filtering and discovery.
 
 Provides tag categorization, aliases, and discovery functions.
 """
-from typing import List, Dict, Set, Optional
+from typing import Iterable, List, Dict, Set, Optional, Tuple
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+import numpy as np
 
 
 # Tag categories for better organization
@@ -234,10 +237,100 @@ def discover_tags(properties_data) -> Dict[str, any]:
     }
 
 
+class TagMatcher:
+    """
+    Fuzzy tag matching over a fixed vocabulary (the category tags, the aliases and their targets).
+
+    The vocabulary is built once, with a character-count index: one row of per-character counts for every tag.
+    SequenceMatcher.ratio() is at most 2 * (characters the two strings have in common) / (total length), the bound
+    difflib's quick_ratio() uses. The index computes that bound for every tag at once, from the columns of the search
+    term's characters only. The exact ratio is then computed only for tags whose bound reaches the threshold, so the
+    result is the same as scoring every tag. Results are memoized per (search term, threshold).
+    """
+
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None, aliases: Optional[Dict[str, str]] = None,
+                 cache_size: int = 4096):
+        self._categories = TAG_CATEGORIES if categories is None else categories
+        self._aliases = TAG_ALIASES if aliases is None else aliases
+        self._extra: Dict[str, None] = {}  #: tags added with add_tags
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-read the categories and aliases (after editing them) and rebuild the index."""
+        vocabulary: Dict[str, None] = {}
+        for category_tags in self._categories.values():
+            vocabulary.update(dict.fromkeys(category_tags))
+        vocabulary.update(dict.fromkeys(self._aliases.keys()))
+        vocabulary.update(dict.fromkeys(self._aliases.values()))
+        vocabulary.update(self._extra)
+        self.vocabulary: List[str] = list(vocabulary)
+
+        self._columns: Dict[str, int] = {}  #: character -> column of the count matrix
+        for tag in self.vocabulary:
+            for char in tag:
+                self._columns.setdefault(char, len(self._columns))
+        counts = np.zeros((len(self.vocabulary), len(self._columns)), dtype=np.int32)
+        for row, tag in enumerate(self.vocabulary):
+            for char in tag:
+                counts[row, self._columns[char]] += 1
+        self._counts = counts
+        self._lengths = np.array([len(tag) for tag in self.vocabulary], dtype=np.int64)
+        self._cached_match.cache_clear()
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        """Add tags to the vocabulary, e.g. discover_tags(df)["all_tags"] from your own data."""
+        new = [tag for tag in tags if isinstance(tag, str) and tag and tag not in self._extra]
+        if new:
+            self._extra.update(dict.fromkeys(new))
+            self.rebuild()
+
+    def _candidates(self, term: str, threshold: float) -> np.ndarray:
+        """Rows of the vocabulary whose ratio upper bound reaches threshold, in vocabulary order."""
+        common = np.zeros(len(self.vocabulary), dtype=np.int64)
+        for char in set(term):
+            column = self._columns.get(char)
+            if column is not None:
+                common += np.minimum(self._counts[:, column], term.count(char))
+        total = self._lengths + len(term)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(total > 0, 2.0 * common / total, 1.0)
+        return np.flatnonzero(bound >= threshold)
+
+    def _match(self, term: str, threshold: float) -> Tuple[Tuple[str, float], ...]:
+        if term in self._aliases:
+            return ((self._aliases[term], 1.0),)
+
+        matches = []
+        for row in self._candidates(term, threshold):
+            tag = self.vocabulary[row]
+            ratio = SequenceMatcher(None, term, tag).ratio()
+            if ratio >= threshold:
+                # If it's an alias, return the actual tag
+                matches.append((self._aliases.get(tag, tag), ratio))
+
+        # Highest score first; each actual tag once, with its highest score
+        matches.sort(key=lambda x: x[1], reverse=True)
+        best: Dict[str, float] = {}
+        for tag, score in matches:
+            best.setdefault(tag, score)
+        return tuple(best.items())
+
+    def match(self, search_term: str, threshold: float = 0.6) -> List[tuple]:
+        """fuzzy_match_tag against this matcher's vocabulary."""
+        return list(self._cached_match(search_term.lower().strip().replace(" ", "_"), threshold))
+
+
+#: The matcher fuzzy_match_tag uses. Call TAG_MATCHER.rebuild() after editing TAG_CATEGORIES or TAG_ALIASES.
+TAG_MATCHER = TagMatcher()
+
+
 def fuzzy_match_tag(search_term: str, threshold: float = 0.6) -> List[tuple]:
     """
     Find tags that fuzzy match a search term.
 
+    Matching uses TAG_MATCHER, which indexes the tags once and memoizes results (see TagMatcher).
+
     Args:
         search_term: The term to search for
         threshold: Minimum similarity ratio (0.0 to 1.0)
@@ -245,42 +338,7 @@ def fuzzy_match_tag(search_term: str, threshold: float = 0.6) -> List[tuple]:
     Returns:
         List of (tag, similarity_score) tuples, sorted by score
     """
-    search_lower = search_term.lower().strip().replace(" ", "_")
-
-    # First check for exact alias match
-    if search_lower in TAG_ALIASES:
-        return [(TAG_ALIASES[search_lower], 1.0)]
-
-    # Collect all possible tags (from categories)
-    all_tags = set()
-    for category_tags in TAG_CATEGORIES.values():
-        all_tags.update(category_tags)
-
-    # Add all aliases
-    all_tags.update(TAG_ALIASES.keys())
-    all_tags.update(TAG_ALIASES.values())
-
-    # Calculate similarity scores
-    matches = []
-    for tag in all_tags:
-        ratio = SequenceMatcher(None, search_lower, tag).ratio()
-        if ratio >= threshold:
-            # If it's an alias, return the actual tag
-            actual_tag = TAG_ALIASES.get(tag, tag)
-            matches.append((actual_tag, ratio))
-
-    # Sort by similarity score (highest first)
-    matches.sort(key=lambda x: x[1], reverse=True)
-
-    # Remove duplicates (keep highest score)
-    seen = set()
-    unique_matches = []
-    for tag, score in matches:
-        if tag not in seen:
-            seen.add(tag)
-            unique_matches.append((tag, score))
-
-    return unique_matches
+    return TAG_MATCHER.match(search_term, threshold)
 
 
 def expand_tag_search(tags: List[str], use_aliases: bool = True, use_fuzzy: bool = False,
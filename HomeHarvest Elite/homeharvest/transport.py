@@ -0,0 +1,215 @@
+"""
+Pluggable HTTP transports for Scraper.session.
+
+Transports are requests adapters, mounted with Scraper.mount_transport() or the use_transport() context manager:
+
+- RecordingAdapter: forwards requests to the real transport and saves every response to a FixtureStore
+- ReplayAdapter: answers requests from a FixtureStore without touching the network
+- RedirectAdapter: sends realtor.com traffic to another base URL, e.g. the local stand-in from homeharvest.stub_server
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .core.scrapers import Scraper
+
+
+#: header carrying the pre-redirect URL, so a stand-in server can look up fixtures recorded against realtor.com
+ORIGINAL_URL_HEADER = "X-HomeHarvest-Original-Url"
+
+
+class FixtureMissing(requests.exceptions.ConnectionError):
+    """Raised by ReplayAdapter when no recorded response matches a request."""
+
+
+def canonical_url(url: str) -> str:
+    """URL with its query parameters sorted, so parameter order never changes a fixture key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def canonical_body(body) -> str:
+    """Request body as text, with JSON bodies re-serialized with sorted keys."""
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    """Stable fixture key for a request. Headers are ignored."""
+    raw = "\n".join([method.upper(), canonical_url(url), canonical_body(body)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Directory of gzip-compressed JSON fixtures, one file per distinct request.
+
+    Each fixture holds the request (method, url, body) and the response (status, headers, body).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json.gz")
+
+    def save(self, method: str, url: str, body, status: int, headers: Dict[str, str], content: bytes) -> str:
+        key = request_key(method, url, body)
+        fixture = {
+            "request": {"method": method.upper(), "url": canonical_url(url), "body": canonical_body(body)},
+            "response": {
+                "status": status,
+                "headers": dict(headers),
+                "body": base64.b64encode(content or b"").decode("ascii"),
+            },
+        }
+        encoded = gzip.compress(json.dumps(fixture).encode("utf-8"))
+
+        #: write to a temp file and rename, so concurrent readers never see a partial fixture
+        tmp_file = f"{self._file(key)}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_file, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_file, self._file(key))
+        return key
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with gzip.open(self._file(key), "rb") as f:
+                fixture = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        fixture["response"]["body"] = base64.b64decode(fixture["response"]["body"])
+        return fixture
+
+    def lookup(self, method: str, url: str, body=None) -> Optional[dict]:
+        return self.load(request_key(method, url, body))
+
+    def keys(self) -> List[str]:
+        return sorted(name[: -len(".json.gz")] for name in os.listdir(self.path) if name.endswith(".json.gz"))
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def iter_fixtures(self) -> Iterator[dict]:
+        for key in self.keys():
+            fixture = self.load(key)
+            if fixture is not None:
+                yield fixture
+
+    def search_results(self) -> List[dict]:
+        """All listings from recorded home_search responses, in recorded offset order, deduplicated by property_id."""
+        pages = []
+        for fixture in self.iter_fixtures():
+            try:
+                payload = json.loads(fixture["response"]["body"])
+                request_body = json.loads(fixture["request"]["body"] or "{}")
+                results = payload["data"]["home_search"]["results"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            offset = (request_body.get("variables") or {}).get("offset", 0)
+            pages.append((offset, results))
+
+        seen = set()
+        listings = []
+        for offset, results in sorted(pages, key=lambda page: page[0]):
+            for result in results:
+                if result.get("property_id") not in seen:
+                    seen.add(result.get("property_id"))
+                    listings.append(result)
+        return listings
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Dict[str, str], content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.headers.pop("Content-Encoding", None)  #: bodies are stored decoded
+    response._content = content
+    response.url = request.url
+    response.request = request
+    response.encoding = "utf-8"
+    response.reason = requests.status_codes._codes.get(status, [""])[0].upper().replace("_", " ")
+    return response
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests through `inner` (the production retrying adapter by default) and records each response."""
+
+    def __init__(self, store: FixtureStore, inner: BaseAdapter = None):
+        super().__init__()
+        self.store = store
+        self.inner = inner or HTTPAdapter(max_retries=Scraper.default_retries())
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        url = request.headers.get(ORIGINAL_URL_HEADER, request.url)
+        self.store.save(request.method, url, request.body, response.status_code, response.headers, response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a FixtureStore. Unknown requests raise FixtureMissing."""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        fixture = self.store.lookup(request.method, request.url, request.body)
+        if fixture is None:
+            raise FixtureMissing(f"No recorded response for {request.method} {request.url}", request=request)
+
+        recorded = fixture["response"]
+        return build_response(request, recorded["status"], recorded["headers"], recorded["body"])
+
+    def close(self):
+        pass
+
+
+class RedirectAdapter(HTTPAdapter):
+    """Rewrites every request to `base_url` (keeping path and query) and tags it with the original URL."""
+
+    def __init__(self, base_url: str, max_retries=None, **kwargs):
+        super().__init__(max_retries=max_retries if max_retries is not None else Scraper.default_retries(), **kwargs)
+        self.base_url = urlsplit(base_url)
+
+    def send(self, request, **kwargs):
+        original = urlsplit(request.url)
+        request.headers[ORIGINAL_URL_HEADER] = request.url
+        request.url = urlunsplit((self.base_url.scheme, self.base_url.netloc, original.path, original.query, ""))
+        return super().send(request, **kwargs)
+
+
+@contextmanager
+def use_transport(adapter: BaseAdapter):
+    """Mount `adapter` on Scraper.session for the duration of the block, then restore the previous transport."""
+    previous = Scraper.mount_transport(adapter)
+    try:
+        yield adapter
+    finally:
+        session = Scraper.get_session()
+        for prefix, previous_adapter in previous.items():
+            if previous_adapter is not None:
+                session.mount(prefix, previous_adapter)
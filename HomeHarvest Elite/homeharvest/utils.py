@@ -3,6 +3,7 @@ import pandas as pd
 import warnings
 from datetime import datetime
 from .core.scrapers.models import Property, ListingType, Advertisers
+from .data_cleaning import clean_columns
 from .exceptions import InvalidListingType, InvalidDate
 
 ordered_properties = [
@@ -76,7 +77,8 @@ ordered_properties = [
 ]
 
 
-def process_result(result: Property) -> pd.DataFrame:
+def property_row(result: Property) -> dict:
+    """Flatten a Property into the column values of its result row (keys beyond ordered_properties are ignored)."""
     prop_data = {prop: None for prop in ordered_properties}
     prop_data.update(result.model_dump())
 
@@ -152,12 +154,116 @@ def process_result(result: Property) -> pd.DataFrame:
         prop_data["stories"] = description.stories
         prop_data["text"] = description.text
 
-    properties_df = pd.DataFrame([prop_data])
+    return prop_data
+
+
+def process_result(result: Property) -> pd.DataFrame:
+    properties_df = pd.DataFrame([property_row(result)])
     properties_df = properties_df.reindex(columns=ordered_properties)
 
     return properties_df[ordered_properties]
 
 
+def concat_property_frames(properties_dfs: list[pd.DataFrame]) -> pd.DataFrame:
+    """Stack the one-row frames from process_result into the result DataFrame, with empty values as pd.NA."""
+    if not properties_dfs:
+        return pd.DataFrame()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=FutureWarning)
+
+        return pd.concat(properties_dfs, ignore_index=True, axis=0)[ordered_properties].replace(
+            {"None": pd.NA, None: pd.NA, "": pd.NA}
+        )
+
+
+#: {(value kind, ...): dtype} resolved once per combination of kinds by _stacked_dtype
+_stacked_dtypes: dict = {}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _value_kinds(values: list) -> dict | None:
+    """{kind: representative value} for one column, or None when a value needs the per-row concat to type it."""
+    types = set(map(type, values))
+    if int in types and any(not _INT64_MIN <= v <= _INT64_MAX for v in values if type(v) is int):
+        return None
+    if datetime in types and len({v.tzinfo for v in values if type(v) is datetime}) > 1:
+        return None
+
+    representatives = {}
+    for kind in types:
+        representatives[kind] = next(v for v in values if type(v) is kind)
+    if float in types:
+        #: a NaN one-row frame is all-NA, which concat types differently from a frame holding a number
+        numbers = [v for v in values if type(v) is float]
+        if any(v != v for v in numbers):
+            representatives["nan"] = float("nan")
+            finite = next((v for v in numbers if v == v), None)
+            if finite is None:
+                del representatives[float]
+            else:
+                representatives[float] = finite
+    return representatives
+
+
+def _stacked_dtype(representatives: dict):
+    """The dtype pd.concat gives one-row frames holding these values, resolved by concatenating one of each."""
+    key = tuple(sorted(map(str, representatives)))
+    dtype = _stacked_dtypes.get(key)
+    if dtype is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=FutureWarning)
+            frames = [pd.DataFrame([{"column": value}]) for value in representatives.values()]
+            dtype = _stacked_dtypes[key] = pd.concat(frames, ignore_index=True)["column"].dtype
+    return dtype
+
+
+def _is_empty_value(value) -> bool:
+    """What concat_property_frames replaces with pd.NA: None, NaN, "None" and ""."""
+    if value is None:
+        return True
+    if type(value) is str:
+        return value == "" or value == "None"
+    return type(value) is float and value != value
+
+
+def _stacked_column(values: list) -> pd.Series:
+    """The column concat_property_frames would build from one-row frames holding `values`, without the frames."""
+    representatives = _value_kinds(values)
+    if representatives is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=FutureWarning)
+            column = pd.concat([pd.DataFrame([{"column": value}]) for value in values], ignore_index=True)["column"]
+        return column.replace({"None": pd.NA, None: pd.NA, "": pd.NA}).rename(None)
+
+    dtype = _stacked_dtype(representatives)
+    if dtype == object:
+        return pd.Series([pd.NA if _is_empty_value(value) else value for value in values], dtype=object)
+    return pd.Series(values, dtype=dtype)
+
+
+def build_property_frame(results: list[Property], clean: bool = False, add_derived_fields: bool = True) -> pd.DataFrame:
+    """
+    Assemble the result DataFrame column by column, without a one-row frame per property.
+
+    Equal to concat_property_frames([process_result(r) for r in results]) (then clean_dataframe when clean=True), but
+    each column is typed once and cleaned while it is assembled, with price_per_sqft derived from the cleaned columns.
+    """
+    if not results:
+        return pd.DataFrame()
+
+    return pd.DataFrame(property_columns(results, clean=clean, add_derived_fields=add_derived_fields))
+
+
+def property_columns(results: list[Property], clean: bool = False, add_derived_fields: bool = True) -> dict:
+    """{column name: Series} for the result columns, in ordered_properties order (the arrays build_property_frame wraps)."""
+    rows = [property_row(result) for result in results]
+    columns = {name: _stacked_column([row[name] for row in rows]) for name in ordered_properties}
+    if clean:
+        clean_columns(columns, add_derived_fields=add_derived_fields)
+    return columns
+
+
 def validate_input(listing_type: str | list[str] | None) -> None:
     if listing_type is None:
         return  # None is valid - returns all types
@@ -321,8 +427,15 @@ def validate_filters(
             raise ValueError(f"{name}_min ({min_val}) cannot be greater than {name}_max ({max_val}).")
 
 
-def validate_sort(sort_by: str | list[str] | None, sort_direction: str | list[str] | None = "desc") -> None:
+def validate_sort(sort_by: str | list[str] | None, sort_direction: str | list[str] | None = "desc",
+                  top_k: int | None = None) -> None:
     """Validate sort parameters."""
+    if top_k is not None:
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+            raise ValueError(f"top_k must be a positive integer, got {top_k!r}.")
+        if not sort_by:
+            raise ValueError("top_k requires sort_by: the top results are the best by the sort field(s).")
+
     valid_sort_fields = [
         "list_date", "sold_date", "pending_date", "last_sold_date", "last_update_date",
         "list_price", "sold_price", "price_per_sqft", "sqft", "lot_sqft",
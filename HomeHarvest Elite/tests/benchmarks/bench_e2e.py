@@ -0,0 +1,110 @@
+"""
+End-to-end scrape_property throughput and latency against the local realtor stand-in server.
+
+Sweeps parallel/sequential pagination, extra_property_data, RealtorScraper.NUM_PROPERTY_WORKERS and
+RealtorScraper.NUM_PAGE_WORKERS, and reports pages/sec, properties/sec, p50/p95 latency, request counts and peak RSS.
+
+    python -m tests.benchmarks.bench_e2e --sizes 2000 --latency 0.05
+    python -m tests.benchmarks.bench_e2e --property-workers 1 5 20 40 --page-workers 2 4 8 16 --save e2e.json
+"""
+import itertools
+import sys
+import time
+
+from urllib3.util.retry import Retry
+
+from homeharvest import scrape_property
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+
+from .harness import BenchmarkRun, argument_parser, finish, peak_rss_mb, percentile
+
+DEFAULT_SIZES = [2_000]
+
+
+def run_config(server: RealtorStubServer, size: int, repeat: int, parallel: bool, extra_property_data: bool) -> dict:
+    server.reset_counts()
+    latencies = []
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = scrape_property(
+            location="Phoenix, AZ",
+            limit=size,
+            parallel=parallel,
+            extra_property_data=extra_property_data,
+            coalesce=False,
+        )
+        latencies.append(time.perf_counter() - t0)
+        rows += len(df)
+
+    elapsed = sum(latencies)
+    pages = server.request_counts["search"]
+    return {
+        "rounds": repeat,
+        "min": min(latencies),
+        "median": percentile(latencies, 50),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "mean": elapsed / repeat,
+        "max": max(latencies),
+        "pages_per_sec": pages / elapsed,
+        "properties_per_sec": rows / elapsed,
+        "requests": dict(server.request_counts),
+        "statuses": {str(status): count for status, count in server.status_counts.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_suite(run: BenchmarkRun, size: int, args) -> None:
+    dataset = generate_results(size, seed=args.seed, status="for_sale")
+    pool_size = max([10] + [workers or 0 for workers in args.page_workers]) + 2
+    retries = Retry(total=3, backoff_factor=0, status_forcelist=[429, 403], allowed_methods=frozenset(["GET", "POST"]))
+
+    with RealtorStubServer(dataset=dataset, latency=args.latency) as server:
+        with use_transport(RedirectAdapter(server.url, max_retries=retries, pool_maxsize=pool_size)):
+            print(f"[{size} records, {args.latency * 1000:.0f} ms server latency]", flush=True)
+
+            for parallel, extra, property_workers in itertools.product(
+                [True, False], [True, False], args.property_workers
+            ):
+                for page_workers in args.page_workers if parallel else [None]:
+                    mode = f"parallel.pg{page_workers}" if parallel else "sequential"
+                    name = f"e2e.{mode}.{'extra' if extra else 'basic'}.pw{property_workers}"
+                    if not run.selected(name):
+                        continue
+
+                    RealtorScraper.NUM_PROPERTY_WORKERS = property_workers
+                    RealtorScraper.NUM_PAGE_WORKERS = page_workers
+                    stats = run_config(server, size, args.repeat, parallel, extra)
+                    run.record(name, size, stats)
+                    print(
+                        f"  {name:<40} p50 {stats['p50'] * 1000:9.1f} ms  p95 {stats['p95'] * 1000:9.1f} ms  "
+                        f"{stats['pages_per_sec']:7.1f} pages/s  {stats['properties_per_sec']:8.1f} props/s  "
+                        f"requests {stats['requests']}  peak RSS {stats['peak_rss_mb']:.0f} MB",
+                        flush=True,
+                    )
+
+
+def main(argv=None) -> int:
+    parser = argument_parser(__doc__.strip().splitlines()[0], DEFAULT_SIZES)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub server latency per request (seconds)")
+    parser.add_argument("--repeat", type=int, default=3, help="scrape_property calls per configuration")
+    parser.add_argument("--property-workers", type=int, nargs="+", default=[5, 20], help="NUM_PROPERTY_WORKERS values")
+    parser.add_argument("--page-workers", type=int, nargs="+", default=[4, 16], help="NUM_PAGE_WORKERS values")
+    args = parser.parse_args(argv)
+
+    defaults = RealtorScraper.NUM_PROPERTY_WORKERS, RealtorScraper.NUM_PAGE_WORKERS
+    run = BenchmarkRun("e2e", only=args.only)
+    try:
+        for size in args.sizes:
+            run_suite(run, size, args)
+    finally:
+        RealtorScraper.NUM_PROPERTY_WORKERS, RealtorScraper.NUM_PAGE_WORKERS = defaults
+    return finish(run, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
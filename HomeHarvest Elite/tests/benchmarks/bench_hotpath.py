@@ -0,0 +1,78 @@
+"""
+Micro-benchmarks for the parse -> process -> DataFrame -> clean -> sort hot path, on synthetic records.
+
+build_property_frame is the fused assembly scrape_property uses; process_result + concat_property_frames +
+clean_dataframe is the per-row path it replaces.
+
+    python -m tests.benchmarks.bench_hotpath                       # 1k / 10k / 100k
+    python -m tests.benchmarks.bench_hotpath --sizes 1000 --only clean_dataframe sort_properties
+    python -m tests.benchmarks.bench_hotpath --save tests/benchmarks/baselines/hotpath.json
+    python -m tests.benchmarks.bench_hotpath --compare tests/benchmarks/baselines/hotpath.json
+"""
+import sys
+
+from homeharvest.core.scrapers.realtor.parsers import calculate_days_on_mls, parse_address, parse_description
+from homeharvest.core.scrapers.realtor.processors import get_key, process_extra_property_details, process_property
+from homeharvest.data_cleaning import clean_dataframe
+from homeharvest.sorting import sort_properties
+from homeharvest.tag_utils import TAG_MATCHER, expand_tag_search
+from homeharvest.synthetic import generate_results
+from homeharvest.utils import build_property_frame, concat_property_frames, process_result
+
+from .harness import BenchmarkRun, argument_parser, finish
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+#: misspelled tag_filters, expanded with tag_use_fuzzy=True
+FUZZY_TAGS = ["swiming pool", "firepalce", "mountian view", "gated comunity"]
+
+
+def _process_all(records):
+    return [
+        process_property(result, False, True, False, None, get_key, process_extra_property_details)
+        for result in records
+    ]
+
+
+def run_suite(run: BenchmarkRun, size: int, seed: int = 0) -> None:
+    print(f"[{size} records]", flush=True)
+    records = generate_results(size, seed=seed)
+
+    run.bench("parse_description", size, lambda: [parse_description(result) for result in records])
+    run.bench("parse_address", size, lambda: [parse_address(result, "general_search") for result in records])
+    run.bench("calculate_days_on_mls", size, lambda: [calculate_days_on_mls(result) for result in records])
+    run.bench("process_property", size, lambda: _process_all(records))
+
+    properties = [prop for prop in _process_all(records) if prop]
+    run.bench("process_result", size, lambda: [process_result(prop) for prop in properties])
+
+    frames = [process_result(prop) for prop in properties]
+    run.bench("concat_property_frames", size, lambda: concat_property_frames(frames))
+
+    df = concat_property_frames(frames)
+    del frames
+    run.bench("clean_dataframe", size, lambda: clean_dataframe(df))
+    run.bench("build_property_frame", size, lambda: build_property_frame(properties))
+    run.bench("build_property_frame.clean", size, lambda: build_property_frame(properties, clean=True))
+
+    cleaned = clean_dataframe(df)
+    run.bench("sort_properties.list_price", size, lambda: sort_properties(cleaned, "list_price"))
+    run.bench("sort_properties.multi", size, lambda: sort_properties(cleaned, ["beds", "list_price"], ["desc", "asc"]))
+    run.bench("sort_properties.calculated", size, lambda: sort_properties(cleaned, "value_per_sqft"))
+
+    # Tag expansion does not depend on the record count; cold rebuilds TAG_MATCHER (untimed) before each round
+    run.bench("expand_tag_search.fuzzy.cold", size, lambda _: expand_tag_search(FUZZY_TAGS, use_fuzzy=True),
+              setup=TAG_MATCHER.rebuild)
+    run.bench("expand_tag_search.fuzzy.warm", size, lambda: expand_tag_search(FUZZY_TAGS, use_fuzzy=True))
+
+
+def main(argv=None) -> int:
+    args = argument_parser(__doc__.strip().splitlines()[0], DEFAULT_SIZES).parse_args(argv)
+    run = BenchmarkRun("hotpath", only=args.only)
+    for size in args.sizes:
+        run_suite(run, size, seed=args.seed)
+    return finish(run, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
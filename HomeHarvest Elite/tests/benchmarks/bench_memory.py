@@ -0,0 +1,140 @@
+"""
+Per-stage memory footprint of a large scrape, with budgets.
+
+Replays the pandas path of scrape_property on synthetic records, keeping every intermediate alive the way
+scrape_property does (raw dicts -> Property models -> one-row frames -> concatenated frame -> cleaned frame -> sorted
+frame). For each stage it reports the tracemalloc peak while the stage runs, the memory the stage's output retains,
+the total live heap and process RSS. Budgets are MB per 1,000 records, so one file covers every size.
+
+    python -m tests.benchmarks.bench_memory --sizes 10000
+    python -m tests.benchmarks.bench_memory --budgets tests/benchmarks/memory_budgets.json --budget clean_dataframe.peak=20
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+from homeharvest.core.scrapers.realtor.processors import get_key, process_extra_property_details, process_property
+from homeharvest.data_cleaning import clean_dataframe
+from homeharvest.schema import compact_dataframe
+from homeharvest.sorting import sort_properties
+from homeharvest.synthetic import generate_results
+from homeharvest.utils import build_property_frame, concat_property_frames, process_result
+
+from .harness import BenchmarkRun, argument_parser, current_rss_mb, finish, peak_rss_mb
+
+DEFAULT_SIZES = [10_000]
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(__file__), "memory_budgets.json")
+MB = 1024 * 1024
+
+
+def measure_stage(fn: Callable[[], object]) -> tuple[object, dict]:
+    """Run one stage under tracemalloc. Returns (output, stats in MB)."""
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    output = fn()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return output, {
+        "peak_mb": (peak - before) / MB,
+        "retained_mb": (current - before) / MB,
+        "live_mb": current / MB,
+        "rss_mb": current_rss_mb(),
+    }
+
+
+def stages(size: int, seed: int) -> List[tuple[str, Callable[[dict], object]]]:
+    """(name, fn(outputs so far) -> output) in scrape_property order."""
+    return [
+        ("raw_results", lambda out: generate_results(size, seed=seed)),
+        ("process_property", lambda out: [
+            prop for prop in (
+                process_property(result, False, True, False, None, get_key, process_extra_property_details)
+                for result in out["raw_results"]
+            ) if prop
+        ]),
+        ("process_result", lambda out: [process_result(prop) for prop in out["process_property"]]),
+        ("concat_property_frames", lambda out: concat_property_frames(out["process_result"])),
+        ("clean_dataframe", lambda out: clean_dataframe(out["concat_property_frames"])),
+        ("sort_properties", lambda out: sort_properties(out["clean_dataframe"], "list_price")),
+        #: the fused path scrape_property takes (Property models -> cleaned frame), measured on top of the above
+        ("build_property_frame", lambda out: build_property_frame(out["process_property"], clean=True)),
+        ("compact_dataframe", lambda out: compact_dataframe(out["build_property_frame"])),
+    ]
+
+
+def parse_budgets(path: str | None, overrides: List[str] | None) -> Dict[str, float]:
+    """Budgets as {"<stage>.<peak|retained|live>": MB per 1k records}, from a JSON file plus stage.metric=value overrides."""
+    budgets = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            budgets.update(json.load(f))
+    for override in overrides or []:
+        key, _, value = override.partition("=")
+        budgets[key] = float(value)
+    return budgets
+
+
+def check_budgets(run: BenchmarkRun, budgets: Dict[str, float]) -> List[str]:
+    violations = []
+    for name, entry in run.results.items():
+        stage = name.split("[")[0].replace("memory.", "")
+        for metric in ("peak", "retained", "live"):
+            limit = budgets.get(f"{stage}.{metric}")
+            if limit is None:
+                continue
+            per_1k = entry[f"{metric}_mb"] / entry["size"] * 1000
+            if per_1k > limit:
+                violations.append(f"{name} {metric}: {per_1k:.1f} MB/1k records > budget {limit:.1f}")
+    return violations
+
+
+def run_suite(run: BenchmarkRun, size: int, seed: int = 0) -> None:
+    print(f"[{size} records]", flush=True)
+    outputs = {}
+    tracemalloc.start()
+    try:
+        for name, fn in stages(size, seed):
+            #: every stage runs (later stages need earlier outputs); --only just limits what is reported
+            outputs[name], stats = measure_stage(lambda: fn(outputs))
+            if not run.selected(name):
+                continue
+            entry = run.record(f"memory.{name}", size, stats)
+            print(
+                f"  {name:<24} peak {entry['peak_mb']:9.1f} MB  retained {entry['retained_mb']:9.1f} MB  "
+                f"live {entry['live_mb']:9.1f} MB  rss {entry['rss_mb']:8.1f} MB",
+                flush=True,
+            )
+    finally:
+        tracemalloc.stop()
+        outputs.clear()
+        gc.collect()
+    print(f"  peak RSS so far: {peak_rss_mb():.0f} MB")
+
+
+def main(argv=None) -> int:
+    parser = argument_parser(__doc__.strip().splitlines()[0], DEFAULT_SIZES)
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="JSON file of MB-per-1k-record budgets")
+    parser.add_argument("--budget", action="append", metavar="STAGE.METRIC=MB", help="override one budget")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("memory", only=args.only)
+    for size in args.sizes:
+        run_suite(run, size, seed=args.seed)
+
+    exit_code = finish(run, args, metric="peak_mb")
+
+    violations = check_budgets(run, parse_budgets(args.budgets, args.budget))
+    if violations:
+        print(f"{len(violations)} memory budget violation(s):", file=sys.stderr)
+        for line in violations:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
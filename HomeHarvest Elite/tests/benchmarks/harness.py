@@ -0,0 +1,173 @@
+"""
+Minimal benchmark harness: timing, JSON baselines and regression comparison.
+
+Baselines are machine-specific. Record one on the machine you compare on:
+
+    python -m tests.benchmarks.bench_hotpath --save tests/benchmarks/baselines/hotpath.json
+    python -m tests.benchmarks.bench_hotpath --compare tests/benchmarks/baselines/hotpath.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def machine_info() -> dict:
+    import numpy
+    import pandas
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (monotonic)."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  #: bytes on macOS, KiB on Linux
+
+
+def current_rss_mb() -> float:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.5, max_rounds: int = 7, setup: Callable[[], object] = None) -> dict:
+    """Time `fn` for at least one round and until `min_time` seconds or `max_rounds` rounds have elapsed.
+
+    `setup` runs before every round and is excluded from the timing; its return value is passed to fn.
+    """
+    timings = []
+    started = time.perf_counter()
+    while not timings or (time.perf_counter() - started < min_time and len(timings) < max_rounds):
+        arg = setup() if setup else None
+        gc.collect()
+        t0 = time.perf_counter()
+        if setup:
+            fn(arg)
+        else:
+            fn()
+        timings.append(time.perf_counter() - t0)
+
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+    }
+
+
+class BenchmarkRun:
+    """Collects named results ("<case>[<size>]") for one suite invocation."""
+
+    def __init__(self, suite: str, only: List[str] = None):
+        self.suite = suite
+        self.only = only
+        self.results: Dict[str, dict] = {}
+
+    def selected(self, name: str) -> bool:
+        return not self.only or any(pattern in name for pattern in self.only)
+
+    def record(self, name: str, size: int, stats: dict, **extra) -> dict:
+        entry = {"size": size, **stats, **extra}
+        if size and "median" in stats:
+            entry["per_record_us"] = stats["median"] / size * 1e6
+        self.results[f"{name}[{size}]"] = entry
+        return entry
+
+    def bench(self, name: str, size: int, fn: Callable, **kwargs) -> dict | None:
+        if not self.selected(name):
+            return None
+        entry = self.record(name, size, measure(fn, **kwargs))
+        print(f"  {name + f'[{size}]':<40} median {entry['median'] * 1000:10.2f} ms   "
+              f"{entry.get('per_record_us', 0):8.2f} us/record   ({entry['rounds']} rounds)", flush=True)
+        return entry
+
+    def to_dict(self) -> dict:
+        return {
+            "suite": self.suite,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": machine_info(),
+            "results": self.results,
+        }
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+        print(f"saved {len(self.results)} results to {path}")
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25, metric: str = "median") -> List[str]:
+    """Return a line per regression: cases whose `metric` grew more than `tolerance` (fraction) over the baseline."""
+    regressions = []
+    for name, entry in sorted(current.items()):
+        base = baseline.get(name)
+        if not base or metric not in base or metric not in entry or not base[metric]:
+            continue
+        ratio = entry[metric] / base[metric]
+        marker = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"  {name:<40} {base[metric]:12.4f} -> {entry[metric]:12.4f}  x{ratio:5.2f} {marker}")
+        if marker:
+            regressions.append(f"{name}: {base[metric]:.4f} -> {entry[metric]:.4f} (x{ratio:.2f})")
+    return regressions
+
+
+def argument_parser(description: str, default_sizes: List[int]) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_sizes, help="record counts to benchmark")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only cases whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (fraction)")
+    return parser
+
+
+def finish(run: BenchmarkRun, args: argparse.Namespace, metric: str = "median") -> int:
+    """Save and/or compare per the command line. Returns the process exit code."""
+    if args.save:
+        run.save(args.save)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"comparing against {args.compare} ({baseline.get('created_at')})")
+        regressions = compare(run.results, baseline["results"], args.tolerance, metric)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
@@ -0,0 +1,14 @@
+import pytest
+
+from homeharvest.core.scrapers import Scraper
+
+from .fakes import FakeSession
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    def install(**kwargs):
+        session = FakeSession(**kwargs)
+        monkeypatch.setattr(Scraper, "session", session)
+        return session
+    return install
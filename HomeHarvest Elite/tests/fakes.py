@@ -0,0 +1,69 @@
+"""
+Offline stand-ins for the realtor.com session used across the test suite.
+"""
+import json
+import time
+
+
+def make_result(i: int, **overrides) -> dict:
+    result = {
+        "property_id": str(1000 + i),
+        "href": f"https://www.realtor.com/realestateandhomes-detail/{1000 + i}",
+        "status": "for_sale",
+        "list_price": 200000 + i,
+        "list_price_min": None,
+        "list_price_max": None,
+        "list_date": "2025-01-01T00:00:00Z",
+        "flags": {"is_pending": False, "is_contingent": False},
+        "source": {"id": "MLS", "listing_id": str(i)},
+        "description": {"beds": 3, "sqft": 1500},
+        "location": {
+            "address": {"line": f"{i} Main St", "unit": None, "city": "Phoenix", "state_code": "AZ", "postal_code": "85001"},
+            "county": None,
+        },
+    }
+    result.update(overrides)
+    return result
+
+
+class FakeResponse:
+    status_code = 200
+    raw = None
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Offline stand-in for Scraper.session serving `results` (or `total` generated listings) 200 per page.
+
+    Pages whose offset is in `fail_offsets` raise a ConnectionError; `latency` seconds are added to every call.
+    """
+
+    def __init__(self, total: int = 0, results: list[dict] | None = None, fail_offsets=(), latency: float = 0):
+        self.results = results if results is not None else [make_result(i) for i in range(total)]
+        self.fail_offsets = set(fail_offsets)
+        self.latency = latency
+        self.autocomplete_calls = 0
+        self.search_offsets = []
+        self.proxies = {}
+
+    def get(self, url, params=None, **kwargs):
+        time.sleep(self.latency)
+        self.autocomplete_calls += 1
+        return FakeResponse({"autocomplete": [{"area_type": "city", "city": "Phoenix", "state_code": "AZ"}]})
+
+    def post(self, url, json=None, **kwargs):
+        time.sleep(self.latency)
+        offset = json["variables"]["offset"]
+        self.search_offsets.append(offset)
+        if offset in self.fail_offsets:
+            raise ConnectionError(f"page {offset} failed")
+        page = [dict(result) for result in self.results[offset:offset + 200]]
+        return FakeResponse(
+            {"data": {"home_search": {"total": len(self.results), "count": len(page), "results": page}}}
+        )
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+import homeharvest  # noqa: F401  (registers df.hh)
+from homeharvest.schema import compact_dataframe
+from homeharvest.sorting import add_calculated_sort_fields, get_best_deals
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+@pytest.fixture
+def frame():
+    df = build_property_frame(scraped_properties(2500), clean=True)
+    df["last_update_date"] = pd.to_datetime(df["last_update_date"], utc=True)
+    df["beds"] = df["beds"].round()  #: plenty of ties
+    return df
+
+
+def stable_sort(df, fields, directions, na_position="last"):
+    """sort_properties with a stable sort, the order df.hh keeps for ties."""
+    with_calc = add_calculated_sort_fields(df, fields)
+    ordered = with_calc.sort_values(fields, ascending=[d == "asc" for d in directions], na_position=na_position,
+                                    kind="stable")
+    return ordered[df.columns].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_sort_matches_stable_sort(frame, compact):
+    df = compact_dataframe(frame) if compact else frame
+    for fields, directions in [
+        (["list_price"], ["desc"]), (["beds", "sqft"], ["desc", "asc"]), (["last_update_date"], ["asc"]),
+        (["property_age", "list_price"], ["asc", "desc"]), (["city", "price_discount"], ["asc", "asc"]),
+    ]:
+        for na_position in ["last", "first"]:
+            expected = stable_sort(df, fields, directions, na_position)
+            pd.testing.assert_frame_equal(df.hh.sort(fields, directions, na_position), expected)
+            pd.testing.assert_frame_equal(df.hh.sort(fields, directions, na_position, top_k=30), expected.head(30))
+
+
+def test_helpers_match_module_functions(frame):
+    for criteria in ["price_discount", "price_per_sqft", "value_per_sqft"]:
+        expected = stable_sort(frame, [criteria], ["asc"]).head(10)
+        pd.testing.assert_frame_equal(frame.hh.best_deals(10, criteria), expected)
+        assert frame.hh.best_deals(10, criteria)[criteria if criteria in frame else "list_price"].tolist() == \
+            get_best_deals(frame, 10, criteria)[criteria if criteria in frame else "list_price"].tolist()
+
+    pd.testing.assert_frame_equal(frame.hh.newest(7), stable_sort(frame, ["list_date"], ["desc"]).head(7))
+    pd.testing.assert_frame_equal(frame.hh.price_drops(7), stable_sort(frame, ["last_update_date"], ["desc"]).head(7))
+    with pytest.raises(KeyError):
+        frame.hh.best_deals(5, "no_such_field")
+
+
+def test_permutations_are_cached_until_the_frame_changes(frame, monkeypatch):
+    order = frame.hh.order("price_discount", "asc")
+    assert frame.hh.order("price_discount", "asc") is order
+    assert "price_discount" not in frame.columns
+
+    calls = []
+    original = homeharvest.accessor.CALCULATED_FIELDS["price_discount"]
+    monkeypatch.setitem(homeharvest.accessor.CALCULATED_FIELDS, "price_discount",
+                        lambda df: calls.append(1) or original(df))
+    frame.hh.best_deals(3)
+    frame.hh.sort(["price_discount", "beds"], ["asc", "desc"])
+    assert calls == []
+
+    frame["beds"] = frame["beds"] + 1  #: not a price_discount column: the permutation stays
+    assert frame.hh.order("price_discount", "asc") is order
+    assert calls == []
+
+    frame["extra"] = 1  #: new column: the cache starts over
+    frame.hh.best_deals(3)
+    assert calls == [1]
+
+
+def test_values_edited_in_place_are_picked_up(frame):
+    df = frame.head(300).copy()
+    pd.testing.assert_frame_equal(df.hh.best_deals(5), stable_sort(df, ["price_discount"], ["asc"]).head(5))
+    pd.testing.assert_frame_equal(df.hh.sort("city", "asc"), stable_sort(df, ["city"], ["asc"]))
+
+    df["list_price"] = df["list_price"][::-1].to_numpy()  #: same shape, columns and dtype
+    df.loc[df.index[:40], "city"] = "Aaa"
+    df.loc[df.index[-1], "estimated_value"] = 10 ** 9
+
+    pd.testing.assert_frame_equal(df.hh.best_deals(5), stable_sort(df, ["price_discount"], ["asc"]).head(5))
+    pd.testing.assert_frame_equal(df.hh.sort("city", "asc"), stable_sort(df, ["city"], ["asc"]))
+    assert df.hh.best_deals(1)["property_id"].iloc[0] == df["property_id"].iloc[-1]
@@ -0,0 +1,161 @@
+import pandas as pd
+import pytest
+
+import homeharvest.agent_broker as agent_broker
+from homeharvest.agent_broker import (
+    agent_analytics, analyze_agent_specialization, extract_primary_phone, find_most_active_agents,
+    get_agent_activity, get_broker_activity, get_office_activity, get_wholesale_friendly_agents, normalize_contacts,
+)
+from homeharvest.schema import compact_dataframe
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def by_count(stats):
+    return stats.sort_values("listing_count", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def reference_agents(df):
+    """The separate groupby get_agent_activity used to run."""
+    stats = df.groupby("agent_name").agg({
+        "property_id": "count", "list_price": ["mean", "min", "max"], "agent_email": "first",
+        "agent_phones": "first", "agent_id": "first", "broker_name": "first", "office_name": "first",
+    }).reset_index()
+    stats.columns = ["agent_name", "listing_count", "avg_price", "min_price", "max_price", "agent_email",
+                     "agent_phones", "agent_id", "broker_name", "office_name"]
+    stats = by_count(stats)
+    stats["primary_phone"] = stats["agent_phones"].apply(extract_primary_phone)
+    return stats
+
+
+def reference_brokers(df):
+    stats = df.groupby("broker_name").agg({
+        "property_id": "count", "list_price": ["mean", "min", "max"], "broker_id": "first", "agent_name": "nunique",
+    }).reset_index()
+    stats.columns = ["broker_name", "listing_count", "avg_price", "min_price", "max_price", "broker_id",
+                     "unique_agents"]
+    return by_count(stats)
+
+
+def reference_offices(df):
+    stats = df.groupby("office_name").agg({
+        "property_id": "count", "list_price": ["mean", "min", "max"], "office_id": "first", "office_email": "first",
+        "office_phones": "first", "agent_name": "nunique",
+    }).reset_index()
+    stats.columns = ["office_name", "listing_count", "avg_price", "min_price", "max_price", "office_id",
+                     "office_email", "office_phones", "unique_agents"]
+    stats = by_count(stats)
+    stats["primary_phone"] = stats["office_phones"].apply(extract_primary_phone)
+    return stats
+
+
+def reference_specialization(df):
+    stats = df.groupby("agent_name").agg({
+        "property_id": "count", "list_price": ["mean", "median"], "agent_email": "first", "sqft": "mean",
+        "beds": "mean", "full_baths": "mean", "style": lambda x: x.mode()[0] if not x.mode().empty else None,
+    }).reset_index()
+    stats.columns = ["agent_name", "listing_count", "avg_price", "median_price", "agent_email", "avg_sqft",
+                     "avg_beds", "avg_baths", "common_style"]
+    stats = stats[["agent_name", "listing_count", "avg_price", "median_price", "avg_sqft", "avg_beds", "avg_baths",
+                   "common_style", "agent_email"]]
+
+    def categorize_price(price):
+        if pd.isna(price):
+            return "Unknown"
+        elif price < 200000:
+            return "Budget"
+        elif price < 500000:
+            return "Mid-Range"
+        elif price < 1000000:
+            return "Upper-Mid"
+        return "Luxury"
+
+    stats["price_category"] = stats["avg_price"].apply(categorize_price)
+    return by_count(stats)
+
+
+@pytest.fixture
+def frame():
+    df = build_property_frame(scraped_properties(1500), clean=True)
+    df.loc[::17, "list_price"] = None
+    df.loc[df["agent_name"] == df["agent_name"].iloc[0], "list_price"] = 150000.0  #: a Budget agent
+    return df
+
+
+def test_tables_match_separate_groupbys(frame):
+    pd.testing.assert_frame_equal(get_agent_activity(frame), reference_agents(frame))
+    pd.testing.assert_frame_equal(get_broker_activity(frame), reference_brokers(frame))
+    pd.testing.assert_frame_equal(get_office_activity(frame), reference_offices(frame))
+    specialization = analyze_agent_specialization(frame)
+    pd.testing.assert_frame_equal(specialization, reference_specialization(frame))
+    assert {"Budget", "Mid-Range"} <= set(specialization["price_category"])
+    pd.testing.assert_frame_equal(find_most_active_agents(frame, 5), reference_agents(frame).head(5))
+
+
+def test_compact_frame_groups_observed_names_only(frame):
+    compact = compact_dataframe(frame.head(300))
+    assert isinstance(compact["agent_name"].dtype, pd.CategoricalDtype)
+
+    agents = get_agent_activity(compact)
+    assert agents["listing_count"].tolist() == reference_agents(frame.head(300))["listing_count"].tolist()
+    assert (agents["listing_count"] > 0).all()
+
+
+def test_functions_read_the_current_values():
+    df = pd.DataFrame({"property_id": ["1", "2"], "agent_name": ["A", "A"], "list_price": [1.0, 3.0],
+                       "agent_email": None, "agent_phones": None, "agent_id": None, "broker_name": None,
+                       "broker_id": None, "office_name": None, "office_id": None, "office_email": None,
+                       "office_phones": None})
+    assert get_agent_activity(df)["avg_price"].tolist() == [2.0]
+
+    df["list_price"] = [10.0, 30.0]
+    assert get_agent_activity(df)["avg_price"].tolist() == [20.0]
+    df.loc[0, "agent_name"] = "B"
+    assert get_agent_activity(df)["listing_count"].tolist() == [1, 1]
+    assert agent_analytics(df).agents.set_index("agent_name")["avg_price"].to_dict() == {"A": 30.0, "B": 10.0}
+
+
+def test_hh_agent_analytics_is_cached_until_its_columns_change(frame, monkeypatch):
+    calls = []
+    agent_tables = agent_broker._agent_tables
+    monkeypatch.setattr(agent_broker, "_agent_tables", lambda df: calls.append(1) or agent_tables(df))
+
+    tables = frame.hh.agent_analytics()
+    assert frame.hh.agent_analytics() is tables and calls == [1]
+    pd.testing.assert_frame_equal(tables.agents, reference_agents(frame))
+
+    frame["lot_sqft"] = frame["lot_sqft"] * 2  #: not read by the analytics
+    assert frame.hh.agent_analytics() is tables
+
+    frame.loc[frame.index[:50], "list_price"] = 1.0  #: edited in place: the tables are rebuilt
+    rebuilt = frame.hh.agent_analytics()
+    assert rebuilt is not tables and calls == [1, 1]
+    pd.testing.assert_frame_equal(rebuilt.agents, reference_agents(frame))
+
+
+def test_primary_phone_is_the_same_with_or_without_contact_columns():
+    df = pd.DataFrame({
+        "property_id": ["1", "2", "3", "4", "5"],
+        "agent_name": ["A", "A", "B", "B", "C"],
+        "list_price": [1.0, 2.0, 3.0, 4.0, 5.0],
+        "agent_email": None,
+        "agent_phones": [[{"number": "123"}], [{"number": "555-555-1234"}], None, [{"number": "(602) 555-0100"}],
+                         None],
+        "agent_id": None, "broker_name": None, "broker_id": None, "office_id": None, "office_email": None,
+        "office_name": ["X", "X", "Y", "Y", "Y"],
+        "office_phones": [[], [{"number": "480-555-0101"}], None, [{"number": "480-555-0102"}], None],
+    })
+
+    # A's first phones ("123") have no valid number, even though its second listing has one
+    for table, expected in [(get_agent_activity, [None, "6025550100", None]),
+                            (get_office_activity, ["4805550102", None])]:
+        plain = table(df)
+        assert plain["primary_phone"].tolist() == expected
+        pd.testing.assert_frame_equal(table(normalize_contacts(df)), plain)
+
+
+def test_missing_or_empty_frames():
+    assert get_agent_activity(pd.DataFrame()).empty
+    assert get_wholesale_friendly_agents(pd.DataFrame()).empty
+    assert analyze_agent_specialization(pd.DataFrame({"list_price": [1]})).empty
@@ -0,0 +1,148 @@
+import json
+
+import pandas as pd
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.agent_broker import get_agent_activity, get_office_activity, normalize_contacts
+from homeharvest.agent_identity import AgentResolver, add_agent_key, normalize_agent_name
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def phones(number):
+    return [{"number": number, "type": "Mobile", "primary": True}]
+
+
+def listings():
+    """Hand-made listings: (agent_id, agent_nrds_id, agent_name, phone, office_name)."""
+    rows = [
+        ("u1", "111", "Susan Anderson", "(602) 555-0101", "A"),
+        ("u2", None, "ANDERSON, SUSAN", "+1 602-555-0101", "A"),  #: same agent, new uuid and spelling
+        ("u3", None, "Susan Anderson Jr.", "602.555.0101", "B"),
+        ("u4", "222", "John Johnson", "(480) 555-0199", "A"),
+        ("u5", "333", "John Johnson", "(480) 555-0199", "B"),  #: same name and phone, another NRDS id
+        ("u6", None, "John Johnson", "(480) 555-0777", "B"),  #: same name, another phone
+        ("u4", None, "Johnny Johnson", None, "A"),  #: known uuid, new spelling
+        (None, None, "Mary Smith", None, "C"),
+        (None, None, "mary  smith", None, "C"),
+        (None, None, None, None, "C"),
+    ]
+    return pd.DataFrame({
+        "property_id": [str(i) for i in range(len(rows))],
+        "list_price": [100000.0 * (i + 1) for i in range(len(rows))],
+        "agent_id": [row[0] for row in rows],
+        "agent_nrds_id": [row[1] for row in rows],
+        "agent_name": [row[2] for row in rows],
+        "agent_phones": [phones(row[3]) if row[3] else None for row in rows],
+        "agent_email": None,
+        "broker_name": None,
+        "broker_id": None,
+        "office_name": [row[4] for row in rows],
+        "office_id": None,
+        "office_email": None,
+        "office_phones": None,
+    })
+
+
+EXPECTED_KEYS = [
+    "nrds:111", "nrds:111", "nrds:111", "nrds:222", "nrds:333", "uuid:u6", "nrds:222",
+    "name:mary smith", "name:mary smith", None,
+]
+
+
+def test_normalize_agent_name():
+    assert normalize_agent_name("Susan Anderson") == "anderson susan"
+    assert normalize_agent_name("ANDERSON, Susan Jr.") == "anderson susan"
+    assert normalize_agent_name("  Susan   Ánderson, REALTOR ") == "anderson susan"
+    assert normalize_agent_name("O'Brien-Smith, Mary") == "brien mary o smith"
+    assert normalize_agent_name("Jr.") is None and normalize_agent_name(None) is None
+
+
+def test_resolve_links_variants_and_keeps_namesakes_apart():
+    df = listings()
+    assert add_agent_key(df)["agent_key"].tolist() == EXPECTED_KEYS
+    assert "agent_key" not in df.columns
+
+    # Keys do not depend on row order, nor on where the phones come from
+    shuffled = df.sample(frac=1, random_state=3)
+    assert add_agent_key(shuffled)["agent_key"].tolist() == shuffled.index.map(dict(enumerate(EXPECTED_KEYS))).tolist()
+    assert add_agent_key(normalize_contacts(df))["agent_key"].tolist() == EXPECTED_KEYS
+
+
+
+def test_shared_uuid_never_merges_two_nrds_ids():
+    df = pd.DataFrame({
+        "agent_id": ["u2", "u2", "u2"],
+        "agent_nrds_id": ["N3", "N4", None],
+        "agent_name": ["Jane Doe", "Jane Doe", "Jane Doe"],
+        "agent_phones": [phones("(602) 555-0123"), phones("(602) 555-0123"), None],
+    })
+    resolver = AgentResolver()
+    assert resolver.resolve(df).tolist() == ["nrds:N3", "nrds:N4", "nrds:N3"]
+    # nor does a key from an earlier scrape
+    assert resolver.resolve(df.iloc[[1]]).tolist() == ["nrds:N4"]
+    assert AgentResolver().resolve(df.iloc[::-1]).tolist()[1:] == ["nrds:N4", "nrds:N3"]
+
+def test_resolver_keeps_keys_across_scrapes():
+    resolver = AgentResolver()
+    add_agent_key(listings(), resolver)
+
+    later = pd.DataFrame({
+        "agent_id": ["u9", "u8", "u10"],
+        "agent_nrds_id": [None, None, "444"],
+        "agent_name": ["Susan Anderson", "Jon Johnson", "John Johnson"],
+        "agent_phones": [phones("602 555 0101"), None, phones("(480) 555-0199")],
+    })
+    state = json.loads(json.dumps(resolver.to_dict()))
+    for current in [resolver, AgentResolver(state)]:
+        # a new uuid with a known name + phone keeps the key; an unknown agent gets a new one; a third NRDS id
+        # under "John Johnson" stays a separate agent
+        assert current.resolve(later).tolist() == ["nrds:111", "uuid:u8", "nrds:444"]
+    assert resolver.keys["uuid:u9"] == "nrds:111"
+
+
+def test_analytics_group_by_agent_key():
+    df = add_agent_key(listings())
+    agents = get_agent_activity(df)
+
+    assert agents.columns[:3].tolist() == ["agent_key", "agent_name", "listing_count"]
+    counts = dict(zip(agents["agent_key"], agents["listing_count"]))
+    assert counts == {"nrds:111": 3, "nrds:222": 2, "nrds:333": 1, "uuid:u6": 1, "name:mary smith": 2}
+    assert get_office_activity(df).set_index("office_name")["unique_agents"].to_dict() == {"A": 2, "B": 3, "C": 1}
+    # by raw name, Susan Anderson's three spellings are three agents and the John Johnsons are one
+    assert get_agent_activity(listings())["agent_name"].nunique() == 7
+
+
+def test_synthetic_agents_split_by_id():
+    df = build_property_frame(scraped_properties(1500), clean=True)
+    keys = add_agent_key(df)["agent_key"]
+
+    named = df["agent_name"].notna()
+    assert keys[named].notna().all() and keys[~named & df["agent_id"].isna()].isna().all()
+    # no key spans two NRDS ids, and namesakes with different ids keep separate keys
+    assert df.groupby(keys)["agent_nrds_id"].nunique().max() == 1
+    assert keys.nunique() > df["agent_name"].nunique()
+
+
+@pytest.mark.parametrize("return_type", ["pandas", "arrow"])
+def test_scrape_property_agent_resolver(return_type):
+    if return_type == "arrow":
+        pytest.importorskip("pyarrow")
+    dataset = generate_results(150, seed=21, status="for_sale")
+    resolver = AgentResolver()
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        kwargs = dict(location="Phoenix, AZ", limit=150, coalesce=False, return_type=return_type)
+        plain = scrape_property(**kwargs)
+        result = scrape_property(agent_resolver=resolver, **kwargs)
+
+    if return_type == "arrow":
+        plain, result = plain.to_pandas(), result.to_pandas()
+    assert list(result.columns[len(plain.columns):]) == ["agent_key"]
+    assert result["agent_key"].tolist() == AgentResolver().resolve(plain).tolist()
+    assert resolver.keys
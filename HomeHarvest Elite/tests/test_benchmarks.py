@@ -0,0 +1,44 @@
+import json
+
+from .benchmarks import bench_e2e, bench_hotpath, bench_memory
+from .benchmarks.harness import compare
+
+
+def test_hotpath_suite_saves_and_compares_baseline(tmp_path):
+    baseline = tmp_path / "hotpath.json"
+
+    assert bench_hotpath.main(["--sizes", "50", "--save", str(baseline)]) == 0
+
+    saved = json.loads(baseline.read_text())
+    assert saved["suite"] == "hotpath"
+    assert {"process_property[50]", "concat_property_frames[50]", "clean_dataframe[50]",
+            "expand_tag_search.fuzzy.warm[50]"} <= set(saved["results"])
+    assert all(entry["median"] > 0 for entry in saved["results"].values())
+
+
+def test_e2e_suite_reports_throughput(tmp_path):
+    baseline = tmp_path / "e2e.json"
+    argv = ["--sizes", "400", "--repeat", "1", "--latency", "0", "--property-workers", "2", "--page-workers", "2"]
+
+    assert bench_e2e.main(argv + ["--only", "basic", "--save", str(baseline)]) == 0
+
+    results = json.loads(baseline.read_text())["results"]
+    parallel = results["e2e.parallel.pg2.basic.pw2[400]"]
+    assert parallel["requests"]["search"] == 2
+    assert parallel["properties_per_sec"] > 0 and parallel["p95"] >= parallel["p50"]
+    assert "e2e.sequential.basic.pw2[400]" in results
+
+
+def test_memory_suite_reports_every_stage_and_enforces_budgets():
+    assert bench_memory.main(["--sizes", "100"]) == 0
+    assert bench_memory.main(["--sizes", "100", "--budget", "process_property.retained=0.001"]) == 1
+
+
+def test_compare_flags_only_regressions_over_tolerance():
+    baseline = {"a[10]": {"median": 1.0}, "b[10]": {"median": 1.0}}
+    current = {"a[10]": {"median": 1.1}, "b[10]": {"median": 2.0}, "c[10]": {"median": 5.0}}
+
+    regressions = compare(current, baseline, tolerance=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b[10]")
@@ -0,0 +1,95 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.agent_broker import agent_contact_mask, filter_by_agent_contact
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+@pytest.mark.parametrize("return_type, module", [("arrow", "pyarrow"), ("polars", "polars")])
+def test_missing_optional_dependency_fails_before_scraping(monkeypatch, return_type, module):
+    monkeypatch.setitem(sys.modules, module, None)
+    with pytest.raises(ImportError, match=rf"homeharvest\[{return_type}\]"):
+        scrape_property(location="Phoenix, AZ", return_type=return_type)
+
+
+@pytest.mark.parametrize("require_email, require_phone", [(True, False), (False, True), (True, True)])
+def test_agent_contact_mask_matches_filter(require_email, require_phone):
+    df = build_property_frame(scraped_properties(400))
+    mask = agent_contact_mask(df["agent_email"], df["agent_phones"], require_email, require_phone)
+
+    pd.testing.assert_frame_equal(df[mask].reset_index(drop=True),
+                                  filter_by_agent_contact(df, require_email, require_phone))
+    assert 0 < mask.sum() < len(df)
+
+
+def test_arrow_table_matches_dataframe():
+    pa = pytest.importorskip("pyarrow")
+    from homeharvest.columnar import to_arrow_table
+
+    properties = scraped_properties(500)
+    df = build_property_frame(properties, clean=True)
+    table = to_arrow_table(properties, clean=True)
+
+    assert table.column_names == list(df.columns) and table.num_rows == len(df)
+    for column in ["property_id", "city", "beds", "sqft", "list_price", "price_per_sqft", "latitude"]:
+        assert table.column(column).to_pylist() == [None if pd.isna(v) else v for v in df[column]]
+
+    assert table.schema.field("tags").type == pa.list_(pa.string())
+    assert table.schema.field("alt_photos").type == pa.list_(pa.string())
+    assert pa.types.is_struct(table.schema.field("tax_history").type.value_type)
+    assert pa.types.is_struct(table.schema.field("agent_phones").type.value_type)
+    assert pa.types.is_timestamp(table.schema.field("list_date").type)
+    assert table.column("tags").to_pylist() == [None if v is pd.NA else v for v in df["tags"]]
+
+
+def test_compact_arrow_types_match_compact_dataframe():
+    pa = pytest.importorskip("pyarrow")
+    from homeharvest.columnar import to_arrow_table
+    from homeharvest.schema import compact_dataframe
+
+    properties = scraped_properties(500)
+    df = compact_dataframe(build_property_frame(properties, clean=True))
+    table = to_arrow_table(properties, clean=True, compact=True)
+
+    assert table.column_names == list(df.columns)
+    for column in ["city", "status", "agent_name"]:
+        assert pa.types.is_dictionary(table.schema.field(column).type)
+    for column in ["beds", "sqft", "list_price"]:
+        assert table.schema.field(column).type == {"Int32": pa.int32(), "Int64": pa.int64()}[str(df[column].dtype)]
+    assert table.schema.field("price_per_sqft").type == pa.float32()
+    assert pa.types.is_timestamp(table.schema.field("list_date").type)
+    for column in ["city", "beds", "list_price", "price_per_sqft"]:
+        assert table.column(column).to_pylist() == [None if pd.isna(v) else v for v in df[column].astype(object)]
+
+
+@pytest.mark.parametrize("return_type", ["arrow", "polars"])
+def test_scrape_property_columnar_return(return_type):
+    pa = pytest.importorskip("pyarrow")
+    if return_type == "polars":
+        pytest.importorskip("polars")
+    dataset = generate_results(200, seed=14, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        kwargs = dict(location="Phoenix, AZ", limit=200, require_agent_email=True, coalesce=False)
+        expected = scrape_property(**kwargs)
+        table, stats = scrape_property(return_type=return_type, return_stats=True, **kwargs)
+
+    assert len(table) == len(expected) == stats.rows_returned
+    assert list(table.columns if return_type == "polars" else table.column_names) == list(expected.columns)
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        compact = scrape_property(return_type=return_type, compact_dtypes=True, **kwargs)
+    if return_type == "polars":
+        import polars as pl
+        assert compact.schema["city"] == pl.Categorical and compact.schema["beds"] == pl.Int32
+    else:
+        assert compact.schema.field("beds").type == pa.int32()
+        assert pa.types.is_dictionary(compact.schema.field("city").type)
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.agent_broker import (
+    extract_phone_numbers, extract_primary_phone, filter_by_agent_contact, get_agent_activity, get_contact_export,
+    get_office_activity, normalize_contacts, normalize_phones, valid_email_mask,
+)
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+PHONE_CELLS = [
+    [{"number": "(602) 366-5565", "type": "Mobile"}, {"number": "480.555.0100"}],
+    [{"phone": "+1 602 555 0199"}, "602-555-0123", {"number": None}],
+    [{"number": "555-0100"}, {"number": "(602) 628-9764"}],  #: the first one is too short
+    "602-555-0100, 480-555-0101; 12",
+    "(602) 906-6317",
+    "",
+    [],
+    None,
+    pd.NA,
+    np.nan,
+    [{"number": 6025550111}],
+]
+
+
+def test_normalize_phones_matches_extract_phone_numbers():
+    cells = PHONE_CELLS * 3
+    primary, count = normalize_phones(pd.Series(cells, dtype=object))
+
+    assert primary.tolist() == [extract_primary_phone(cell) for cell in cells]
+    assert count.tolist() == [len(extract_phone_numbers(cell)) for cell in cells]
+    assert normalize_phones([None, []])[1].tolist() == [0, 0]
+
+
+def test_valid_email_mask():
+    emails = pd.Series(["a@b.com", " agent@example.com ", "", "   ", None, pd.NA, "not-an-email", "a@b.com"])
+    assert valid_email_mask(emails).tolist() == [True, True, False, False, False, False, False, True]
+    assert valid_email_mask(emails.astype("category")).tolist() == valid_email_mask(emails).tolist()
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df = build_property_frame(scraped_properties(800), clean=True)
+    df.loc[::11, "agent_email"] = ""
+    df.loc[::13, "agent_phones"] = None
+    return df
+
+
+def test_normalize_contacts_columns(frame):
+    normalized = normalize_contacts(frame)
+
+    for prefix in ["agent", "office"]:
+        phones = frame[f"{prefix}_phones"]
+        assert normalized[f"{prefix}_primary_phone"].tolist() == [extract_primary_phone(p) for p in phones]
+        assert normalized[f"{prefix}_phone_count"].tolist() == [len(extract_phone_numbers(p)) for p in phones]
+        assert normalized[f"{prefix}_valid_email"].tolist() == \
+            [isinstance(e, str) and "@" in e for e in frame[f"{prefix}_email"]]
+    assert "agent_primary_phone" not in frame.columns
+
+
+@pytest.mark.parametrize("require_email, require_phone", [(True, False), (False, True), (True, True)])
+def test_filter_reuses_normalized_columns(frame, require_email, require_phone):
+    filtered = filter_by_agent_contact(frame, require_email, require_phone)
+    normalized = filter_by_agent_contact(normalize_contacts(frame), require_email, require_phone)
+
+    pd.testing.assert_frame_equal(normalized[frame.columns], filtered)
+    if require_email:
+        assert (filtered["agent_email"] != "").all()
+    if require_phone:
+        assert filtered["agent_phones"].map(extract_phone_numbers).map(len).gt(0).all()
+
+
+def test_activity_and_export_use_normalized_phones(frame):
+    for df in [frame, normalize_contacts(frame)]:
+        agents = get_agent_activity(df)
+        assert agents["primary_phone"].tolist() == agents["agent_phones"].map(extract_primary_phone).tolist()
+        offices = get_office_activity(df)
+        assert offices["primary_phone"].tolist() == offices["office_phones"].map(extract_primary_phone).tolist()
+
+        export = get_contact_export(df)
+        rows = frame.drop_duplicates(subset=["agent_id"]).set_index("agent_id").loc[export["agent_id"]]
+        assert export["agent_primary_phone"].tolist() == rows["agent_phones"].map(extract_primary_phone).tolist()
+        assert export["office_primary_phone"].tolist() == rows["office_phones"].map(extract_primary_phone).tolist()
+        assert (export["agent_email"].fillna("").str.contains("@") | export["agent_primary_phone"].notna()).all()
+
+
+@pytest.mark.parametrize("return_type", ["pandas", "arrow"])
+def test_scrape_property_contact_columns(return_type):
+    if return_type == "arrow":
+        pytest.importorskip("pyarrow")
+    dataset = generate_results(200, seed=15, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        kwargs = dict(location="Phoenix, AZ", limit=200, coalesce=False, return_type=return_type,
+                      require_agent_phone=True)
+        plain = scrape_property(**kwargs)
+        result = scrape_property(contact_columns=True, **kwargs)
+
+    if return_type == "arrow":
+        plain, result = plain.to_pandas(), result.to_pandas()
+    assert list(result.columns[len(plain.columns):]) == [
+        "agent_primary_phone", "agent_phone_count", "agent_valid_email",
+        "office_primary_phone", "office_phone_count", "office_valid_email",
+    ]
+    assert len(result) == len(plain) and (result["agent_phone_count"] > 0).all()
+    assert result["property_id"].tolist() == plain["property_id"].tolist()
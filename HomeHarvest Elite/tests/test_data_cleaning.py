@@ -0,0 +1,100 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest.core.scrapers.realtor.processors import get_key, process_extra_property_details, process_property
+from homeharvest.data_cleaning import (
+    COLUMN_CLEANERS, calculate_price_per_sqft, clean_dataframe, clean_tags, validate_coordinates,
+)
+from homeharvest.synthetic import generate_results
+from homeharvest.utils import build_property_frame, concat_property_frames, process_result
+
+
+def reference_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """The cell-by-cell definition clean_dataframe must reproduce."""
+    cleaned = df.copy()
+    for column, (cleaner, _) in COLUMN_CLEANERS.items():
+        if column in cleaned.columns:
+            cleaned[column] = cleaned[column].apply(cleaner)
+    if 'tags' in cleaned.columns:
+        cleaned['tags'] = cleaned['tags'].apply(clean_tags)
+    if 'latitude' in cleaned.columns and 'longitude' in cleaned.columns:
+        coords = cleaned.apply(lambda row: validate_coordinates(row.get('latitude'), row.get('longitude')), axis=1)
+        cleaned['latitude'] = coords.apply(lambda x: x[0])
+        cleaned['longitude'] = coords.apply(lambda x: x[1])
+    if 'list_price' in cleaned.columns and 'sqft' in cleaned.columns:
+        cleaned['price_per_sqft'] = cleaned.apply(
+            lambda row: calculate_price_per_sqft(row.get('list_price'), row.get('sqft')), axis=1
+        )
+    return cleaned
+
+
+def scraped_properties(count: int, extra_property_data: bool = True) -> list:
+    return [
+        prop for prop in (
+            process_property(result, False, extra_property_data, False, None, get_key, process_extra_property_details)
+            for result in generate_results(count, seed=11)
+        ) if prop
+    ]
+
+
+def scraped_frame(count: int) -> pd.DataFrame:
+    properties = scraped_properties(count)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=FutureWarning)
+        return concat_property_frames([process_result(prop) for prop in properties])
+
+
+def test_matches_cell_by_cell_cleaning_on_scraped_frame():
+    df = scraped_frame(1500)
+    pd.testing.assert_frame_equal(clean_dataframe(df), reference_clean(df))
+
+
+def test_matches_cell_by_cell_cleaning_on_messy_values():
+    df = pd.DataFrame({
+        'list_price': ["$1,250,000", 0, -5, None, 2.675 * 1000, "n/a", 310000, float("inf")],
+        'sold_price': [None] * 8,
+        'sqft': [1000, "1,500", 0.5, None, 1000, -1, 2000.9, 1200],
+        'lot_sqft': pd.array([5000, None, 1, 2, 3, 4, 5, 6], dtype="Int64"),
+        'beds': [3, 2.5, "4", "2.5", 0, None, True, 1],
+        'baths': [1.0, 2.0, 3.0, np.nan, 1.5, 2.0, 2.0, 0.0],
+        'full_baths': [1, 2, 3, 4, 5, 6, 7, 8],
+        'year_built': [1799, 1800, 2150, "1999", None, 1950.7, 2001, pd.NA],
+        'hoa_fee': [pd.NA, 100, None, "$50", 0, 75.5, pd.NA, 20],
+        'latitude': [33.4, 91, None, "33.1", 45.0, -90, 12.0, 0.0],
+        'longitude': [-112.0, 10, 5, "-111.9", 181, 180, None, 0.0],
+        'tags': [["Pool ", None, "VIEW"], "a, b", None, [], ["x"], [None], "solo", np.nan],
+    })
+    pd.testing.assert_frame_equal(clean_dataframe(df), reference_clean(df))
+
+    numeric = pd.DataFrame({'list_price': [2675.0, 1005.0, 300000.0, np.nan], 'sqft': [1000, 1000, 0, 7]})
+    pd.testing.assert_frame_equal(clean_dataframe(numeric), reference_clean(numeric))
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+def test_inplace_option(inplace):
+    df = scraped_frame(50)
+    original = df.copy()
+
+    result = clean_dataframe(df, inplace=inplace)
+
+    assert (result is df) is inplace
+    pd.testing.assert_frame_equal(result, reference_clean(original))
+    if not inplace:
+        pd.testing.assert_frame_equal(df, original)
+
+
+@pytest.mark.parametrize("extra_property_data", [True, False])
+def test_build_property_frame_matches_per_row_assembly(extra_property_data):
+    properties = scraped_properties(600, extra_property_data)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=FutureWarning)
+        per_row = concat_property_frames([process_result(prop) for prop in properties])
+
+    pd.testing.assert_frame_equal(build_property_frame(properties), per_row, check_exact=True)
+    pd.testing.assert_frame_equal(
+        build_property_frame(properties, clean=True), reference_clean(per_row), check_exact=True
+    )
+    assert build_property_frame([]).empty
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.state_store import MemoryStateStore, SQLiteStateStore
+
+from .fakes import make_result
+
+
+def listings(count: int, newest: datetime) -> list[dict]:
+    """`count` listings sorted by last_update_date desc, one hour apart."""
+    return [
+        make_result(i, last_update_date=(newest - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        for i in range(count)
+    ]
+
+
+def delta_scrape(store, **kwargs):
+    return scrape_property(location="Phoenix, AZ", listing_type="for_sale", extra_property_data=False,
+                           return_type="raw", delta=True, state_store=store, **kwargs)
+
+
+def test_delta_returns_only_changes_and_stops_paging_at_watermark(fake_session):
+    store = MemoryStateStore()
+    newest = datetime(2025, 6, 1, 12)
+
+    session = fake_session(results=listings(1000, newest))
+    first = delta_scrape(store)
+    assert len(first) == 1000
+
+    #: three listings were updated since the first run; they move to the top of the last_update_date sort
+    changed = listings(1000, newest)
+    for i in range(3):
+        changed[i]["last_update_date"] = (newest + timedelta(minutes=10 * (3 - i))).strftime("%Y-%m-%dT%H:%M:%SZ")
+    session = fake_session(results=changed)
+    second = delta_scrape(store)
+
+    assert sorted(p["property_id"] for p in second) == ["1000", "1001", "1002"]
+    assert session.search_offsets == [0]
+
+    session = fake_session(results=changed)
+    assert delta_scrape(store) == []
+
+
+def test_delta_run_cut_short_by_limit_keeps_the_watermark(fake_session):
+    store = MemoryStateStore()
+    newest = datetime(2025, 6, 1, 12)
+    fake_session(results=listings(1000, newest))
+    delta_scrape(store)
+    key = next(iter(store._watermarks))
+    watermark = store.get_watermark(key)
+
+    #: 600 listings changed since, more than limit=400 lets one run page through
+    changed = listings(1000, newest)
+    for i in range(600):
+        changed[i]["last_update_date"] = (newest + timedelta(minutes=600 - i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    fake_session(results=changed)
+    with pytest.warns(UserWarning, match="limit=400"):
+        first, stats = delta_scrape(store, limit=400, return_stats=True)
+
+    assert len(first) == 400 and stats.delta_truncated
+    assert store.get_watermark(key) == watermark
+
+    # raising limit resumes the same watermark: every change is returned and the watermark advances
+    fake_session(results=changed)
+    second, stats = delta_scrape(store, limit=800, return_stats=True)
+    assert len(second) == 600 and not stats.delta_truncated and list(store._watermarks) == [key]
+    assert store.get_watermark(key).value == "2025-06-01T22:00:00"
+
+
+def test_sqlite_watermark_never_moves_backwards(tmp_path):
+    store = SQLiteStateStore(str(tmp_path / "state.sqlite3"))
+
+    store.advance_watermark("q", "2025-06-01T12:00:00", ["1"])
+    store.advance_watermark("q", "2025-05-01T12:00:00", ["2"])
+    store.advance_watermark("q", "2025-06-01T12:00:00", ["3"])
+
+    watermark = SQLiteStateStore(str(tmp_path / "state.sqlite3")).get_watermark("q")
+    assert watermark.value == "2025-06-01T12:00:00"
+    assert watermark.boundary_ids == ["1", "3"]
@@ -0,0 +1,87 @@
+import pytest
+
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType, ReturnType
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.core.scrapers.realtor.filters import FilterPipeline, mask_condition, row_condition
+from homeharvest.synthetic import generate_results
+
+from .test_data_cleaning import scraped_properties
+
+SEQUENTIAL = [
+    ("hour_based_date", "_hour_based_date_condition"),
+    ("last_update_date", "_last_update_date_condition"),
+    ("tags", "_tag_condition"),
+    ("additional_filters", "_additional_filters_condition"),
+    ("raw_data_filters", "_raw_data_condition"),
+]
+
+FILTERS = dict(
+    date_from="2025-03-01T06:00:00", date_from_precision="hour",
+    updated_since="2025-04-15T00:00:00Z",
+    tag_filters=["swimming_pool", "central_air", "fireplace"], tag_exclude=["carport"],
+    stories_max=1, has_view=False,
+)
+
+
+def sequential(scraper, homes):
+    """Each condition run as its own pass, as search() used to, with the rows each one dropped."""
+    dropped = {}
+    for name, builder in SEQUENTIAL:
+        condition = getattr(scraper, builder)()
+        before = len(homes)
+        if condition is not None:
+            homes = FilterPipeline([condition]).apply(homes)[0]
+        dropped[name] = before - len(homes)
+    return homes, dropped
+
+
+@pytest.mark.parametrize("return_type", [ReturnType.pydantic, ReturnType.raw])
+def test_compiled_pipeline_matches_sequential_passes(return_type):
+    homes = scraped_properties(1500) if return_type != ReturnType.raw else generate_results(1500, seed=11)
+    scraper = RealtorScraper(ScraperInput(
+        location="Phoenix, AZ", listing_type=ListingType.FOR_SALE, return_type=return_type,
+        exclude_pending=True, mls_only=True, **FILTERS,
+    ))
+
+    pipeline = scraper._compile_filters()
+    kept, rejected = pipeline.apply(homes)
+    expected, dropped = sequential(scraper, homes)
+
+    assert kept == expected
+    assert rejected == {name: dropped[name] for name in pipeline.names}
+    assert all(rejected[name] > 0 for name in ["hour_based_date", "last_update_date", "tags", "additional_filters"])
+    assert len(kept) + sum(rejected.values()) == len(homes)
+
+
+def test_unparseable_cutoff_leaves_condition_out():
+    scraper = RealtorScraper(ScraperInput(
+        location="Phoenix, AZ", listing_type=ListingType.FOR_SALE, updated_since="not a date",
+    ))
+    assert scraper._last_update_date_condition() is None
+    assert scraper._compile_filters().names == []
+    homes = scraped_properties(20)
+    assert scraper._compile_filters().apply(homes) == (homes, {})
+
+
+def test_pipeline_stops_at_first_rejecting_condition():
+    evaluated = []
+
+    def check(name, predicate):
+        def test(home):
+            evaluated.append((name, home))
+            return predicate(home)
+        return row_condition(name, test)
+
+    pipeline = FilterPipeline([
+        check("even", lambda n: n % 2 == 0),
+        mask_condition("small", lambda homes: [n < 6 for n in homes]),
+        check("not_four", lambda n: n != 4),
+    ])
+
+    kept, rejected = pipeline.apply(list(range(10)))
+
+    assert kept == [0, 2]
+    assert rejected == {"even": 5, "small": 2, "not_four": 1}
+    assert ("not_four", 6) not in evaluated and ("even", 1) in evaluated
+    assert FilterPipeline([]).apply([1, 2]) == ([1, 2], {})
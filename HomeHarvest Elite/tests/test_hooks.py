@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from urllib3.util.retry import Retry
+
+from homeharvest import MetricsAggregator, ScrapeHooks, scrape_property
+from homeharvest.hooks import ResponseEvent
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+
+
+class Recorder(ScrapeHooks):
+    def __init__(self):
+        self.requests = []
+        self.pages = []
+
+    def on_request(self, event):
+        self.requests.append(event)
+
+    def on_page(self, event):
+        self.pages.append(event)
+
+
+def test_aggregator_reports_latency_and_rate_limits_per_endpoint():
+    dataset = generate_results(600, seed=5, status="for_sale")
+    retries = Retry(total=3, backoff_factor=0, status_forcelist=[429], allowed_methods=frozenset(["GET", "POST"]))
+    metrics, recorder = MetricsAggregator(), Recorder()
+
+    with RealtorStubServer(dataset=dataset, rate_limit_every=3) as server:
+        with use_transport(RedirectAdapter(server.url, max_retries=retries)):
+            df = scrape_property(location="Phoenix, AZ", limit=600, parallel=False, coalesce=False,
+                                 hooks=[metrics, recorder])
+
+    report = metrics.report()
+    assert len(df) == 600
+    assert set(report) == {"autocomplete", "search", "bulk_details"}
+    assert sum(entry["attempts"] for entry in report.values()) == sum(server.request_counts.values())
+    assert sum(entry["status_counts"].get(429, 0) for entry in report.values()) == server.status_counts[429] > 0
+    assert sum(entry["retry_reasons"].get("status 429", 0) for entry in report.values()) == server.status_counts[429]
+
+    search = report["search"]
+    assert search["requests"] == 3 and search["errors"] == 0
+    assert 0 < search["rate_429"] < 1 and search["rate_403"] == 0
+    assert sum(search["latency_histogram"].values()) == 3
+    assert search["bytes_received"] > 0 and search["bytes_sent"] > 0
+
+    assert len(recorder.requests) == sum(entry["requests"] for entry in report.values())
+    assert [page.offset for page in recorder.pages] == [0, 200, 400]
+    assert metrics.pages == 3 and metrics.page_rows == 600
+
+
+
+def test_concurrent_identical_scrapes_each_see_their_requests():
+    dataset = generate_results(300, seed=6, status="for_sale")
+    recorders = [Recorder() for _ in range(3)]
+
+    with RealtorStubServer(dataset=dataset, latency=0.05) as server, use_transport(RedirectAdapter(server.url)):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(
+                lambda recorder: scrape_property(location="Phoenix, AZ", limit=300, hooks=[recorder]), recorders,
+            ))
+
+    #: the default coalesce=True does not let one call's fetch hide requests from another call's hooks
+    assert server.request_counts["search"] == 3 * 2
+    for recorder in recorders:
+        assert sorted(page.offset for page in recorder.pages) == [0, 200]
+        assert {event.endpoint for event in recorder.requests} >= {"autocomplete", "search"}
+
+
+def test_latency_percentiles_come_from_fixed_buckets():
+    metrics = MetricsAggregator(buckets=(0.1, 0.2, 0.4))
+    for i in range(10000):
+        latency = 0.05 if i % 10 else 0.3  #: 90% fast, 10% in the 0.2-0.4s bucket
+        metrics.on_response(ResponseEvent(endpoint="search", method="POST", url="u", status=200, latency=latency))
+    metrics.on_response(ResponseEvent(endpoint="search", method="POST", url="u", status=200, latency=1.5))
+
+    search = metrics.endpoints["search"]
+    assert search.histogram == [9000, 0, 1000, 1]  #: the only per-endpoint latency state, whatever the volume
+    report = metrics.report()["search"]
+    assert report["latency_p50"] <= 0.1 and 0.2 < report["latency_p95"] <= 0.4
+    assert report["latency_max"] == 1.5 and metrics.endpoints["search"].percentile(100) == 1.5
+    assert MetricsAggregator().report() == {}
+
+def test_hooks_must_implement_an_event():
+    with pytest.raises(ValueError, match="implements none of"):
+        scrape_property(location="Phoenix, AZ", hooks=[object()])
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from homeharvest import json_backend, scrape_property
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+
+PATH = ("data", "home_search", "results")
+
+
+def test_result_stream_matches_full_decode():
+    results = generate_results(50, seed=8)
+    body = json.dumps({"data": {"home_search": {"count": 50, "total": 900, "results": results}}, "extensions": {}})
+
+    stream = json_backend.ResultStream(body.encode(), PATH)
+    assert list(stream) == json.loads(body)["data"]["home_search"]["results"]
+    assert stream.found and stream.fields == {"count": 50, "total": 900}
+
+    trailing = json_backend.ResultStream(json.dumps({"data": {"home_search": {"results": results[:2], "total": 2}}}), PATH)
+    assert len(list(trailing)) == 2 and trailing.fields == {"total": 2}
+
+    missing = json_backend.ResultStream('{"data": null, "errors": [{"message": "boom"}]}', PATH)
+    assert list(missing) == [] and not missing.found
+
+    with pytest.raises(json.JSONDecodeError):
+        list(json_backend.ResultStream('{"data": {"home_search": {"results": [{"a": 1} {"b": 2}]}}}', PATH))
+
+
+def test_backend_selection_and_errors():
+    default = json_backend.get_backend()
+    assert default == json_backend.available_backends()[0]
+    try:
+        for name in json_backend.available_backends():
+            assert json_backend.set_backend(name) == name
+            assert json_backend.loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+            with pytest.raises(json.JSONDecodeError):
+                json_backend.loads(b"<html>rate limited</html>")
+        with pytest.raises(ValueError, match="not available"):
+            json_backend.set_backend("simdjson")
+    finally:
+        json_backend.set_backend(default)
+
+
+@pytest.mark.parametrize("extra_property_data", [False, True])
+def test_streamed_pages_match_full_decode(monkeypatch, extra_property_data):
+    dataset = generate_results(450, seed=9, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        kwargs = dict(location="Phoenix, AZ", limit=430, extra_property_data=extra_property_data, coalesce=False)
+        full = scrape_property(**kwargs)
+        monkeypatch.setattr(RealtorScraper, "STREAM_RESULTS", True)
+        streamed = scrape_property(**kwargs)
+
+    assert len(full) == 430
+    assert full.equals(streamed)
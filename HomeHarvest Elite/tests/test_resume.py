@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.exceptions import ScrapeInterrupted
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_resume_fetches_only_missing_pages(fake_session, parallel):
+    params = dict(location="Phoenix, AZ", listing_type="for_sale", extra_property_data=False,
+                  return_type="raw", parallel=parallel)
+
+    fake_session(total=1000)
+    expected = scrape_property(**params)
+
+    fake_session(total=1000, fail_offsets={400})
+    with pytest.raises(ScrapeInterrupted) as excinfo:
+        scrape_property(resumable=True, **params)
+
+    token = json.loads(excinfo.value.resume_token)
+    assert 400 not in map(int, token["pages"])
+    assert token["location_info"]["city"] == "Phoenix"
+
+    session = fake_session(total=1000)
+    resumed = scrape_property(resume_token=excinfo.value.resume_token, **params)
+
+    assert session.autocomplete_calls == 0
+    assert 0 not in session.search_offsets and 400 in session.search_offsets
+    assert [p["property_id"] for p in resumed] == [p["property_id"] for p in expected]
+
+
+def test_resume_token_rejects_different_query(fake_session):
+    fake_session(total=400, fail_offsets={200})
+    with pytest.raises(ScrapeInterrupted) as excinfo:
+        scrape_property(location="Phoenix, AZ", listing_type="for_sale", extra_property_data=False, resumable=True)
+
+    with pytest.raises(ValueError):
+        scrape_property(location="Phoenix, AZ", listing_type="sold", resume_token=excinfo.value.resume_token)
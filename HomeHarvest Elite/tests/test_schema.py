@@ -0,0 +1,64 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.schema import DATETIME_FORMAT, compact_dataframe
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def test_compact_schema_keeps_values_and_shrinks_frame():
+    df = build_property_frame(scraped_properties(1000), clean=True)
+
+    compact = compact_dataframe(df)
+
+    assert compact is not df
+    assert isinstance(compact["status"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact["agent_name"].dtype, pd.CategoricalDtype)
+    assert compact["beds"].dtype == "Int32" and compact["list_price"].dtype == "Int32"
+    assert compact["price_per_sqft"].dtype == "Float32"
+    assert compact["list_date"].dtype == "datetime64[ns]"
+    assert compact["latitude"].dtype == "float64"
+    assert compact.memory_usage(deep=True).sum() < 0.8 * df.memory_usage(deep=True).sum()
+
+    pd.testing.assert_series_equal(compact["sqft"].astype("float64"), df["sqft"], check_dtype=False)
+    assert compact["list_date"].dt.strftime(DATETIME_FORMAT).tolist() == df["list_date"].tolist()
+    assert compact["city"].astype(object).tolist() == df["city"].tolist()
+
+
+def test_compact_schema_widens_instead_of_losing_values():
+    df = pd.DataFrame({"list_price": [250000.0, 3_500_000_000.0, None], "beds": [2.5, 3.0, None], "city": ["a", None, "a"]})
+
+    compact = compact_dataframe(df)
+
+    assert compact["list_price"].dtype == "Int64" and compact["list_price"][1] == 3_500_000_000
+    assert compact["beds"].dtype == "Float64" and compact["beds"][0] == 2.5
+
+
+def test_scrape_property_compact_dtypes():
+    dataset = generate_results(300, seed=12, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", category=pd.errors.SettingWithCopyWarning)
+            df = scrape_property(location="Phoenix, AZ", limit=300, require_agent_email=True, compact_dtypes=True,
+                                 coalesce=False)
+
+    assert len(df) > 0
+    assert isinstance(df["state"].dtype, pd.CategoricalDtype)
+    assert df["year_built"].dtype == "Int32"
+    assert "compact_dtypes" in df.attrs["scrape_stats"].stage_seconds
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+def test_compact_inplace(inplace):
+    df = pd.DataFrame({"status": ["for_sale", "sold"], "sqft": [1200.0, None]})
+    result = compact_dataframe(df, inplace=inplace)
+    assert (result is df) is inplace
+    assert (df["sqft"].dtype == "Int32") is inplace
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest.sorting import (
+    ScoreTerm, calculate_price_discount, compute_score, create_custom_score, pareto_frontier, pareto_layers,
+    rank_by_investment_potential, score_properties,
+)
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def reference_investment_rank(df):
+    """The row-by-row rank_by_investment_potential the vectorized one replaced."""
+    df_copy = df.copy()
+    scores = pd.DataFrame(index=df_copy.index)
+
+    ppsf = df_copy['price_per_sqft'].fillna(df_copy['price_per_sqft'].median())
+    scores['ppsf_score'] = 100 - ((ppsf - ppsf.min()) / (ppsf.max() - ppsf.min()) * 100)
+    discount = calculate_price_discount(df_copy).fillna(0)
+    scores['discount_score'] = discount.apply(lambda x: min(100, max(0, -x)))
+    dom = df_copy['days_on_mls'].fillna(0)
+    scores['dom_score'] = (dom / dom.max() * 100) if dom.max() > 0 else 50
+    lot = df_copy['lot_sqft'].fillna(df_copy['lot_sqft'].median())
+    scores['lot_score'] = ((lot - lot.min()) / (lot.max() - lot.min()) * 100)
+
+    weights = {'ppsf_score': 0.3, 'discount_score': 0.4, 'dom_score': 0.2, 'lot_score': 0.1}
+    df_copy['investment_score'] = sum(scores[col] * weight for col, weight in weights.items())
+    return df_copy.sort_values('investment_score', ascending=False, kind="stable").reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return build_property_frame(scraped_properties(2000), clean=True)
+
+
+def test_investment_rank_matches_row_by_row(frame):
+    ranked = rank_by_investment_potential(frame)
+    expected = reference_investment_rank(frame)
+
+    np.testing.assert_allclose(ranked["investment_score"], expected["investment_score"])
+    assert ranked["property_id"].tolist() == expected["property_id"].tolist()
+    assert ranked.columns.tolist() == expected.columns.tolist()
+
+
+def test_missing_columns_score_default():
+    df = pd.DataFrame({"days_on_mls": [10, None, 30]})
+    ranked = rank_by_investment_potential(df)
+    # ppsf, discount and lot fall back to 50 each; days_on_mls is scaled by its max
+    assert ranked["investment_score"].tolist() == pytest.approx([100 * 0.2 + 40, 10 / 30 * 100 * 0.2 + 40, 40])
+
+
+
+def test_present_but_empty_column_takes_its_fill(frame):
+    df = frame.assign(estimated_value=np.nan)
+    ranked = rank_by_investment_potential(df)
+    expected = reference_investment_rank(df)
+
+    # price_discount fills with 0 (no discount) rather than scoring the unavailable-column default of 50
+    np.testing.assert_allclose(ranked["investment_score"], expected["investment_score"])
+    two = pd.DataFrame({"list_price": [100.0, 200.0], "estimated_value": [np.nan, np.nan]})
+    assert compute_score(two, [ScoreTerm(column="price_discount", normalize=None, fill=0)]).tolist() == [0, 0]
+
+def test_percentile_is_rank_based():
+    df = pd.DataFrame({"x": [1.0, 2.0, 2.0, 1000.0, None]})
+    score = compute_score(df, [{"column": "x", "normalize": "percentile"}])
+    assert score.iloc[:4].tolist() == pytest.approx([0, 50, 50, 100])
+    assert np.isnan(score.iloc[4])
+
+    minmax = compute_score(df, [{"column": "x"}])
+    assert minmax.iloc[1] == pytest.approx(1 / 999 * 100)
+
+
+def test_expressions_fill_invert_and_clip():
+    df = pd.DataFrame({"list_price": [100, 200, 300], "estimated_value": [150, 150, None]})
+    terms = [
+        ScoreTerm(column="estimated_value - list_price", normalize=None, fill=0, clip=(0, None), weight=2),
+        ScoreTerm(column="list_price", invert=True, weight=0.5),
+        ScoreTerm(column="no_such_column * 2", default=10),
+    ]
+
+    scored = score_properties(df, terms, score_name="deal")
+    assert scored["deal"].tolist() == pytest.approx([50 * 2 + 50 + 10, 0 + 25 + 10, 0 + 0 + 10])
+    assert "deal" not in df.columns
+
+    score_properties(df, terms, inplace=True)
+    assert "score" in df.columns
+
+
+def test_create_custom_score_accepts_terms_or_function(frame):
+    terms = [{"column": "beds", "weight": 2}, {"column": "price_per_sqft", "invert": True}]
+    vectorized = create_custom_score(frame, terms)["custom_score"]
+
+    def row_score(row, beds=frame["beds"], ppsf=frame["price_per_sqft"]):
+        beds_score = (row["beds"] - beds.min()) / (beds.max() - beds.min()) * 100
+        ppsf_score = 100 - (row["price_per_sqft"] - ppsf.min()) / (ppsf.max() - ppsf.min()) * 100
+        return beds_score * 2 + ppsf_score
+
+    np.testing.assert_allclose(vectorized, create_custom_score(frame, row_score)["custom_score"])
+
+
+def reference_layers(points):
+    """Peel Pareto layers by comparing every pair of rows (lower is better)."""
+    layers = np.zeros(len(points), dtype=int)
+    layer = 0
+    while (layers == 0).any():
+        layer += 1
+        remaining = np.flatnonzero(layers == 0)
+        for i in remaining:
+            others = points[remaining]
+            if not ((others <= points[i]).all(axis=1) & (others < points[i]).any(axis=1)).any():
+                layers[i] = -layer
+        layers[layers < 0] *= -1
+    return layers
+
+
+def test_pareto_layers_match_pairwise_reference(frame):
+    df = frame.head(600).copy()
+    df["beds"] = df["beds"].round()  #: ties and exact duplicates
+    df.loc[::9, "lot_sqft"] = None
+    df = pd.concat([df, df.head(20)], ignore_index=True)
+    criteria = {"price_per_sqft": "min", "price_discount": "min", "beds": "max", "lot_sqft": "max"}
+
+    def worst_last(values, sign):
+        values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float) * sign
+        return np.where(np.isnan(values), np.inf, values)
+
+    points = np.column_stack([
+        worst_last(df["price_per_sqft"], 1), worst_last(calculate_price_discount(df), 1),
+        worst_last(df["beds"], -1), worst_last(df["lot_sqft"], -1),
+    ])
+    expected = reference_layers(points)
+
+    assert pareto_layers(df, criteria, max_layers=None).tolist() == expected.tolist()
+    assert pareto_layers(df, criteria, max_layers=2).tolist() == np.where(expected <= 2, expected, 0).tolist()
+
+    frontier = pareto_frontier(df, criteria, layers=3)
+    expected_rows = [i for layer in (1, 2, 3) for i in np.flatnonzero(expected == layer)]
+    assert frontier["property_id"].tolist() == df["property_id"].iloc[expected_rows].tolist()
+    assert frontier["pareto_layer"].tolist() == expected[expected_rows].tolist()
+
+
+def test_pareto_frontier_defaults_and_validation(frame):
+    frontier = pareto_frontier(frame)
+    assert 0 < len(frontier) < len(frame) and set(frontier["pareto_layer"]) == {1}
+
+    # criteria the frame cannot provide are skipped; with none left, nothing dominates anything
+    assert len(pareto_frontier(frame, {"price_per_sqft": "min", "no_such_column": "max"})) < len(frame)
+    assert len(pareto_frontier(frame, {"no_such_column": "max"})) == len(frame)
+    with pytest.raises(ValueError, match="'min' or 'max'"):
+        pareto_frontier(frame, {"list_price": "lowest"})
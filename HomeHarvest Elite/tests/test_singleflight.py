@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.singleflight import SingleFlight
+
+
+def test_concurrent_identical_scrapes_share_one_fetch(fake_session):
+    session = fake_session(total=450, latency=0.1)
+    params = dict(location="Phoenix, AZ", listing_type="for_sale", extra_property_data=False, return_type="raw")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: scrape_property(**params), range(4)))
+
+    assert session.autocomplete_calls == 1
+    assert sorted(session.search_offsets) == [0, 200, 400]
+    assert all(result == results[0] for result in results)
+
+    #: every caller gets its own view of the listings
+    results[0][0]["list_price"] = 1
+    assert results[1][0]["list_price"] != 1
+
+
+def test_different_queries_are_not_coalesced(fake_session):
+    session = fake_session(total=10, latency=0.1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(
+            lambda listing_type: scrape_property(location="Phoenix, AZ", listing_type=listing_type,
+                                                 extra_property_data=False, return_type="raw"),
+            ["for_sale", "sold"],
+        ))
+
+    assert session.autocomplete_calls == 2
+
+
+def test_error_is_delivered_to_every_waiter():
+    group = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        threading.Event().wait(0.1)
+        raise ConnectionError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(group.do, "key", failing)
+        started.wait()
+        follower = executor.submit(group.do, "key", failing)
+
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError):
+                future.result()
+
+    assert group.in_flight() == 0
@@ -0,0 +1,40 @@
+from urllib3.util.retry import Retry
+
+from homeharvest import ScrapeStats, scrape_property
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+
+
+def test_stats_cover_stages_requests_and_filters():
+    dataset = generate_results(500, seed=2, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        df, stats = scrape_property(
+            location="Phoenix, AZ", limit=500, tag_filters=["swimming_pool"], return_stats=True, coalesce=False
+        )
+
+    assert isinstance(stats, ScrapeStats)
+    assert df.attrs["scrape_stats"] is stats
+    assert stats.pages == 3 and stats.detail_chunks == 3
+    assert stats.requests == sum(server.request_counts.values())
+    assert stats.bytes_downloaded > 0
+    assert stats.rows_fetched == 500
+    assert stats.rows_returned == len(df) == 500 - stats.rows_dropped["tags"]
+    assert {"total", "handle_location", "search", "page_fetch", "bulk_details", "process_property",
+            "dataframe"} <= set(stats.stage_seconds)
+
+
+def test_stats_count_transport_retries():
+    dataset = generate_results(600, seed=4, status="for_sale")
+    retries = Retry(total=3, backoff_factor=0, status_forcelist=[429], allowed_methods=frozenset(["GET", "POST"]))
+
+    with RealtorStubServer(dataset=dataset, rate_limit_every=3) as server:
+        with use_transport(RedirectAdapter(server.url, max_retries=retries)):
+            results, stats = scrape_property(
+                location="Phoenix, AZ", limit=600, return_type="raw", parallel=False, return_stats=True, coalesce=False
+            )
+
+    assert len(results) == 600
+    assert stats.retries == server.status_counts[429] > 0
+    assert stats.requests == sum(server.request_counts.values())
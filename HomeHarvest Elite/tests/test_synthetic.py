@@ -0,0 +1,28 @@
+from homeharvest import scrape_property
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results, load_fixture_pages, write_fixture_pages
+from homeharvest.transport import RedirectAdapter, use_transport
+
+
+def test_same_seed_same_records():
+    assert generate_results(300, seed=11) == generate_results(300, seed=11)
+    assert generate_results(300, seed=11) != generate_results(300, seed=12)
+
+
+def test_fixture_pages_round_trip(tmp_path):
+    files = write_fixture_pages(str(tmp_path), 450, seed=5)
+
+    assert len(files) == 3
+    assert load_fixture_pages(str(tmp_path)) == generate_results(450, seed=5)
+    assert len(load_fixture_pages(str(tmp_path), limit=250)) == 250
+
+
+def test_synthetic_records_scrape_end_to_end():
+    dataset = generate_results(500, seed=1, status="for_sale")
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        df = scrape_property(location="Phoenix, AZ", limit=500, coalesce=False)
+
+    assert len(df) == 500
+    assert df["agent_name"].notna().mean() > 0.9
+    assert df["tags"].notna().mean() > 0.9
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.core.scrapers.realtor.filters import FilterPipeline
+from homeharvest.tag_index import TagIndex, filter_by_tags
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def reference_tag_filter(homes, tag_filters, match_type, tag_exclude):
+    """The per-property matching the scraper's tag condition must reproduce."""
+    kept = []
+    for home in homes:
+        tags = [tag.lower() for tag in (home.tags or [])]
+        if tag_exclude and any(tag.lower() in tags for tag in tag_exclude):
+            continue
+        if not tag_filters:
+            kept.append(home)
+            continue
+        wanted = [tag.lower() for tag in tag_filters]
+        if match_type == "any" and any(tag in tags for tag in wanted):
+            kept.append(home)
+        elif match_type == "all" and all(tag in tags for tag in wanted):
+            kept.append(home)
+        elif match_type == "exact" and set(tags) == set(wanted):
+            kept.append(home)
+    return kept
+
+
+def make_scraper(**filters) -> RealtorScraper:
+    return RealtorScraper(ScraperInput(location="Phoenix, AZ", listing_type=ListingType.FOR_SALE, **filters))
+
+
+CASES = [
+    (["Swimming_Pool"], "any", None),
+    (["swimming_pool", "fireplace", "no_such_tag"], "any", ["central_air"]),
+    (["swimming_pool", "fireplace"], "all", None),
+    (["swimming_pool", "no_such_tag"], "all", None),
+    (None, "any", ["swimming_pool", "garage_2_or_more"]),
+    (["hidden_room"], "bogus", None),
+]
+
+
+@pytest.mark.parametrize("tag_filters, match_type, tag_exclude", CASES)
+def test_scraper_tag_filter_matches_reference(tag_filters, match_type, tag_exclude):
+    homes = scraped_properties(800)
+    scraper = make_scraper(tag_filters=tag_filters, tag_match_type=match_type, tag_exclude=tag_exclude)
+
+    expected = reference_tag_filter(homes, tag_filters, match_type, tag_exclude)
+    assert FilterPipeline([scraper._tag_condition()]).apply(homes)[0] == expected
+    if "no_such_tag" not in (tag_filters or []) and match_type != "bogus":
+        assert 0 < len(expected) < len(homes)
+
+
+def test_exact_match_and_wide_vocabulary():
+    index = TagIndex()
+    vocabulary = [f"tag_{i}" for i in range(150)]  #: three uint64 words
+    tag_lists = [vocabulary[:3], ["TAG_2", "tag_1", "tag_0"], vocabulary[:2], None, vocabulary[140:], []]
+    bitmap = index.bitmap(tag_lists)
+
+    assert bitmap.shape == (6, 1)
+    assert index.match(bitmap, ["tag_0", "tag_1", "tag_2"], "exact").tolist() == [True, True, False, False, False, False]
+    assert index.match(bitmap, None, "any", ["Tag_1"]).tolist() == [False, False, False, True, True, True]
+
+    index.bitmap([vocabulary])  #: the vocabulary grows to three words; match() widens older bitmaps
+    assert index.bitmap(tag_lists).shape == (6, 3)
+    assert index.match(bitmap, ["tag_149"], "any").tolist() == [False] * 4 + [True, False]
+    assert index.match(bitmap, ["tag_0", "tag_1", "tag_2"], "exact").tolist() == [True, True, False, False, False, False]
+
+
+def test_additional_filters_use_tag_flags():
+    homes = scraped_properties(600)
+    for flag in ["has_pool", "has_view", "waterfront", "has_garage"]:
+        for value in [True, False]:
+            kept = make_scraper(**{flag: value})._compile_filters().apply(homes)[0]
+            needles = {"has_pool": ("pool", "spa"), "has_view": ("view",), "waterfront": ("water",),
+                       "has_garage": ("garage",)}[flag]
+            def flagged(home):
+                tagged = any(n in tag.lower() for tag in home.tags or [] for n in needles)
+                return tagged or (flag == "has_garage" and (getattr(home, "parking_garage", None) or 0) > 0)
+            assert kept == [home for home in homes if flagged(home) == value]
+
+
+def test_filter_by_tags_dataframe():
+    df = build_property_frame(scraped_properties(500), clean=True)
+    homes = scraped_properties(500)
+
+    filtered = filter_by_tags(df, ["swimming_pool", "fireplace"], "all", exclude=["central_air"])
+
+    expected_ids = [h.property_id for h in reference_tag_filter(homes, ["swimming_pool", "fireplace"], "all",
+                                                                 ["central_air"])]
+    assert filtered["property_id"].tolist() == expected_ids
+    pd.testing.assert_frame_equal(filter_by_tags(df), df)
+    with pytest.raises(ValueError, match="match_type"):
+        filter_by_tags(df, ["pool"], "some")
@@ -0,0 +1,88 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from homeharvest import tag_utils
+from homeharvest.tag_utils import TAG_ALIASES, TAG_CATEGORIES, TagMatcher, expand_tag_search, fuzzy_match_tag
+
+TERMS = [
+    "pool", "swiming pool", "Hot Tub", "firepalce", "mountian view", "garage", "3 car garage", "gated comunity",
+    "solar", "wtr", "", "x", "golf course lot", "open floorplan", "hardwood", "zzzz", "rv", "Cul De Sac",
+]
+
+
+def reference_match(search_term, threshold, extra=()):
+    """The fuzzy_match_tag that scored every tag on every call."""
+    search_lower = search_term.lower().strip().replace(" ", "_")
+    if search_lower in TAG_ALIASES:
+        return [(TAG_ALIASES[search_lower], 1.0)]
+    all_tags = set(extra)
+    for category_tags in TAG_CATEGORIES.values():
+        all_tags.update(category_tags)
+    all_tags.update(TAG_ALIASES.keys())
+    all_tags.update(TAG_ALIASES.values())
+
+    best = {}
+    for tag in all_tags:
+        ratio = SequenceMatcher(None, search_lower, tag).ratio()
+        if ratio >= threshold:
+            actual_tag = TAG_ALIASES.get(tag, tag)
+            best[actual_tag] = max(best.get(actual_tag, 0), ratio)
+    return best
+
+
+def assert_same(matches, expected):
+    if isinstance(expected, list):
+        assert matches == expected
+        return
+    assert dict(matches) == expected
+    assert len(matches) == len(expected)
+    scores = [score for _, score in matches]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.4, 0.6, 0.8, 1.0])
+def test_matches_scoring_every_tag(threshold):
+    for term in TERMS:
+        assert_same(fuzzy_match_tag(term, threshold), reference_match(term, threshold))
+
+
+def test_added_vocabulary_and_memoization():
+    rng = random.Random(5)
+    letters = "abcdefghijklmnopqrstuvwxyz_"
+    discovered = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 24))) for _ in range(2000)]
+    matcher = TagMatcher()
+    matcher.add_tags(discovered + ["swimming_pool", None, ""])
+
+    terms = TERMS + [tag[:-1] + "q" for tag in discovered[:20]]
+    for term in terms:
+        assert_same(matcher.match(term, 0.6), reference_match(term, 0.6, discovered))
+
+    info = matcher._cached_match.cache_info()
+    matcher.match("Swiming Pool ", 0.6)  #: normalizes to a term already matched
+    assert matcher._cached_match.cache_info().hits == info.hits + 1
+    result = matcher.match("swiming pool")
+    result.append(("mutated", 0))
+    assert ("mutated", 0) not in matcher.match("swiming pool")
+
+
+def test_rebuild_picks_up_edited_aliases():
+    aliases = dict(TAG_ALIASES)
+    matcher = TagMatcher(aliases=aliases)
+    assert matcher.match("plunge_pool", 0.99) == []
+
+    aliases["plunge_pool"] = "swimming_pool"
+    matcher.rebuild()
+    assert matcher.match("plunge_pool", 0.99) == [("swimming_pool", 1.0)]
+
+
+def test_expand_tag_search_reuses_memoized_matches():
+    tags = ["swiming pool", "firepalce", "mountian view", "gated comunity"]
+    expanded = expand_tag_search(tags, use_fuzzy=True)
+    assert {"swimming_pool", "fireplace", "mountain_view", "gated_community"} <= set(expanded)
+
+    hits = tag_utils.TAG_MATCHER._cached_match.cache_info().hits
+    for _ in range(100):
+        assert sorted(expand_tag_search(tags, use_fuzzy=True)) == sorted(expanded)
+    assert tag_utils.TAG_MATCHER._cached_match.cache_info().hits == hits + 400
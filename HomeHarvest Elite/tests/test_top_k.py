@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from homeharvest import scrape_property
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.sorting import sort_properties
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.synthetic import generate_results
+from homeharvest.transport import RedirectAdapter, use_transport
+from homeharvest.utils import build_property_frame
+
+from .test_data_cleaning import scraped_properties
+
+
+def make_scraper(**kwargs) -> RealtorScraper:
+    return RealtorScraper(ScraperInput(location="Phoenix, AZ", listing_type=ListingType.FOR_SALE, **kwargs))
+
+
+@pytest.mark.parametrize("sort_by", ["list_price", "list_date", "days_on_mls"])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+@pytest.mark.parametrize("raw", [False, True])
+def test_scraper_top_k_matches_full_sort(sort_by, direction, raw):
+    homes = generate_results(900, seed=21) if raw else scraped_properties(900)
+    full = make_scraper(sort_by=sort_by, sort_direction=direction)._apply_sort(homes)
+
+    for k in [1, 37, 899, 5000]:
+        assert make_scraper(sort_by=sort_by, sort_direction=direction, top_k=k)._apply_sort(homes) == full[:k]
+
+
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_homes_without_a_value_sort_last(direction):
+    homes = [{"list_price": 3}, {"list_price": None}, {"list_price": 1}, {}, {"list_price": 2}]
+    for top_k in [None, 2, 4]:
+        ordered = make_scraper(sort_by="list_price", sort_direction=direction, top_k=top_k)._apply_sort(homes)
+        expected = ([1, 2, 3] if direction == "asc" else [3, 2, 1]) + [None, None]
+        assert [home.get("list_price") for home in ordered] == expected[:top_k]
+
+
+def test_dataframe_top_k_matches_stable_sort():
+    df = build_property_frame(scraped_properties(3000), clean=True)
+    df["last_update_date"] = pd.to_datetime(df["last_update_date"], utc=True)
+    df.loc[::7, "last_update_date"] = pd.NaT
+    df["beds"] = df["beds"].round()  #: plenty of ties
+
+    for sort_by, direction in [
+        ("list_price", "desc"), (["beds", "sqft"], ["desc", "asc"]), ("last_update_date", "asc"),
+        (["property_age", "list_price"], ["asc", "desc"]), ("city", "asc"),
+    ]:
+        for na_position in ["last", "first"]:
+            full = sort_properties(df, sort_by, direction, na_position=na_position)
+            fields = [sort_by] if isinstance(sort_by, str) else sort_by
+            directions = [direction] * len(fields) if isinstance(direction, str) else direction
+            if len(fields) == 1:  #: single-column sort_values is not stable; compare against a stable sort
+                full = df.sort_values(fields, ascending=[d == "asc" for d in directions], na_position=na_position,
+                                      kind="stable").reset_index(drop=True)
+            for k in [1, 25, 400, 2600, 4000]:
+                top = sort_properties(df, sort_by, direction, na_position=na_position, top_k=k)
+                pd.testing.assert_frame_equal(top, full.head(k).reset_index(drop=True))
+
+
+def test_top_k_requires_sort_by():
+    with pytest.raises(ValueError, match="requires sort_by"):
+        scrape_property(location="Phoenix, AZ", top_k=10)
+    with pytest.raises(ValueError, match="positive integer"):
+        scrape_property(location="Phoenix, AZ", sort_by="list_price", top_k=0)
+
+
+def price_sorted_dataset(count: int) -> list:
+    dataset = generate_results(count, seed=22, status="for_sale")
+    return sorted(dataset, key=lambda home: -(home.get("list_price") or -1))  #: what the API's server-side sort returns
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_pagination_stops_once_top_k_is_guaranteed(parallel):
+    dataset = price_sorted_dataset(2000)
+
+    with RealtorStubServer(dataset=dataset) as server, use_transport(RedirectAdapter(server.url)):
+        kwargs = dict(location="Phoenix, AZ", limit=2000, sort_by="list_price", sort_direction="desc",
+                      parallel=parallel, coalesce=False, return_type="raw")
+        full, full_stats = scrape_property(return_stats=True, **kwargs)
+        top, stats = scrape_property(top_k=50, return_stats=True, **kwargs)
+        filtered_full = scrape_property(tag_filters=["fireplace"], tag_use_aliases=False, **kwargs)
+        filtered, filtered_stats = scrape_property(tag_filters=["fireplace"], tag_use_aliases=False, top_k=100,
+                                                   return_stats=True, **kwargs)
+
+    assert full_stats.pages == 10 and stats.pages == 1 and stats.pages_skipped == 9
+    assert top == full[:50]
+
+    assert 1 < filtered_stats.pages < 10
+    assert filtered_stats.pages + filtered_stats.pages_skipped == 10
+    assert filtered == filtered_full[:100]
@@ -0,0 +1,48 @@
+from urllib3.util.retry import Retry
+
+from homeharvest import scrape_property
+from homeharvest.core.scrapers import Scraper
+from homeharvest.stub_server import RealtorStubServer
+from homeharvest.transport import FixtureStore, RecordingAdapter, RedirectAdapter, ReplayAdapter, use_transport
+
+from .fakes import make_result
+
+
+def test_record_then_replay_offline(tmp_path):
+    store = FixtureStore(str(tmp_path / "fixtures"))
+    dataset = [make_result(i) for i in range(450)]
+
+    with RealtorStubServer(dataset=dataset) as server:
+        with use_transport(RecordingAdapter(store, inner=RedirectAdapter(server.url))):
+            recorded = scrape_property(location="Phoenix, AZ", limit=450, coalesce=False)
+
+    assert len(store) > 0
+    assert [result["property_id"] for result in store.search_results()] == [r["property_id"] for r in dataset]
+
+    with use_transport(ReplayAdapter(store)):
+        replayed = scrape_property(location="Phoenix, AZ", limit=450, coalesce=False)
+
+    assert len(recorded) == 450
+    assert recorded.equals(replayed)
+
+
+def test_rate_limited_stub_still_returns_every_page():
+    dataset = [make_result(i) for i in range(600)]
+    retries = Retry(total=3, backoff_factor=0, status_forcelist=[429], allowed_methods=frozenset(["GET", "POST"]))
+
+    with RealtorStubServer(dataset=dataset, rate_limit_every=2) as server:
+        with use_transport(RedirectAdapter(server.url, max_retries=retries)):
+            df = scrape_property(location="Phoenix, AZ", limit=600, parallel=False, coalesce=False)
+
+    assert len(df) == 600
+    assert server.status_counts[429] > 0
+
+
+def test_use_transport_restores_previous_adapter():
+    session = Scraper.get_session()
+    before = session.get_adapter("https://www.realtor.com")
+
+    with use_transport(ReplayAdapter(FixtureStore.__new__(FixtureStore))):
+        assert isinstance(session.get_adapter("https://www.realtor.com"), ReplayAdapter)
+
+    assert session.get_adapter("https://www.realtor.com") is before